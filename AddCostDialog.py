@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                              QComboBox, QLabel, QLineEdit, QPushButton)
 
 class AddCostDialog(QDialog):
-    def __init__(self, parent=None, warehouses=None, clients=None):
+    def __init__(self, parent=None, warehouses=None, clients=None, hubs=None):
         super().__init__(parent)
         self.setWindowTitle("Add Transportation Cost")
         self.setMinimumWidth(400)
@@ -29,16 +29,21 @@ class AddCostDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
+        # With hubs, an arc goes from a warehouse or hub to a hub or client.
+        hubs = list(hubs) if hubs else []
+        sources = list(warehouses) if warehouses else []
+        targets = list(clients) if clients else []
+
         # Warehouse selection
         self.warehouse_combo = QComboBox()
-        self.warehouse_combo.addItems(warehouses if warehouses else [])
-        layout.addWidget(QLabel("Warehouse:"))
+        self.warehouse_combo.addItems(sources + hubs)
+        layout.addWidget(QLabel("From:" if hubs else "Warehouse:"))
         layout.addWidget(self.warehouse_combo)
 
         # Client selection
         self.client_combo = QComboBox()
-        self.client_combo.addItems(clients if clients else [])
-        layout.addWidget(QLabel("Client:"))
+        self.client_combo.addItems(hubs + targets)
+        layout.addWidget(QLabel("To:" if hubs else "Client:"))
         layout.addWidget(self.client_combo)
 
         # Cost input
@@ -47,6 +52,12 @@ class AddCostDialog(QDialog):
         layout.addWidget(QLabel("Cost:"))
         layout.addWidget(self.cost_input)
 
+        # Capacity input
+        self.capacity_input = QLineEdit()
+        self.capacity_input.setPlaceholderText("Leave empty for no limit")
+        layout.addWidget(QLabel("Capacity:"))
+        layout.addWidget(self.capacity_input)
+
         # Buttons
         buttons_layout = QHBoxLayout()
         self.cancel_btn = QPushButton("Cancel")
@@ -59,4 +70,7 @@ class AddCostDialog(QDialog):
 
     def get_cost_data(self):
         return (self.warehouse_combo.currentText(), self.client_combo.currentText(),
-                self.cost_input.text().strip())
\ No newline at end of file
+                self.cost_input.text().strip())
+
+    def get_capacity(self):
+        return self.capacity_input.text().strip()
\ No newline at end of file
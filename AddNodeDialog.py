@@ -33,7 +33,8 @@ class AddNodeDialog(QDialog):
 
         # Capacity or demand input
         self.capacity_input = QLineEdit()
-        self.capacity_input.setPlaceholderText(f"Enter {node_params}")
+        self.capacity_input.setPlaceholderText(
+            f"Enter {node_params}" + (", or leave empty for no limit" if node_type == "Hub" else ""))
         layout.addWidget(QLabel(f"{node_params}:"))
         layout.addWidget(self.capacity_input)
 
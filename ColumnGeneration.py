@@ -0,0 +1,282 @@
+import time
+
+import numpy as np
+
+from Instrumentation import instrumentation
+from TransportHeuristics import north_west_corner
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+ARTIFICIAL_NAME = "(unmet demand)"
+
+
+class ColumnGeneration:
+    BLOCK_CELLS = 4_000_000
+
+    def __init__(self, instance, backend="gurobi", pool=None, env=None, lanes_per_client=5,
+                 block_cells=BLOCK_CELLS, max_rounds=None, tol=1e-9):
+        # Solves a DenseTransportInstance over a restricted lane set: the
+        # cheapest lanes of each client plus a north-west corner plan to
+        # start with, then each round prices every lane against the duals
+        # of the restricted master, a block of rows at a time, and adds the
+        # most negative lane of each client and of each warehouse. Only the
+        # master and one block are ever in memory.
+        self.instance = instance
+        self.backend = backend
+        self.pool = pool
+        self.env = env
+        self.lanes_per_client = lanes_per_client
+        self.block_cells = block_cells
+        self.max_rounds = max_rounds
+        self.tol = tol
+        self.rounds = 0
+        self.lanes_added = 0
+        self.progress = None
+        self.cancelled = False
+        self._master = None
+
+    def solve(self, progress=None):
+        start = time.perf_counter()
+        with instrumentation.span("solve", backend=self.backend, lanes=self.instance.num_lanes):
+            if self.backend == "gurobi" and self.env is None and self.pool is not None:
+                with instrumentation.span("env.acquire"):
+                    env = self.pool.acquire()
+                try:
+                    solution = self._solve(progress, env)
+                finally:
+                    self.pool.release(env)
+            else:
+                solution = self._solve(progress, self.env)
+        solution.runtime = time.perf_counter() - start
+        return solution
+
+    def _solve(self, progress, env):
+        from SolveProgress import SolveProgress
+
+        inst = self.instance
+        m, n = inst.num_warehouses, inst.num_clients
+        self.progress = SolveProgress(progress) if progress is not None else None
+        empty = inst.restrict(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        if inst.demands.sum() <= self.tol:
+            return TransportSolution(empty, TransportSolution.OPTIMAL, 0.0, backend=self.backend)
+        if inst.supplies.sum() < inst.demands.sum() - self.tol:
+            return TransportSolution(empty, TransportSolution.INFEASIBLE, backend=self.backend)
+
+        with instrumentation.span("colgen.initial"):
+            rows, cols, max_cost = self.initial_lanes()
+        costs = inst.lane_costs(rows, cols)
+        # Unmet demand is bought from an artificial warehouse at a price no
+        # optimal dual of the full problem reaches, so every master is
+        # feasible and the final one ships nothing artificial unless the
+        # full problem is infeasible.
+        big_m = (abs(max_cost) + 1.0) * (m + n)
+        master = _GurobiMaster(inst, big_m, env) if self.backend == "gurobi" else _NativeMaster(inst, big_m)
+        self._master = master
+        try:
+            while True:
+                if self.cancelled:
+                    return TransportSolution(empty, TransportSolution.CANCELLED, backend=self.backend)
+                if self.max_rounds is not None and self.rounds >= self.max_rounds:
+                    return TransportSolution(empty, TransportSolution.ITERATION_LIMIT, backend=self.backend)
+                with instrumentation.span("colgen.master", lanes=len(rows)):
+                    master.add_lanes(rows[master.num_lanes:], cols[master.num_lanes:], costs[master.num_lanes:])
+                    status, objective, flows, u, v = master.solve()
+                if status != TransportSolution.OPTIMAL:
+                    return TransportSolution(empty, status, backend=self.backend)
+                self.rounds += 1
+                if self.progress is not None:
+                    unmet = master.unmet(flows)
+                    self.progress.update(objective if unmet <= self.tol else None, force=True)
+                with instrumentation.span("colgen.pricing") as span:
+                    new_rows, new_cols = self.price(u, v, rows, cols)
+                    span.set(added=len(new_rows))
+                if not len(new_rows):
+                    break
+                instrumentation.count("colgen.lanes_added", len(new_rows))
+                self.lanes_added += len(new_rows)
+                rows = np.concatenate([rows, new_rows])
+                cols = np.concatenate([cols, new_cols])
+                costs = np.concatenate([costs, inst.lane_costs(new_rows, new_cols)])
+        finally:
+            master.close()
+            self._master = None
+        instrumentation.count("colgen.rounds", self.rounds)
+
+        restricted = inst.restrict(rows, cols, costs)
+        if master.unmet(flows) > self.tol * max(1.0, inst.demands.sum()):
+            return TransportSolution(restricted, TransportSolution.INFEASIBLE, backend=self.backend)
+        lane_flows = master.lane_flows(flows)
+        return TransportSolution(restricted, TransportSolution.OPTIMAL, float(costs @ lane_flows),
+                                 lane_flows, self.backend)
+
+    def initial_lanes(self):
+        # The lanes_per_client cheapest lanes of every client, kept as a
+        # running k x n selection while the row blocks stream past, plus
+        # the finite lanes of a north-west corner plan. Also returns the
+        # largest finite cost magnitude seen.
+        inst = self.instance
+        n = inst.num_clients
+        k = min(max(1, self.lanes_per_client), inst.num_warehouses)
+        best = np.full((0, n), np.inf)
+        best_rows = np.zeros((0, n), dtype=np.int64)
+        max_cost = 0.0
+        for first, block in inst.row_blocks(self.block_cells):
+            finite = np.isfinite(block)
+            if finite.any():
+                max_cost = max(max_cost, float(np.abs(block[finite]).max()))
+            values = np.vstack([best, block])
+            value_rows = np.vstack([best_rows, np.broadcast_to(
+                np.arange(first, first + len(block))[:, None], block.shape)])
+            if len(values) > k:
+                keep = np.argpartition(values, k - 1, axis=0)[:k]
+                values = np.take_along_axis(values, keep, axis=0)
+                value_rows = np.take_along_axis(value_rows, keep, axis=0)
+            best, best_rows = values, value_rows
+        chosen = np.isfinite(best)
+        rows = best_rows[chosen]
+        cols = np.broadcast_to(np.arange(n), best.shape)[chosen]
+        nw_rows, nw_cols, _ = north_west_corner(inst.supplies, inst.demands, self.tol)
+        if len(nw_rows):
+            finite = np.isfinite(inst.lane_costs(nw_rows, nw_cols))
+            rows = np.concatenate([rows, nw_rows[finite]])
+            cols = np.concatenate([cols, nw_cols[finite]])
+        rows, cols = np.divmod(np.unique(rows * n + cols), n)
+        return rows, cols, max_cost
+
+    def price(self, u, v, rows, cols):
+        # Lanes with a negative reduced cost c - u - v: the most negative one
+        # of every client and of every warehouse, without lanes already in
+        # the master. Reduced costs exist for one block at a time.
+        inst = self.instance
+        n = inst.num_clients
+        threshold = -self.tol * max(1.0, float(np.abs(v).max()) if n else 1.0)
+        client_best = np.zeros(n)
+        client_rows = np.full(n, -1, dtype=np.int64)
+        found_rows, found_cols = [], []
+        for first, block in inst.row_blocks(self.block_cells):
+            # A fresh array: the block may be a view of the cost matrix.
+            block = block - u[first:first + len(block), None] - v[None, :]
+            # Best lane of each client so far.
+            local = np.argmin(block, axis=0)
+            value = block[local, np.arange(n)]
+            better = value < np.minimum(client_best, threshold)
+            client_best[better] = value[better]
+            client_rows[better] = first + local[better]
+            # Best lane of each warehouse in the block.
+            local = np.argmin(block, axis=1)
+            value = block[np.arange(len(block)), local]
+            negative = np.flatnonzero(value < threshold)
+            found_rows.append(first + negative)
+            found_cols.append(local[negative])
+        priced = client_rows >= 0
+        found_rows.append(client_rows[priced])
+        found_cols.append(np.flatnonzero(priced))
+        keys = np.unique(np.concatenate(found_rows) * n + np.concatenate(found_cols))
+        # Degenerate duals can leave a master lane a hair below zero.
+        keys = keys[~np.isin(keys, rows * n + cols)]
+        return np.divmod(keys, n)
+
+    def cancel(self):
+        self.cancelled = True
+        master = self._master
+        if master is not None:
+            master.cancel()
+
+
+class _GurobiMaster:
+    # The restricted master as a live SolverSession: new lanes become new
+    # columns and each round re-optimizes from the previous basis.
+
+    def __init__(self, instance, big_m, env):
+        from SolverSession import SolverSession
+
+        self.instance = instance
+        self.session = SolverSession("Restricted_Master", env=env)
+        self.session.preview = None
+        self.session.sensitivity = "duals"
+        for w, supply in zip(instance.warehouse_names, instance.supplies.tolist()):
+            self.session.set_warehouse(w, supply)
+        self.session.set_warehouse(ARTIFICIAL_NAME, float(instance.demands.sum()))
+        for c, demand in zip(instance.client_names, instance.demands.tolist()):
+            self.session.set_client(c, demand)
+        for c in instance.client_names:
+            self.session.set_cost(ARTIFICIAL_NAME, c, big_m)
+        self.num_lanes = 0
+
+    def add_lanes(self, rows, cols, costs):
+        w, c = self.instance.warehouse_names, self.instance.client_names
+        for i, j, cost in zip(rows.tolist(), cols.tolist(), costs.tolist()):
+            self.session.set_cost(w[i], c[j], cost)
+        self.num_lanes += len(rows)
+
+    def solve(self):
+        solution = self.session.solve()
+        if not solution.is_optimal:
+            return solution.status, None, None, None, None
+        m = self.instance.num_warehouses
+        sensitivity = solution.sensitivity
+        return (solution.status, solution.objective, solution.flows,
+                sensitivity.supply_duals[:m], sensitivity.demand_duals)
+
+    def unmet(self, flows):
+        return float(flows[:self.instance.num_clients].sum())
+
+    def lane_flows(self, flows):
+        return flows[self.instance.num_clients:]
+
+    def cancel(self):
+        self.session.cancel()
+
+    def close(self):
+        self.session.close()
+
+
+class _NativeMaster:
+    # The restricted master solved from scratch each round by the min-cost
+    # flow engine, whose final potentials are the duals.
+
+    def __init__(self, instance, big_m):
+        n = instance.num_clients
+        self.instance = instance
+        self.rows = np.full(n, instance.num_warehouses, dtype=np.int64)
+        self.cols = np.arange(n, dtype=np.int64)
+        self.costs = np.full(n, big_m)
+        self.num_lanes = 0
+        self._engine = None
+
+    def add_lanes(self, rows, cols, costs):
+        self.rows = np.concatenate([self.rows, rows])
+        self.cols = np.concatenate([self.cols, cols])
+        self.costs = np.concatenate([self.costs, costs])
+        self.num_lanes += len(rows)
+
+    def solve(self):
+        from MinCostFlow import MinCostFlow
+        from NetworkInstance import NetworkInstance
+
+        inst = self.instance
+        m = inst.num_warehouses
+        master = TransportInstance(inst.warehouse_names + [ARTIFICIAL_NAME],
+                                   np.append(inst.supplies, inst.demands.sum()),
+                                   inst.client_names, inst.demands, self.rows, self.cols, self.costs)
+        self._engine = engine = MinCostFlow(NetworkInstance.from_transport(master))
+        status, objective, flows = engine.solve()
+        self._engine = None
+        if status != TransportSolution.OPTIMAL:
+            return status, None, None, None, None
+        duals = engine.node_duals()
+        return status, objective, flows, duals[:m], duals[m + 1:]
+
+    def unmet(self, flows):
+        return float(flows[:self.instance.num_clients].sum())
+
+    def lane_flows(self, flows):
+        return flows[self.instance.num_clients:]
+
+    def cancel(self):
+        engine = self._engine
+        if engine is not None:
+            engine.cancelled = True
+
+    def close(self):
+        pass
@@ -0,0 +1,156 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+
+class CostTableModel(QAbstractTableModel):
+    SOLUTION_COLOR = QColor("#CE7B91")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.warehouses = []
+        self.clients = []
+        self.warehouse_index = {}
+        self.client_index = {}
+        # Costs live in a preallocated array that grows geometrically;
+        # NaN marks a lane without a cost. Only the [:rows, :cols] corner
+        # is in use.
+        self._costs = np.full((0, 0), np.nan)
+        self.flows = {}
+        # Optional sensitivity overlay: dense reduced costs and cost ranges
+        # per cell, plus a shadow price per row and column.
+        self.overlay = None
+
+    @property
+    def costs(self):
+        return self._costs[:len(self.warehouses), :len(self.clients)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.warehouses)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.clients)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i, j = index.row(), index.column()
+        if role == Qt.DisplayRole and self.overlay is not None and not np.isnan(self.overlay["reduced"][i, j]):
+            return f"{self.overlay['reduced'][i, j]:g}"
+        if role == Qt.ToolTipRole:
+            return self._tooltip(i, j)
+        if role == Qt.DisplayRole:
+            qty = self.flows.get((i, j))
+            if qty is not None:
+                return f"{int(qty)}" if float(qty).is_integer() else f"{qty:.2f}"
+            value = self._costs[i, j]
+            if np.isnan(value):
+                return "∞"
+            return f"{int(value)}" if float(value).is_integer() else f"{value:g}"
+        if role == Qt.BackgroundRole and (i, j) in self.flows:
+            return self.SOLUTION_COLOR
+        return None
+
+    def _tooltip(self, i, j):
+        cost = self._costs[i, j]
+        if np.isnan(cost):
+            return "No lane"
+        lines = [f"Cost {cost:g}, flow {self.flows.get((i, j), 0):g}"]
+        if self.overlay is not None and not np.isnan(self.overlay["reduced"][i, j]):
+            lines.append(f"Reduced cost {self.overlay['reduced'][i, j]:g}")
+            low, up = self.overlay["cost_low"][i, j], self.overlay["cost_up"][i, j]
+            if not np.isnan(low):
+                lines.append(f"Optimal for costs in [{low:g}, {up:g}]")
+        return "\n".join(lines)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        names = self.clients if orientation == Qt.Horizontal else self.warehouses
+        if not 0 <= section < len(names):
+            return None
+        if self.overlay is not None:
+            price = self.overlay["col_prices" if orientation == Qt.Horizontal else "row_prices"][section]
+            if not np.isnan(price):
+                return f"{names[section]} (π {price:g})"
+        return names[section]
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def _reserve(self, rows, cols):
+        cap_rows, cap_cols = self._costs.shape
+        if rows <= cap_rows and cols <= cap_cols:
+            return
+        grown = np.full((max(rows, 2 * cap_rows), max(cols, 2 * cap_cols)), np.nan)
+        grown[:cap_rows, :cap_cols] = self._costs
+        self._costs = grown
+
+    def add_warehouse(self, name):
+        if name in self.warehouse_index:
+            return
+        row = len(self.warehouses)
+        self._reserve(row + 1, len(self.clients))
+        self.overlay = None
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.warehouses.append(name)
+        self.warehouse_index[name] = row
+        self.endInsertRows()
+
+    def add_client(self, name):
+        if name in self.client_index:
+            return
+        col = len(self.clients)
+        self._reserve(len(self.warehouses), col + 1)
+        self.overlay = None
+        self.beginInsertColumns(QModelIndex(), col, col)
+        self.clients.append(name)
+        self.client_index[name] = col
+        self.endInsertColumns()
+
+    def load(self, warehouses, clients, rows, cols, costs):
+        self.beginResetModel()
+        self.warehouses = list(warehouses)
+        self.clients = list(clients)
+        self.warehouse_index = {w: i for i, w in enumerate(self.warehouses)}
+        self.client_index = {c: j for j, c in enumerate(self.clients)}
+        self._costs = np.full((len(self.warehouses), len(self.clients)), np.nan)
+        self._costs[rows, cols] = costs
+        self.flows = {}
+        self.overlay = None
+        self.endResetModel()
+
+    def set_cost(self, warehouse, client, value):
+        i = self.warehouse_index.get(warehouse)
+        j = self.client_index.get(client)
+        if i is None or j is None:
+            return
+        self._costs[i, j] = value
+        index = self.index(i, j)
+        self.dataChanged.emit(index, index)
+
+    def set_flows(self, flows):
+        # Only cells whose flow started, stopped or changed are signalled,
+        # so a re-solve costs O(active arcs) rather than O(all cells).
+        previous = self.flows
+        self.flows = flows
+        roles = [Qt.DisplayRole, Qt.BackgroundRole]
+        for cell in previous.keys() | flows.keys():
+            if previous.get(cell) != flows.get(cell):
+                index = self.index(*cell)
+                self.dataChanged.emit(index, index, roles)
+
+    def set_overlay(self, overlay):
+        # overlay maps "reduced", "cost_low" and "cost_up" to arrays shaped
+        # like costs, and "row_prices"/"col_prices" to one value per line;
+        # None removes it.
+        self.overlay = overlay
+        if self.warehouses and self.clients:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.warehouses) - 1, len(self.clients) - 1))
+        self.headerDataChanged.emit(Qt.Horizontal, 0, max(len(self.clients) - 1, 0))
+        self.headerDataChanged.emit(Qt.Vertical, 0, max(len(self.warehouses) - 1, 0))
+
+    def cost_arrays(self):
+        rows, cols = np.nonzero(~np.isnan(self.costs))
+        return rows, cols, self.costs[rows, cols]
@@ -0,0 +1,55 @@
+import numpy as np
+
+from TransportInstance import TransportInstance
+
+
+class DenseTransportInstance:
+    def __init__(self, warehouse_names, supplies, client_names, demands, cost_matrix):
+        # Every warehouse/client lane priced in one m x n array, which may be
+        # a read-only np.memmap larger than memory; inf marks a missing lane.
+        # The array is never copied whole: lanes are read by row blocks or
+        # by index.
+        self.warehouse_names = list(warehouse_names)
+        self.client_names = list(client_names)
+        self.supplies = np.asarray(supplies, dtype=np.float64)
+        self.demands = np.asarray(demands, dtype=np.float64)
+        self.cost_matrix = cost_matrix
+        if cost_matrix.shape != (self.num_warehouses, self.num_clients):
+            raise ValueError("The cost matrix needs one row per warehouse and one column per client")
+
+    @property
+    def num_warehouses(self):
+        return len(self.warehouse_names)
+
+    @property
+    def num_clients(self):
+        return len(self.client_names)
+
+    @property
+    def num_lanes(self):
+        return self.num_warehouses * self.num_clients
+
+    # The window and the headless summary count costs as num_arcs.
+    num_arcs = num_lanes
+
+    def row_blocks(self, max_cells):
+        # (first row, block) pairs covering the matrix, each block holding
+        # at most max_cells lanes (and at least one row).
+        rows = max(1, max_cells // max(1, self.num_clients))
+        for start in range(0, self.num_warehouses, rows):
+            yield start, np.asarray(self.cost_matrix[start:start + rows], dtype=np.float64)
+
+    def lane_costs(self, rows, cols):
+        # On a memmap only the pages holding the requested lanes are read.
+        if not len(rows):
+            return np.zeros(0)
+        return np.asarray(self.cost_matrix[rows, cols], dtype=np.float64)
+
+    def restrict(self, rows, cols, costs=None):
+        # The sparse instance over the given lanes only.
+        return TransportInstance(self.warehouse_names, self.supplies, self.client_names, self.demands,
+                                 rows, cols, self.lane_costs(rows, cols) if costs is None else costs)
+
+    def to_transport(self):
+        return TransportInstance.from_dense(self.warehouse_names, self.supplies, self.client_names,
+                                            self.demands, np.asarray(self.cost_matrix))
@@ -0,0 +1,116 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QToolButton,
+                             QTreeWidget, QTreeWidgetItem, QPlainTextEdit, QFileDialog, QPushButton)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+
+from Instrumentation import instrumentation
+
+
+class DiagnosticsPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.toggle = QToolButton()
+        self.toggle.setText("Diagnostics")
+        self.toggle.setCheckable(True)
+        self.toggle.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.toggle.setArrowType(Qt.RightArrow)
+        self.toggle.toggled.connect(self.set_expanded)
+        layout.addWidget(self.toggle)
+
+        self.body = QWidget()
+        body_layout = QVBoxLayout(self.body)
+        body_layout.setContentsMargins(0, 0, 0, 0)
+
+        options_layout = QHBoxLayout()
+        self.record_check = QCheckBox("Record timings")
+        self.record_check.toggled.connect(self.set_recording)
+        options_layout.addWidget(self.record_check)
+        self.profile_check = QCheckBox("Profile next solve")
+        options_layout.addWidget(self.profile_check)
+        options_layout.addStretch()
+        body_layout.addLayout(options_layout)
+
+        # Span totals by name, then counters, as the last refresh found them.
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Name", "Calls", "Total ms", "Mean ms", "Max ms"])
+        self.tree.setRootIsDecorated(True)
+        body_layout.addWidget(self.tree)
+
+        self.profile_text = QPlainTextEdit()
+        self.profile_text.setReadOnly(True)
+        self.profile_text.setFont(QFont("Monospace", 9))
+        self.profile_text.setPlaceholderText("cProfile output of the last profiled solve")
+        body_layout.addWidget(self.profile_text)
+
+        buttons_layout = QHBoxLayout()
+        for text, slot in (("Refresh", self.refresh), ("Clear", self.clear),
+                           ("Export JSON", self.export_json), ("Export Chrome Trace", self.export_trace),
+                           ("Export Profile", self.export_profile)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons_layout.addWidget(button)
+        body_layout.addLayout(buttons_layout)
+
+        layout.addWidget(self.body)
+        self.body.setVisible(False)
+        self.setStyleSheet("""
+            QToolButton { background: transparent; border: none; color: white; font-weight: bold; }
+            QTreeWidget, QPlainTextEdit {
+                background-color: #2C2F33; color: white; border: 1px solid #3E4246; border-radius: 5px;
+            }
+            QHeaderView::section { background-color: #23272A; color: white; padding: 4px; border: none; }
+        """)
+
+    def set_expanded(self, expanded):
+        self.toggle.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+        self.body.setVisible(expanded)
+        if expanded:
+            self.refresh()
+
+    def set_recording(self, enabled):
+        instrumentation.enabled = enabled
+
+    def take_profile_request(self):
+        # True once per tick of "Profile next solve".
+        requested = self.profile_check.isChecked()
+        self.profile_check.setChecked(False)
+        return requested
+
+    def refresh(self):
+        if not self.body.isVisible():
+            return
+        self.tree.clear()
+        spans = QTreeWidgetItem(self.tree, ["Spans"])
+        for name, entry in instrumentation.summary().items():
+            QTreeWidgetItem(spans, [name, str(entry["calls"]), f"{entry['total'] * 1000:.2f}",
+                                    f"{entry['mean'] * 1000:.2f}", f"{entry['max'] * 1000:.2f}"])
+        counters = QTreeWidgetItem(self.tree, ["Counters"])
+        for name, value in sorted(instrumentation.counters.items()):
+            QTreeWidgetItem(counters, [name, f"{value:g}"])
+        self.tree.expandAll()
+        self.tree.resizeColumnToContents(0)
+        self.profile_text.setPlainText(instrumentation.profile_text())
+
+    def clear(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings", "timings.json", "JSON (*.json)")
+        if path:
+            instrumentation.save_json(path)
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Chrome Trace", "trace.json", "Trace (*.json)")
+        if path:
+            instrumentation.save_chrome_trace(path)
+
+    def export_profile(self):
+        if instrumentation.last_profile is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Profile", "solve.prof", "pstats (*.prof)")
+        if path:
+            instrumentation.save_profile(path)
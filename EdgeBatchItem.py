@@ -0,0 +1,199 @@
+from math import atan2, cos, radians, sin
+
+import numpy as np
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtGui import QPainter, QPen, QColor, QFont
+from PyQt5.QtCore import QLineF, QPointF, QRectF
+
+
+class EdgeBatchItem(QGraphicsItem):
+    DETAIL_LOD = 0.6
+    ARROW_SIZE = 10
+    EDGE_COLOR = QColor("#FFFFFF")
+    SOLUTION_COLOR = QColor("#CE7B91")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # exposedRect lets paint() skip labels outside the repainted area.
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        # Panning and plain repaints at an unchanged zoom blit a cached
+        # pixmap instead of redrawing every arc.
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.keys = []
+        self.index = {}
+        self.labels = []
+        self.starts = np.zeros((0, 2))
+        self.ends = np.zeros((0, 2))
+        self.flows = np.zeros(0)
+        self.solution_only = False
+        self.font = QFont("Segoe UI", 10)
+        self._lines = None
+        self._rect = QRectF()
+
+    def add_edges(self, keys, starts, ends, labels):
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        self.prepareGeometryChange()
+        base = len(self.keys)
+        new, new_labels = [], []
+        for k, key in enumerate(keys):
+            existing = self.index.get(key)
+            if existing is None:
+                self.index[key] = base + len(new)
+                new.append(k)
+                new_labels.append(str(labels[k]))
+            elif existing >= base:
+                # Repeated within this batch: the last label wins.
+                new_labels[existing - base] = str(labels[k])
+            else:
+                self.labels[existing] = str(labels[k])
+        if new:
+            self.keys.extend(keys[k] for k in new)
+            self.labels.extend(new_labels)
+            self.starts = np.vstack([self.starts, starts[new]])
+            self.ends = np.vstack([self.ends, ends[new]])
+            self.flows = np.concatenate([self.flows, np.zeros(len(new))])
+        self._invalidate()
+
+    def set_geometry(self, starts, ends):
+        self.prepareGeometryChange()
+        self.starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        self.ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        self._invalidate()
+
+    def set_flows(self, flows):
+        self.flows = np.asarray(flows, dtype=np.float64)
+        self._lines = None
+        self.update()
+
+    def update_flows(self, indices, values):
+        if not len(indices):
+            return
+        self.flows[indices] = values
+        self._lines = None
+        self.update()
+
+    def set_labels(self, indices, labels):
+        for k, label in zip(indices, labels):
+            self.labels[k] = str(label)
+        self.update()
+
+    def set_solution_only(self, enabled):
+        self.solution_only = enabled
+        self.update()
+
+    def _invalidate(self):
+        self._lines = None
+        if len(self.keys):
+            points = np.vstack([self.starts, self.ends])
+            low, high = points.min(axis=0), points.max(axis=0)
+            # Leave room for labels drawn to the side of each midpoint.
+            self._rect = QRectF(low[0] - 80, low[1] - 30, high[0] - low[0] + 160, high[1] - low[1] + 60)
+        else:
+            self._rect = QRectF()
+        self.update()
+
+    def _build_lines(self):
+        # Two cached line batches for the zoomed-out view, plain and
+        # solution-carrying arcs, each drawn with a single drawLines().
+        active = self.flows > 0
+        self._lines = tuple(
+            [QLineF(x1, y1, x2, y2) for (x1, y1), (x2, y2)
+             in zip(self.starts[mask].tolist(), self.ends[mask].tolist())]
+            for mask in (~active, active))
+
+    @staticmethod
+    def _pen(color, width=2):
+        pen = QPen(color, width)
+        pen.setCosmetic(True)
+        return pen
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        if not self.keys:
+            return
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        detailed = lod >= self.DETAIL_LOD
+        rect = option.exposedRect
+        active = self.flows > 0
+        painter.setRenderHint(QPainter.Antialiasing, detailed)
+        # Cosmetic pens keep a fixed on-screen width; a scaled 2-unit pen
+        # forces Qt to stroke every arc as a polygon when zoomed in. The
+        # overview uses hairlines, which Qt draws on its fastest path.
+        width = 2 if detailed else 1
+        if detailed:
+            # Zoomed in, most arcs run far off screen: clip them to the
+            # exposed area and draw them in device coordinates, where
+            # antialiased lines take Qt's fast path.
+            transform = painter.worldTransform()
+            batches = [_device_lines(*_clip(self.starts[mask], self.ends[mask], rect), transform)
+                       for mask in (~active, active)]
+            painter.save()
+            painter.resetTransform()
+        else:
+            if self._lines is None:
+                self._build_lines()
+            batches = self._lines
+        if not self.solution_only:
+            painter.setPen(self._pen(self.EDGE_COLOR, width))
+            painter.drawLines(batches[0])
+        painter.setPen(self._pen(self.SOLUTION_COLOR, width))
+        painter.drawLines(batches[1])
+        if not detailed:
+            return
+        painter.restore()
+
+        # Arrowheads and labels only for arcs whose midpoint is exposed.
+        mids = (self.starts + self.ends) / 2
+        visible = ((mids[:, 0] >= rect.left() - 60) & (mids[:, 0] <= rect.right() + 60)
+                   & (mids[:, 1] >= rect.top() - 20) & (mids[:, 1] <= rect.bottom() + 20))
+        if self.solution_only:
+            visible &= self.flows > 0
+        painter.setFont(self.font)
+        ascent = painter.fontMetrics().ascent()
+        for k in np.flatnonzero(visible).tolist():
+            qty = self.flows[k]
+            color = self.SOLUTION_COLOR if qty > 0 else self.EDGE_COLOR
+            painter.setPen(self._pen(color))
+            (x1, y1), (x2, y2) = self.starts[k], self.ends[k]
+            angle = atan2(y2 - y1, x2 - x1)
+            for side in (-1, 1):
+                painter.drawLine(QPointF(x2, y2), QPointF(
+                    x2 - self.ARROW_SIZE * cos(angle + side * radians(30)),
+                    y2 - self.ARROW_SIZE * sin(angle + side * radians(30))))
+            label = self.labels[k]
+            if qty > 0:
+                label = f"{label} ({int(qty)})" if float(qty).is_integer() else f"{label} ({qty:.2f})"
+            x_offset = 50 if x2 > x1 else -50
+            y_offset = -5 if y2 > y1 else 5
+            painter.drawText(QPointF(mids[k, 0] + x_offset, mids[k, 1] + y_offset + ascent), label)
+
+
+def _clip(starts, ends, rect):
+    # Vectorised Liang-Barsky clipping of segments against rect.
+    x0, y0 = starts[:, 0], starts[:, 1]
+    dx, dy = ends[:, 0] - x0, ends[:, 1] - y0
+    t0 = np.zeros(len(starts))
+    t1 = np.ones(len(starts))
+    keep = np.ones(len(starts), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - rect.left()), (dx, rect.right() - x0),
+                     (-dy, y0 - rect.top()), (dy, rect.bottom() - y0)):
+            r = q / p
+            keep &= ~((p == 0) & (q < 0))
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    keep &= t0 <= t1
+    start = starts[keep] + t0[keep, None] * (ends[keep] - starts[keep])
+    end = starts[keep] + t1[keep, None] * (ends[keep] - starts[keep])
+    return start, end
+
+
+def _device_lines(starts, ends, transform):
+    matrix = np.array([[transform.m11(), transform.m12()], [transform.m21(), transform.m22()]])
+    offset = np.array([transform.dx(), transform.dy()])
+    starts = starts @ matrix + offset
+    ends = ends @ matrix + offset
+    return [QLineF(x1, y1, x2, y2) for (x1, y1), (x2, y2) in zip(starts.tolist(), ends.tolist())]
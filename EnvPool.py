@@ -0,0 +1,94 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+class EnvPool:
+    # The most Gurobi sessions the application holds at once, across its
+    # processes: the license's concurrent-session limit. Set it with
+    # GUROBI_SESSION_LIMIT; the default of one matches a pool of one.
+    SESSION_LIMIT = int(os.environ.get("GUROBI_SESSION_LIMIT", "1"))
+
+    # Parameter sets applied to an environment when it is lent out. Models
+    # copy their environment's parameters when they are created.
+    PROFILES = {
+        # Foreground solves: use every core and let Gurobi pick the method.
+        "interactive": {"OutputFlag": 0, "Threads": 0, "Method": -1},
+        # Many solves side by side: one thread each, and dual simplex, which
+        # re-solves quickly after right-hand-side and cost edits.
+        "batch": {"OutputFlag": 0, "Threads": 1, "Method": 1},
+    }
+
+    def __init__(self, size=1, profiles=None, default_profile="interactive"):
+        # All environments are started here, so the license check is paid
+        # once up front. size is the most Gurobi sessions this process
+        # will ever hold; keep it within the license's limit.
+        from gurobipy import Env
+
+        self.profiles = dict(self.PROFILES, **(profiles or {}))
+        self.default_profile = default_profile
+        self.size = size
+        self._envs = []
+        self._idle = queue.Queue()
+        self._profile_of = {}
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+        for _ in range(size):
+            env = Env(empty=True)
+            env.setParam("OutputFlag", 0)
+            env.start()
+            self._envs.append(env)
+            self._idle.put(env)
+
+    def acquire(self, profile=None, timeout=None):
+        profile = profile or self.default_profile
+        params = self.profiles[profile]
+        start = time.perf_counter()
+        try:
+            env = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No Gurobi environment free after {timeout}s")
+        wait = time.perf_counter() - start
+        with self._lock:
+            self.acquired += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.last_wait = wait
+        if self._profile_of.get(id(env)) != profile:
+            env.resetParams()
+            for name, value in params.items():
+                env.setParam(name, value)
+            self._profile_of[id(env)] = profile
+        return env
+
+    def release(self, env):
+        self._idle.put(env)
+
+    @contextmanager
+    def env(self, profile=None, timeout=None):
+        env = self.acquire(profile, timeout)
+        try:
+            yield env
+        finally:
+            self.release(env)
+
+    @property
+    def in_use(self):
+        return self.size - self._idle.qsize()
+
+    def stats(self):
+        with self._lock:
+            return {"size": self.size, "in_use": self.in_use, "acquired": self.acquired,
+                    "total_wait": self.total_wait, "max_wait": self.max_wait,
+                    "mean_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+                    "last_wait": self.last_wait}
+
+    def close(self):
+        for env in self._envs:
+            env.dispose()
+        self._envs = []
@@ -0,0 +1,188 @@
+import hashlib
+
+import numpy as np
+
+from Instrumentation import instrumentation
+from NetworkInstance import NetworkInstance
+
+METHODS = ("columns", "layered", "force")
+
+
+class Layout:
+    def __init__(self, key, method, names, positions):
+        # positions[k] is the scene position of the node called names[k].
+        self.key = key
+        self.method = method
+        self.names = names
+        self.positions = positions
+
+
+def resolve_method(network, method):
+    # "auto" lays out plain shipments in layers and networks with hubs,
+    # whose arcs run between any two kinds of node, by forces.
+    if method == "auto":
+        return "force" if network.num_hubs else "layered"
+    if method not in METHODS:
+        raise ValueError(f"Unknown layout: {method}; use auto or one of {', '.join(METHODS)}")
+    return method
+
+
+def layout_key(network, method, flows=None):
+    # Identifies a layout by the graph's nodes and arcs, the method and the
+    # flows it was weighted by; costs and amounts do not move anything.
+    digest = hashlib.sha1(method.encode("utf-8"))
+    digest.update("\0".join(network.node_names).encode("utf-8"))
+    digest.update(np.ascontiguousarray(network.tails, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(network.heads, dtype=np.int64).tobytes())
+    if flows is not None:
+        digest.update(np.round(np.asarray(flows, dtype=np.float64), 6).tobytes())
+    return digest.hexdigest()
+
+
+def compute_layout(network, method="auto", flows=None):
+    # Runs off the GUI thread: only reads the network and returns a Layout.
+    if not isinstance(network, NetworkInstance):
+        network = NetworkInstance.from_transport(network)
+    method = resolve_method(network, method)
+    key = layout_key(network, method, flows)
+    weights = arc_weights(flows) if flows is not None else None
+    with instrumentation.span("graph.layout", method=method, nodes=network.num_nodes, arcs=network.num_arcs):
+        if method == "columns":
+            positions = column_layout(network)
+        elif method == "layered":
+            positions = layered_layout(network, weights)
+        else:
+            positions = force_layout(network, weights)
+    return Layout(key, method, list(network.node_names), positions)
+
+
+def arc_weights(flows, idle=0.05):
+    # Arcs carrying flow pull in proportion to it; the rest still pull a
+    # little, so nodes without flow stay near their neighbours.
+    flows = np.asarray(flows, dtype=np.float64)
+    peak = flows.max(initial=0.0)
+    return idle + (flows / peak if peak > 0 else np.zeros_like(flows))
+
+
+def column_layout(network, spacing=100.0):
+    # The hand-built arrangement: warehouses, hubs and clients in three
+    # columns, each node 100 below the previous one.
+    counts = (network.num_warehouses, network.num_hubs, network.num_clients)
+    layer = np.repeat([0, 1, 2], counts)
+    index = np.concatenate([np.arange(c) for c in counts])
+    return np.column_stack([(layer - 1) * 200.0, index * spacing - 200.0])
+
+
+def _layers(network):
+    counts = (network.num_warehouses, network.num_hubs, network.num_clients)
+    layer = np.repeat([0, 1, 2], counts)
+    return layer, [np.flatnonzero(layer == k) for k in range(3) if counts[k]]
+
+
+def layered_layout(network, weights=None, sweeps=50, spacing=100.0, column_gap=70.0, layer_gap=300.0):
+    # Warehouses, hubs and clients in layers, each layer ordered by the
+    # barycenter heuristic: every sweep sorts a layer by the weighted mean
+    # position of its neighbours in the other layers, top to bottom and
+    # back, until no order changes. A long layer is folded row by row into
+    # several columns, so positions still grow with the order and a few
+    # hundred clients make a block instead of a strip.
+    layer, groups = _layers(network)
+    tails, heads = network.tails, network.heads
+    weights = np.ones(network.num_arcs) if weights is None else np.asarray(weights, dtype=np.float64)
+    count = network.num_nodes
+    # Position of each node along its layer, scaled to 0..1 so that layers
+    # of different lengths compare.
+    rank = np.zeros(count)
+    for nodes in groups:
+        rank[nodes] = (np.arange(len(nodes)) + 0.5) / len(nodes)
+    order = list(range(len(groups)))
+    passes = order[1:] + order[-2::-1] if len(groups) > 1 else []
+    for _ in range(sweeps):
+        changed = False
+        for k in passes:
+            nodes = groups[k]
+            other = layer[tails] != layer[heads]
+            total = np.bincount(tails[other], weights[other] * rank[heads[other]], count)
+            total += np.bincount(heads[other], weights[other] * rank[tails[other]], count)
+            mass = np.bincount(tails[other], weights[other], count) + np.bincount(heads[other], weights[other], count)
+            own = rank[nodes]
+            center = np.where(mass[nodes] > 0, total[nodes] / np.where(mass[nodes] > 0, mass[nodes], 1), own)
+            sequence = np.lexsort((own, center))
+            if np.any(sequence != np.argsort(own, kind="stable")):
+                changed = True
+            rank[nodes[sequence]] = (np.arange(len(nodes)) + 0.5) / len(nodes)
+        if not changed:
+            break
+
+    positions = np.zeros((count, 2))
+    x = 0.0
+    for nodes in groups:
+        size = len(nodes)
+        columns = 1 if size <= 30 else int(np.ceil(np.sqrt(size * spacing / (1.5 * column_gap))))
+        rows = int(np.ceil(size / columns))
+        place = np.argsort(np.argsort(rank[nodes]))
+        row, column = np.divmod(place, columns)
+        positions[nodes, 0] = x + column * column_gap
+        positions[nodes, 1] = (row - (rows - 1) / 2) * spacing
+        x += (columns - 1) * column_gap + layer_gap
+    positions[:, 0] -= x / 2
+    return positions
+
+
+def force_layout(network, weights=None, iterations=200, spacing=150.0, seed=0, block=2048, budget=1.5e8):
+    # Fruchterman-Reingold: nodes repel, every arc attracts its ends in
+    # proportion to its weight, and the step limit cools linearly. Pairs
+    # closer than a grid cell repel exactly, found through a k-d tree;
+    # farther nodes are lumped into the occupied cells of a coarse grid,
+    # so an iteration costs nodes x cells instead of nodes x nodes, and
+    # large graphs get fewer iterations to stay within budget.
+    from scipy.spatial import cKDTree
+
+    count = network.num_nodes
+    if count == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    weights = np.ones(network.num_arcs) if weights is None else np.asarray(weights, dtype=np.float64)
+    k = spacing
+    grid = max(1, int(np.sqrt(count) / 4))
+    iterations = min(iterations, max(40, int(budget / (count * (grid * grid + 50)))))
+    # Start from the layers, slightly shaken so no two nodes coincide.
+    positions = layered_layout(network, weights, spacing=spacing) + rng.normal(0, 1, (count, 2))
+    tails, heads = network.tails, network.heads
+    for i in range(iterations):
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        size = max(float((high - low).max()) / grid, k)
+        moves = np.zeros((count, 2))
+
+        pairs = cKDTree(positions).query_pairs(size, output_type="ndarray")
+        if len(pairs):
+            first, second = pairs[:, 0], pairs[:, 1]
+            delta = positions[first] - positions[second]
+            push = delta * (k * k / np.maximum((delta ** 2).sum(axis=1), 1e-2))[:, None]
+            moves += _gather(first, push, count) - _gather(second, push, count)
+
+        if grid > 1:
+            cell = np.minimum(((positions - low) // size).astype(np.int64), grid - 1)
+            cell = cell[:, 0] * grid + cell[:, 1]
+            mass = np.bincount(cell, minlength=grid * grid)
+            used = np.flatnonzero(mass)
+            centers = np.column_stack([np.bincount(cell, positions[:, d], grid * grid)[used]
+                                       for d in (0, 1)]) / mass[used, None]
+            for start in range(0, count, block):
+                delta = positions[start:start + block, None, :] - centers[None, :, :]
+                dist2 = (delta ** 2).sum(axis=2)
+                far = np.where(dist2 > size * size, mass[used] * k * k / np.maximum(dist2, 1e-2), 0.0)
+                moves[start:start + block] += (delta * far[..., None]).sum(axis=1)
+
+        delta = positions[tails] - positions[heads]
+        pull = delta * (np.hypot(delta[:, 0], delta[:, 1]) / k * weights)[:, None]
+        moves += _gather(heads, pull, count) - _gather(tails, pull, count)
+        length = np.maximum(np.hypot(moves[:, 0], moves[:, 1]), 1e-9)
+        limit = 5 * k * (1 - i / iterations) + 1.0
+        positions += moves * (np.minimum(length, limit) / length)[:, None]
+    return positions - positions.mean(axis=0)
+
+
+def _gather(nodes, vectors, count):
+    # Sums of 2-D vectors per node; np.add.at without its slow path.
+    return np.column_stack([np.bincount(nodes, vectors[:, d], count) for d in (0, 1)])
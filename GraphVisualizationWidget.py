@@ -1,21 +1,45 @@
 from math import atan2, cos, radians, sin
 
-from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene,
-                             QGraphicsEllipseItem, QGraphicsTextItem, QGraphicsLineItem, QGraphicsRectItem)
-from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont
+import numpy as np
+from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsEllipseItem, QGraphicsTextItem,
+                             QGraphicsLineItem, QGraphicsRectItem, QGraphicsPolygonItem)
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QPolygonF
 from PyQt5.QtCore import Qt, QPointF
 
+from EdgeBatchItem import EdgeBatchItem
+from Instrumentation import instrumentation
+from NetworkInstance import NetworkInstance
+
 class GraphVisualizationWidget(QGraphicsView):
+    SCALABLE_EDGE_THRESHOLD = 500
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setRenderHint(QPainter.Antialiasing)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Repaint only the regions of items that changed; the scene's BSP
+        # index finds them instead of redrawing the whole viewport.
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.scene = QGraphicsScene(self)
         self.scene.setBackgroundBrush(QColor("#1E2124"))
         self.setScene(self.scene)
         self.nodes = {}
+        self.node_values = {}
+        self.node_amounts = {}
         self.edges = []
         self.edgeItems = {}
+        self.edge_costs = {}
+        self.solution = {}
+        # Sensitivity overlay text shown next to node values and arc costs.
+        self.node_notes = {}
+        self.edge_notes = {}
+        self.scalable = False
+        self.solution_only = False
+        self.edge_batch = None
+        # The view follows the window size until the user zooms; a double
+        # click fits the whole graph again.
+        self.auto_fit = True
 
     def add_node(self, node_name, node_type, index, value):
         if node_name in self.nodes:
@@ -23,6 +47,10 @@ class GraphVisualizationWidget(QGraphicsView):
         if node_type == "Warehouse":
             shape = QGraphicsRectItem(-20, -20, 40, 40)  
             color = "#0081A7"
+        elif node_type == "Hub":
+            shape = QGraphicsPolygonItem(QPolygonF([QPointF(0, -24), QPointF(24, 0),
+                                                    QPointF(0, 24), QPointF(-24, 0)]))
+            color = "#00AFB9"
         else:
             shape = QGraphicsEllipseItem(-20, -20, 40, 40)  
             color = "#F07167"
@@ -39,7 +67,8 @@ class GraphVisualizationWidget(QGraphicsView):
         text.setParentItem(shape)  
         text.setPos(-text.boundingRect().width() / 2, -text.boundingRect().height() / 2)
 
-        x = -200 if node_type == "Warehouse" else 200
+        # Hubs sit in a middle column between warehouses and clients.
+        x = {"Warehouse": -200, "Hub": 0}.get(node_type, 200)
         y = index * 100 - 200
         shape.setPos(x, y)
 
@@ -48,20 +77,194 @@ class GraphVisualizationWidget(QGraphicsView):
         value_text.setFont(QFont("Segoe UI", 9))
         value_text.setParentItem(shape)  
         value_text.setPos(-value_text.boundingRect().width() / 2, 25)  
-        self.scene.addItem(value_text)
 
         self.nodes[node_name] = shape
+        self.node_values[node_name] = value_text
+        self.node_amounts[node_name] = value
+
+    def set_node_value(self, node_name, value):
+        if node_name not in self.node_values:
+            return
+        self.node_amounts[node_name] = value
+        self._refresh_node_text(node_name)
+
+    def _refresh_node_text(self, node_name):
+        value_text = self.node_values[node_name]
+        note = self.node_notes.get(node_name)
+        amount = self.node_amounts[node_name]
+        value_text.setPlainText(f"{amount}\n{note}" if note else f"{amount}")
+        value_text.setPos(-value_text.boundingRect().width() / 2, 25)
+
+    def clear(self):
+        self.scene.clear()
+        self.nodes = {}
+        self.node_values = {}
+        self.node_amounts = {}
+        self.edges = []
+        self.edgeItems = {}
+        self.edge_costs = {}
+        self.solution = {}
+        self.node_notes = {}
+        self.edge_notes = {}
+        self.edge_batch = None
+        if self.scalable:
+            self.edge_batch = EdgeBatchItem()
+            self.edge_batch.set_solution_only(self.solution_only)
+            self.scene.addItem(self.edge_batch)
+
+    def set_scalable(self, enabled):
+        # Scalable mode draws every arc through one EdgeBatchItem instead of
+        # four scene items per arc.
+        if enabled == self.scalable:
+            return
+        self.scalable = enabled
+        if enabled:
+            for items in self.edgeItems.values():
+                for item in items:
+                    self.scene.removeItem(item)
+            self.edgeItems = {}
+            self.edge_batch = EdgeBatchItem()
+            self.edge_batch.set_solution_only(self.solution_only)
+            self.scene.addItem(self.edge_batch)
+            if self.edges:
+                starts, ends = self._edge_geometry(self.edges)
+                self.edge_batch.add_edges(self.edges, starts, ends,
+                                          [self._edge_label(edge) for edge in self.edges])
+        else:
+            self.scene.removeItem(self.edge_batch)
+            self.edge_batch = None
+            for edge in self.edges:
+                w, c = edge
+                self.edgeItems[edge] = self._draw_edge(self.nodes[w].scenePos(), self.nodes[c].scenePos(),
+                                                       self._edge_label(edge))
+        # The new items start unhighlighted, so replay the whole solution.
+        solution, self.solution = self.solution, {}
+        self.highlight_solution(solution)
+        if self.solution_only:
+            self.set_solution_only(True)
+
+    def set_solution_only(self, enabled):
+        self.solution_only = enabled
+        if self.edge_batch is not None:
+            self.edge_batch.set_solution_only(enabled)
+        for edge, items in self.edgeItems.items():
+            visible = not enabled or self.solution.get(edge, 0) > 0
+            for item in items:
+                item.setVisible(visible)
+
+    def _edge_geometry(self, edges):
+        # Each end's position is read once, however many arcs it has.
+        names = list({name for edge in edges for name in edge})
+        index = {name: k for k, name in enumerate(names)}
+        positions = np.array([[p.x(), p.y()] for p in (self.nodes[name].scenePos() for name in names)])
+        starts = positions[[index[w] for w, _ in edges]].reshape(-1, 2)
+        ends = positions[[index[c] for _, c in edges]].reshape(-1, 2)
+        return starts, _shrink(starts, ends)
+
+    def load_instance(self, instance):
+        # One batched rebuild: no repaints and no scene index maintenance
+        # while thousands of items are inserted.
+        with instrumentation.span("graph.load", arcs=instance.num_arcs):
+            self.setUpdatesEnabled(False)
+            self.scene.blockSignals(True)
+            self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+            try:
+                self.clear()
+                # A plain transportation instance is a network without hubs.
+                if not isinstance(instance, NetworkInstance):
+                    instance = NetworkInstance.from_transport(instance)
+                for node_type, names, values in (("Warehouse", instance.warehouse_names, instance.supplies),
+                                                 ("Hub", instance.hub_names, instance.throughputs),
+                                                 ("Client", instance.client_names, instance.demands)):
+                    for index, (name, value) in enumerate(zip(names, values.tolist())):
+                        self.add_node(name, node_type, index, _display_value(value))
+                if instance.num_arcs > self.SCALABLE_EDGE_THRESHOLD:
+                    self.set_scalable(True)
+                labels = [_arc_label(cost, capacity) for cost, capacity
+                          in zip(instance.costs.tolist(), instance.capacities.tolist())]
+                if self.scalable:
+                    self._load_edges_batched(instance, labels)
+                else:
+                    for k in range(instance.num_arcs):
+                        tail, head = instance.arc_key(k)
+                        self.add_edge(tail, head, labels[k])
+            finally:
+                self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+                self.scene.blockSignals(False)
+                self.setUpdatesEnabled(True)
+            self.fit_view()
+
+    def apply_layout(self, names, positions):
+        # Moves every node of a computed layout in one batched update and
+        # re-routes the arcs; names the scene does not hold are skipped.
+        with instrumentation.span("graph.layout.apply", nodes=len(names)):
+            self.setUpdatesEnabled(False)
+            self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+            try:
+                for name, (x, y) in zip(names, np.asarray(positions).tolist()):
+                    node = self.nodes.get(name)
+                    if node is not None:
+                        node.setPos(x, y)
+                if self.scalable:
+                    if self.edge_batch.keys:
+                        starts, ends = self._edge_geometry(self.edge_batch.keys)
+                        self.edge_batch.set_geometry(starts, ends)
+                else:
+                    for edge in self.edges:
+                        for item in self.edgeItems.pop(edge, []):
+                            self.scene.removeItem(item)
+                        w, c = edge
+                        self.edgeItems[edge] = self._draw_edge(self.nodes[w].scenePos(), self.nodes[c].scenePos(),
+                                                               self._edge_label(edge))
+                        qty = self.solution.get(edge, 0)
+                        if qty > 0 or self.solution_only:
+                            self._style_edge(edge, qty)
+            finally:
+                self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+                self.setUpdatesEnabled(True)
+            self.scene.setSceneRect(self.scene.itemsBoundingRect())
+            if self.auto_fit:
+                self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+
+    def fit_view(self):
+        self.auto_fit = True
+        self.scene.setSceneRect(self.scene.itemsBoundingRect())
+        self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
 
+    def _load_edges_batched(self, instance, labels):
+        positions = np.array([[p.x(), p.y()] for p in (self.nodes[name].scenePos()
+                                                       for name in instance.node_names)]).reshape(-1, 2)
+        starts = positions[instance.tails]
+        ends = positions[instance.heads]
+        edges = [instance.arc_key(k) for k in range(instance.num_arcs)]
+        # A lane listed twice is one edge, labelled by its last listing as
+        # add_edges does; self.edges holds each key once.
+        self.edge_costs = dict(zip(edges, labels))
+        self.edges = list(self.edge_costs)
+        self.edge_batch.add_edges(edges, starts, _shrink(starts, ends), labels)
 
     def add_edge(self, warehouse, client, cost):
         if warehouse not in self.nodes or client not in self.nodes:
             return
+        edge_key = (warehouse, client)
+        if edge_key not in self.edge_costs:
+            self.edges.append(edge_key)
+        self.edge_costs[edge_key] = cost
+        if not self.scalable and len(self.edges) > self.SCALABLE_EDGE_THRESHOLD:
+            self.set_scalable(True)
+        if self.scalable:
+            starts, ends = self._edge_geometry([edge_key])
+            self.edge_batch.add_edges([edge_key], starts, ends, [self._edge_label(edge_key)])
+            return
+        for item in self.edgeItems.pop(edge_key, []):
+            self.scene.removeItem(item)
         pos1 = self.nodes[warehouse].scenePos()
         pos2 = self.nodes[client].scenePos()
-        edge_key = (warehouse, client)
-        items = self._draw_edge(pos1, pos2, cost)
+        items = self._draw_edge(pos1, pos2, self._edge_label(edge_key))
         self.edgeItems[edge_key] = items
-        self.edges.append(edge_key)
+        qty = self.solution.get(edge_key, 0)
+        if qty > 0 or self.solution_only:
+            self._style_edge(edge_key, qty)
 
     def _draw_edge(self, start, end, weight):
         items_created = []
@@ -117,30 +320,117 @@ class GraphVisualizationWidget(QGraphicsView):
         return [arrow_line1, arrow_line2]
 
     def highlight_solution(self, solution):
-        original_texts = {edge: items[1].toPlainText() for edge, items in self.edgeItems.items() if
-                          len(items) > 1 and isinstance(items[1], QGraphicsTextItem)}
+        # Only arcs whose flow started, stopped or changed since the last
+        # solution are restyled.
+        with instrumentation.span("graph.highlight", arcs=len(solution)):
+            previous = self.solution
+            self.solution = solution
+            changed = [edge for edge in previous.keys() | solution.keys()
+                       if previous.get(edge, 0) != solution.get(edge, 0)]
+            if self.scalable:
+                index = self.edge_batch.index
+                changed = [edge for edge in changed if edge in index]
+                self.edge_batch.update_flows([index[edge] for edge in changed],
+                                             [solution.get(edge, 0) for edge in changed])
+                return
+            for edge in changed:
+                if edge in self.edgeItems:
+                    self._style_edge(edge, solution.get(edge, 0))
 
-        for edge in self.edgeItems:
-            try:
-                items = self.edgeItems[edge]
-                w, c = edge
-                qty = solution.get(edge, 0)
-                color = "#CE7B91" if qty > 0 else "#FFFFFF"
-                for item in items:
-                    if isinstance(item, QGraphicsLineItem):
-                        pen = QPen(QColor(color), 2)
-                        item.setPen(pen)
-                    elif isinstance(item, QGraphicsTextItem) and qty > 0:
-                        item.setDefaultTextColor(QColor(color))
-                        qty_text = f"{int(qty)}" if qty.is_integer() else f"{qty:.2f}"
-                        original_cost = original_texts.get(edge, "0")
-                        item.setPlainText(f"{original_cost} ({qty_text})")
-                    elif isinstance(item, QGraphicsTextItem):
-                        item.setDefaultTextColor(QColor("#FFFFFF"))
-                        item.setPlainText(original_texts.get(edge, "0"))
-            except Exception as e:
-                print(f"Error in GraphVisualizationWidget.highlight_solution for edge {edge}: {e}")
+    def _style_edge(self, edge, qty):
+        # edgeItems[edge] is [line, label, arrowhead, arrowhead], as built by
+        # _draw_edge.
+        line, label, *arrows = self.edgeItems[edge]
+        color = QColor("#CE7B91" if qty > 0 else "#FFFFFF")
+        pen = QPen(color, 2)
+        for item in (line, *arrows):
+            item.setPen(pen)
+        label.setDefaultTextColor(color)
+        text = self._edge_label(edge)
+        if qty > 0:
+            qty_text = f"{int(qty)}" if float(qty).is_integer() else f"{qty:.2f}"
+            label.setPlainText(f"{text} ({qty_text})")
+        else:
+            label.setPlainText(text)
+        visible = not self.solution_only or qty > 0
+        for item in (line, label, *arrows):
+            item.setVisible(visible)
+
+    def _edge_label(self, edge):
+        note = self.edge_notes.get(edge)
+        cost = self.edge_costs[edge]
+        return f"{cost} [{note}]" if note else f"{cost}"
+
+    def show_sensitivity(self, sensitivity, tol=1e-9):
+        # Shadow prices under the nodes, and reduced costs on the arcs that
+        # would have to get cheaper to enter the solution.
+        inst = sensitivity.solution.instance
+        node_notes = {}
+        for names, prices in ((inst.warehouse_names, sensitivity.supply_duals),
+                              (inst.client_names, sensitivity.demand_duals)):
+            node_notes.update((name, f"π {price:g}") for name, price in zip(names, prices.tolist()))
+        edge_notes = {inst.arc_key(k): f"rc {sensitivity.reduced_costs[k]:g}"
+                      for k in np.flatnonzero(sensitivity.reduced_costs > tol).tolist()}
+        self._set_notes(node_notes, edge_notes)
+
+    def hide_sensitivity(self):
+        self._set_notes({}, {})
+
+    def _set_notes(self, node_notes, edge_notes):
+        # Like highlight_solution, only nodes and arcs whose text changes
+        # are touched.
+        previous_nodes, self.node_notes = self.node_notes, node_notes
+        for name in previous_nodes.keys() | node_notes.keys():
+            if name in self.node_values and previous_nodes.get(name) != node_notes.get(name):
+                self._refresh_node_text(name)
+        previous_edges, self.edge_notes = self.edge_notes, edge_notes
+        changed = [edge for edge in previous_edges.keys() | edge_notes.keys()
+                   if edge in self.edge_costs and previous_edges.get(edge) != edge_notes.get(edge)]
+        if self.scalable:
+            index = self.edge_batch.index
+            changed = [edge for edge in changed if edge in index]
+            self.edge_batch.set_labels([index[edge] for edge in changed],
+                                       [self._edge_label(edge) for edge in changed])
+            return
+        for edge in changed:
+            if edge in self.edgeItems:
+                self._style_edge(edge, self.solution.get(edge, 0))
+
+    def paintEvent(self, event):
+        with instrumentation.span("graph.paint"):
+            super().paintEvent(event)
+
+    def wheelEvent(self, event):
+        self.auto_fit = False
+        factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+        self.scale(factor, factor)
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_view()
+        super().mouseDoubleClickEvent(event)
 
     def resizeEvent(self, event):
-        self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
-        super().resizeEvent(event)
\ No newline at end of file
+        # Refitting on every resize would throw away the user's zoom.
+        if self.auto_fit:
+            self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+        super().resizeEvent(event)
+
+
+def _shrink(starts, ends, shrink=20):
+    # Stop arcs at the target node's border, as _draw_edge does.
+    delta = ends - starts
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    ratio = np.where(length > 0, (length - shrink) / np.where(length > 0, length, 1), 1)
+    return starts + delta * ratio[:, None]
+
+
+def _display_value(value):
+    value = float(value)
+    if value == float("inf"):
+        return "∞"
+    return int(value) if value.is_integer() else value
+
+
+def _arc_label(cost, capacity):
+    cost = _display_value(cost)
+    return cost if capacity == float("inf") else f"{cost} ≤{_display_value(capacity)}"
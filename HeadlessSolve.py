@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+
+import ProjectIO
+from DenseTransportInstance import DenseTransportInstance
+from MultiPeriodInstance import MultiPeriodInstance
+from NetworkInstance import NetworkInstance
+from SolverBackend import GurobiBackend, get_backend
+from TransportInstance import TransportInstance
+
+
+def solve_instance(instance, backend="gurobi", cache=None, progress=None, pool=None):
+    options = {"pool": pool} if backend == GurobiBackend.name else {}
+    if isinstance(instance, NetworkInstance):
+        # The solution cache and warm starts only cover bipartite instances.
+        return get_backend(backend, network=True, **options).solve(instance, progress)
+    if isinstance(instance, DenseTransportInstance):
+        # A dense cost matrix may not fit in memory as an arc list; price
+        # its lanes into a restricted model instead.
+        from ColumnGeneration import ColumnGeneration
+
+        return ColumnGeneration(instance, backend, **options).solve(progress)
+    if cache is not None:
+        cached = cache.get(instance)
+        if cached is not None:
+            return cached
+    solver = get_backend(backend, **options)
+    if cache is not None:
+        solver.warm_start = cache.warm_start(instance)
+    solution = solver.solve(instance, progress)
+    if cache is not None:
+        cache.put(solution)
+    return solution
+
+
+def solve_files(paths, backend="gurobi", output=None, fmt=None, cache_path=None):
+    # Solves each project file and writes its result. With several inputs,
+    # output names a directory that receives <input name>.<fmt> per file;
+    # without output, results go to stdout. Returns the process exit code.
+    cache = None
+    if cache_path is not None:
+        from SolutionCache import SolutionCache
+
+        cache = SolutionCache(path=cache_path)
+    pool = None
+    if backend == GurobiBackend.name:
+        # Silent environments, so the solver log stays off stdout, started
+        # once for the whole batch.
+        from EnvPool import EnvPool
+
+        pool = EnvPool()
+    if output is not None and len(paths) > 1:
+        os.makedirs(output, exist_ok=True)
+    exit_code = 0
+    try:
+        for path in paths:
+            try:
+                instance = ProjectIO.load_instance(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"{path}: could not load: {e}", file=sys.stderr)
+                exit_code = 1
+                continue
+            if isinstance(instance, MultiPeriodInstance):
+                print(f"{path}: a multi-period plan; solve it with the plan command", file=sys.stderr)
+                exit_code = 1
+                continue
+            solution = solve_instance(instance, backend, cache, pool=pool)
+            if not solution.is_optimal:
+                exit_code = 1
+            objective = "-" if solution.objective is None else f"{solution.objective:g}"
+            print(f"{path}: {solution.status}, objective {objective} "
+                  f"({solution.backend}, {solution.runtime:.3f}s)", file=sys.stderr)
+            if output is None:
+                ProjectIO.write_solution(solution, sys.stdout, fmt or "json")
+            elif len(paths) > 1:
+                name = os.path.splitext(os.path.basename(path))[0]
+                ProjectIO.save_solution(solution, os.path.join(output, f"{name}.{fmt or 'json'}"))
+            else:
+                ProjectIO.save_solution(solution, output)
+    finally:
+        if cache is not None:
+            cache.close()
+        if pool is not None:
+            stats = pool.stats()
+            print(f"Gurobi environments: {stats['acquired']} solves, waited {stats['mean_wait'] * 1000:.2f} ms "
+                  f"on average, {stats['max_wait'] * 1000:.2f} ms at most", file=sys.stderr)
+            pool.close()
+    return exit_code
+
+
+def plan_file(path, backend="gurobi", mode="rolling", window=4, output=None, warm=True):
+    # Plans a multi-period project file and writes the plan as JSON, to
+    # output or stdout. Returns the process exit code.
+    from MultiPeriodPlanner import MultiPeriodPlanner
+
+    instance = ProjectIO.load_instance(path)
+    if not isinstance(instance, MultiPeriodInstance):
+        raise ValueError(f"{path} is not a multi-period project")
+    pool = None
+    if backend == GurobiBackend.name:
+        from EnvPool import EnvPool
+
+        pool = EnvPool()
+    try:
+        plan = MultiPeriodPlanner(instance, backend, mode, window, pool=pool, warm=warm).solve()
+    finally:
+        if pool is not None:
+            pool.close()
+    objective = "-" if plan.objective is None else f"{plan.objective:g}"
+    print(f"{path}: {plan.status}, objective {objective} over {instance.num_periods} periods "
+          f"({plan.backend}, {plan.solves} solves, {plan.iterations} iterations, {plan.runtime:.3f}s)",
+          file=sys.stderr)
+    if output is None:
+        json.dump(ProjectIO.plan_record(plan), sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(ProjectIO.plan_record(plan), f)
+            f.write("\n")
+    return 0 if plan.is_optimal else 1
+
+
+def stochastic_file(path, scenarios=None, samples=200, distribution="normal", spread=0.2, evaluate=10_000,
+                    seed=0, shortage_penalty=None, surplus_cost=0.0, output=None):
+    # Plans a project against demand scenarios (S x clients; by default
+    # samples drawn around the project's demands) and scores the plan, and
+    # the plan for mean demand, on evaluate fresh scenarios. The shortage
+    # penalty defaults to twice the dearest lane. Writes a JSON report to
+    # output or stdout and returns the process exit code.
+    import numpy as np
+
+    from EnvPool import EnvPool
+    from StochasticTransport import StochasticTransport, sample_demands
+
+    instance = ProjectIO.load_instance(path)
+    if not isinstance(instance, TransportInstance):
+        raise ValueError(f"{path}: stochastic demand needs a warehouse/client project")
+    if scenarios is None:
+        scenarios = sample_demands(instance.demands, samples, distribution, spread, seed)
+    # Scored on draws the plan has not seen.
+    evaluation = sample_demands(instance.demands, evaluate, distribution, spread, seed + 1)
+    if shortage_penalty is None:
+        shortage_penalty = 2.0 * float(instance.costs.max(initial=1.0))
+    pool = EnvPool()
+    try:
+        model = StochasticTransport(instance, scenarios, shortage_penalty, surplus_cost, pool=pool)
+        plan = model.solve()
+        mean_plan = StochasticTransport(instance, scenarios.mean(axis=0), shortage_penalty, surplus_cost,
+                                        pool=pool).solve()
+    finally:
+        pool.close()
+    objective = "-" if plan.objective is None else f"{plan.objective:g}"
+    print(f"{path}: {plan.status}, expected cost {objective} over {model.num_scenarios} scenarios "
+          f"({plan.runtime:.3f}s)", file=sys.stderr)
+    report = {"plan": ProjectIO.solution_record(plan), "scenarios": model.num_scenarios}
+    if plan.is_optimal and mean_plan.is_optimal:
+        costs = model.evaluate(plan.flows, evaluation)
+        mean_costs = model.evaluate(mean_plan.flows, evaluation)
+        counts, edges = np.histogram(costs.costs, bins=20)
+        report.update(out_of_sample=costs.summary(), mean_demand_plan=mean_costs.summary(),
+                      histogram={"edges": edges.tolist(), "counts": counts.tolist()})
+        print(f"Out of sample over {costs.num_scenarios} scenarios: mean {costs.mean:g}, "
+              f"95th percentile {costs.quantile(0.95):g}; the mean-demand plan: mean {mean_costs.mean:g}, "
+              f"95th percentile {mean_costs.quantile(0.95):g}", file=sys.stderr)
+    if output is None:
+        json.dump(report, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+            f.write("\n")
+    return 0 if plan.is_optimal else 1
@@ -0,0 +1,89 @@
+import numpy as np
+
+from DenseTransportInstance import DenseTransportInstance
+from MultiPeriodInstance import MultiPeriodInstance
+from TransportHeuristics import north_west_corner
+from TransportInstance import TransportInstance
+
+
+def generate_instance(num_warehouses, num_clients, density=1.0, balanced=True, seed=0,
+                      max_cost=100, slack=0.2):
+    # Seeded random transportation instance. Balanced instances ship every
+    # unit of supply; unbalanced ones carry slack spare capacity. Sparse
+    # instances (density < 1) give each client about density * warehouses
+    # lanes, plus the lanes of a north-west corner plan so that every
+    # instance stays feasible.
+    rng = np.random.default_rng(seed)
+    m, n = num_warehouses, num_clients
+    demands = rng.integers(10, 100, n)
+    total = int(demands.sum())
+    if not balanced:
+        total = int(np.ceil(total * (1 + slack)))
+    supplies = _split(rng, total, m)
+    if density >= 1:
+        rows, cols = np.divmod(np.arange(m * n, dtype=np.int64), n)
+    else:
+        per_client = max(1, int(round(density * m)))
+        picked = rng.integers(0, m, (n, per_client)) * n + np.arange(n)[:, None]
+        nw_rows, nw_cols, _ = north_west_corner(supplies, demands)
+        cells = np.unique(np.concatenate([picked.ravel(), nw_rows * n + nw_cols]))
+        rows, cols = np.divmod(cells, n)
+    costs = rng.integers(1, max_cost, len(rows))
+    return TransportInstance([f"W{i}" for i in range(m)], supplies,
+                             [f"C{j}" for j in range(n)], demands, rows, cols, costs)
+
+
+def generate_dense(num_warehouses, num_clients, path=None, seed=0, max_cost=100, slack=0.2,
+                   block_cells=4_000_000):
+    # Seeded instance over every lane, priced by the distance between random
+    # warehouse and client sites. With path the cost matrix is written to
+    # that .npy a block of rows at a time and memory-mapped read-only, so
+    # it can exceed memory; supplies carry slack spare capacity.
+    rng = np.random.default_rng(seed)
+    m, n = num_warehouses, num_clients
+    demands = rng.integers(10, 100, n)
+    supplies = _split(rng, int(np.ceil(demands.sum() * (1 + slack))), m)
+    warehouse_sites = rng.random((m, 2))
+    client_sites = rng.random((n, 2))
+    if path is None:
+        costs = np.empty((m, n))
+    else:
+        costs = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(m, n))
+    rows = max(1, block_cells // max(1, n))
+    for start in range(0, m, rows):
+        gap = warehouse_sites[start:start + rows, None, :] - client_sites[None, :, :]
+        costs[start:start + rows] = np.ceil(np.hypot(gap[..., 0], gap[..., 1]) * max_cost)
+    if path is not None:
+        costs.flush()
+        del costs
+        costs = np.load(path, mmap_mode="r")
+    return DenseTransportInstance([f"W{i}" for i in range(m)], supplies,
+                                  [f"C{j}" for j in range(n)], demands, costs)
+
+
+def generate_multi_period(num_warehouses, num_clients, periods=52, density=1.0, seed=0, max_cost=100,
+                          slack=0.3, season=0.25, holding=(1, 4)):
+    # Seeded plan over weekly periods on the lanes of generate_instance.
+    # Demand follows a yearly season of relative amplitude season, lowest
+    # in week 0, while each warehouse receives the same amount every week,
+    # slack above mean demand: peaks beyond that are met from stock built
+    # up before them. Lane costs drift a few percent from week to week; holding
+    # costs per unit and week are drawn from the holding range.
+    base = generate_instance(num_warehouses, num_clients, density, balanced=True, seed=seed, max_cost=max_cost)
+    rng = np.random.default_rng(seed + 1)
+    weeks = np.arange(periods)
+    wave = 1 - season * np.cos(2 * np.pi * weeks / 52)
+    demands = np.round(base.demands[None, :] * wave[:, None] * rng.uniform(0.9, 1.1, (periods, num_clients)))
+    supplies = np.ceil(base.supplies * demands.sum(axis=1).mean() / base.supplies.sum() * (1 + slack))
+    costs = np.round(base.costs[None, :] * rng.uniform(0.95, 1.05, (periods, base.num_arcs)), 2)
+    return MultiPeriodInstance(base.warehouse_names, base.client_names, np.tile(supplies, (periods, 1)),
+                               demands, base.rows, base.cols, costs,
+                               rng.integers(holding[0], holding[1] + 1, num_warehouses))
+
+
+def _split(rng, total, parts):
+    # Random positive integers summing exactly to total.
+    weights = rng.random(parts) + 0.5
+    amounts = np.floor(total * weights / weights.sum()).astype(np.int64)
+    amounts[:total - int(amounts.sum())] += 1
+    return amounts
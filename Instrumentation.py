@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _Span:
+    __slots__ = ("owner", "name", "args", "start", "depth")
+
+    def __init__(self, owner, name, args):
+        self.owner = owner
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = self.owner._stack()
+        self.depth = len(stack)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        self.owner._stack().pop()
+        self.owner._finish(self, duration)
+        return False
+
+
+class _NullSpan:
+    # Handed out while instrumentation is off, so a disabled span costs one
+    # attribute check and an empty with block.
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    def __init__(self, max_spans=100_000):
+        self.enabled = False
+        self.max_spans = max_spans
+        self.spans = []
+        self.counters = {}
+        self.dropped = 0
+        self.last_profile = None
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def span(self, name, **args):
+        # with instrumentation.span("model.build", arcs=n) as span: ...
+        # Spans nest per thread; span.set() attaches values found inside.
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def count(self, name, value=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_gurobi(self, span, model):
+        # Solver-side figures of a finished optimize call; Runtime includes
+        # presolve, so the rest of the span is Python and model overhead.
+        if not self.enabled:
+            return
+        stats = {"gurobi_runtime": model.Runtime, "simplex_iterations": model.IterCount,
+                 "barrier_iterations": model.BarIterCount}
+        if model.IsMIP:
+            stats["nodes"] = model.NodeCount
+        span.set(**stats)
+        for name, value in stats.items():
+            if name != "gurobi_runtime":
+                self.count(f"gurobi.{name}", value)
+
+    def reset(self):
+        with self._lock:
+            self.spans = []
+            self.counters = {}
+            self.dropped = 0
+            self.origin = time.perf_counter()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span, duration):
+        record = {"name": span.name, "start": span.start - self.origin, "duration": duration,
+                  "depth": span.depth, "thread": threading.current_thread().name, "args": span.args}
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(record)
+            else:
+                self.dropped += 1
+
+    def summary(self):
+        # Per span name: calls, total, mean and max seconds, slowest first.
+        with self._lock:
+            spans = list(self.spans)
+        totals = {}
+        for record in spans:
+            entry = totals.setdefault(record["name"], {"calls": 0, "total": 0.0, "max": 0.0})
+            entry["calls"] += 1
+            entry["total"] += record["duration"]
+            entry["max"] = max(entry["max"], record["duration"])
+        for entry in totals.values():
+            entry["mean"] = entry["total"] / entry["calls"]
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["total"]))
+
+    def to_dict(self):
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        return {"spans": spans, "counters": counters, "summary": self.summary(), "dropped": self.dropped}
+
+    def save_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=float)
+
+    def save_chrome_trace(self, path):
+        # Trace Event Format, for chrome://tracing or ui.perfetto.dev:
+        # complete ("X") events in microseconds, one track per thread.
+        pid = os.getpid()
+        threads = {}
+        events = []
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        for record in spans:
+            tid = threads.setdefault(record["thread"], len(threads) + 1)
+            events.append({"name": record["name"], "ph": "X", "pid": pid, "tid": tid,
+                           "ts": record["start"] * 1e6, "dur": record["duration"] * 1e6,
+                           "args": record["args"]})
+        for name, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        end = max((r["start"] + r["duration"] for r in spans), default=0.0)
+        for name, value in counters.items():
+            events.append({"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": end * 1e6,
+                           "args": {"value": value}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=float)
+
+    @contextmanager
+    def profile(self):
+        # cProfile over the calling thread only; the statistics are kept in
+        # last_profile for profile_text() and save_profile(). The profiler
+        # modules load here, off the cold start of every entry point.
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            self.last_profile = pstats.Stats(profiler)
+
+    def profile_text(self, limit=25, sort="cumulative"):
+        import io
+
+        if self.last_profile is None:
+            return ""
+        out = io.StringIO()
+        self.last_profile.stream = out
+        self.last_profile.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def save_profile(self, path):
+        # pstats format, readable by snakeviz or python -m pstats.
+        self.last_profile.dump_stats(path)
+
+
+instrumentation = Instrumentation()
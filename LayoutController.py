@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from GraphLayout import compute_layout, layout_key, resolve_method
+from NetworkInstance import NetworkInstance
+
+
+class LayoutController(QObject):
+    ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    _finished = pyqtSignal(int, object, object)
+
+    def __init__(self, parent=None, cache_size=16):
+        # Layouts are computed on one background thread, and only the most
+        # recent request is applied: a layout that finishes after a newer
+        # request is cached but not shown. Finished layouts are kept per
+        # graph, method and flows, so returning to one is instant.
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="layout")
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.generation = 0
+        self._finished.connect(self._on_finished)
+
+    def request(self, instance, method="auto", flows=None):
+        network = instance if isinstance(instance, NetworkInstance) else NetworkInstance.from_transport(instance)
+        self.generation += 1
+        key = layout_key(network, resolve_method(network, method), flows)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.ready.emit(cached)
+            return
+        self.executor.submit(self._run, self.generation, network, method, flows)
+
+    def shutdown(self):
+        self.generation += 1
+        self.executor.shutdown(wait=True)
+
+    def _run(self, generation, network, method, flows):
+        try:
+            layout = compute_layout(network, method, flows)
+        except Exception as e:
+            self._finished.emit(generation, None, e)
+        else:
+            self._finished.emit(generation, layout, None)
+
+    def _on_finished(self, generation, layout, error):
+        if error is not None:
+            if generation == self.generation:
+                self.failed.emit(str(error))
+            return
+        self.cache[layout.key] = layout
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        if generation == self.generation:
+            self.ready.emit(layout)
@@ -1,13 +1,38 @@
+import os
+import sqlite3
+
+import numpy as np
+
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout,
-                             QLabel, QFrame, QWidget, QSizePolicy)
-from PyQt5.QtCore import Qt
-from gurobipy import Model, GRB
+                             QLabel, QFrame, QWidget, QSizePolicy, QComboBox,
+                             QFileDialog, QCheckBox, QLineEdit)
+from PyQt5.QtCore import Qt, QStandardPaths
 from RoundedButton import RoundedButton
 
 from AddCostDialog import AddCostDialog
 from AddNodeDialog import AddNodeDialog
+from DenseTransportInstance import DenseTransportInstance
+from DiagnosticsPanel import DiagnosticsPanel
 from GraphVisualizationWidget import GraphVisualizationWidget
+from Instrumentation import instrumentation
+from LayoutController import LayoutController
 from MatrixWidget import MatrixWidget
+from MultiPeriodInstance import MultiPeriodInstance
+from NetworkInstance import NetworkInstance
+import ProjectIO
+from SolutionCache import SolutionCache
+from SolutionReportPanel import SolutionReportPanel
+from SolveController import SolveController
+from SolveClient import DEFAULT_ADDRESS, RemoteBackend
+from SolverBackend import BACKENDS, GurobiBackend, get_backend
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+PROJECT_FILE_FILTER = "Projects (*.csv *.json *.npz);;CSV (*.csv);;JSON (*.json);;NumPy (*.npz)"
+# Dense cost matrices beyond this many lanes are left to the command line,
+# which solves them by lane pricing without materialising every lane.
+DENSE_WINDOW_MAX_LANES = 1_000_000
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -16,6 +41,14 @@ class MainWindow(QMainWindow):
         self.resize(1200, 700)
         self.warehouses = {}
         self.clients = {}
+        # Hubs and arc capacities turn the project into a transshipment
+        # network, solved as a min-cost flow.
+        self.hubs = {}
+        self.arc_capacities = {}
+        self.session = None
+        self.env_pool = None
+        self.last_result = None
+        self.solution_cache = self._open_solution_cache()
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -30,6 +63,27 @@ class MainWindow(QMainWindow):
         left_panel_layout.setContentsMargins(15, 15, 15, 15)
         left_panel_layout.setSpacing(15)
 
+        file_buttons_layout = QHBoxLayout()
+        self.open_btn = RoundedButton("Open Project")
+        self.open_btn.clicked.connect(self.show_open_project_dialog)
+        file_buttons_layout.addWidget(self.open_btn, stretch=1)
+
+        self.save_btn = RoundedButton("Save Project")
+        self.save_btn.clicked.connect(self.show_save_project_dialog)
+        file_buttons_layout.addWidget(self.save_btn, stretch=1)
+        file_buttons_layout.addStretch()
+
+        # Solves can go to a shared server (main.py serve) instead of
+        # running on this machine.
+        self.server_check = QCheckBox("Solve on server")
+        file_buttons_layout.addWidget(self.server_check)
+        self.server_edit = QLineEdit(os.environ.get("TRANSPORT_SOLVE_SERVER", DEFAULT_ADDRESS))
+        self.server_edit.setPlaceholderText("host:port or unix:/path")
+        self.server_edit.setEnabled(False)
+        self.server_check.toggled.connect(self.server_edit.setEnabled)
+        file_buttons_layout.addWidget(self.server_edit)
+        left_panel_layout.addLayout(file_buttons_layout)
+
         buttons_layout = QHBoxLayout()
         self.add_node_btn = RoundedButton("Add Warehouse")
         self.add_node_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -41,6 +95,11 @@ class MainWindow(QMainWindow):
         self.add_node_btn.clicked.connect(self.show_add_client_dialog)
         buttons_layout.addWidget(self.add_node_btn, stretch=1)
 
+        self.add_hub_btn = RoundedButton("Add Hub")
+        self.add_hub_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.add_hub_btn.clicked.connect(self.show_add_hub_dialog)
+        buttons_layout.addWidget(self.add_hub_btn, stretch=1)
+
         self.add_cost_btn = RoundedButton("Add Cost")
         self.add_node_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.add_cost_btn.clicked.connect(self.show_add_cost_dialog)
@@ -48,9 +107,19 @@ class MainWindow(QMainWindow):
 
         self.solve_btn = RoundedButton("Solve")
         self.add_node_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.solve_btn.clicked.connect(self.solve_transportation_problem)
+        self.solve_btn.clicked.connect(lambda: self.solve_transportation_problem())
         buttons_layout.addWidget(self.solve_btn, stretch=1)
 
+        self.cancel_btn = RoundedButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_solve)
+        buttons_layout.addWidget(self.cancel_btn, stretch=1)
+
+        self.backend_combo = QComboBox()
+        for name, backend in BACKENDS.items():
+            self.backend_combo.addItem(backend.label, name)
+        buttons_layout.addWidget(self.backend_combo)
+
         buttons_layout.addStretch()
         left_panel_layout.addLayout(buttons_layout)
 
@@ -67,10 +136,6 @@ class MainWindow(QMainWindow):
         self.matrix_widget = MatrixWidget()
         matrix_container_layout.addWidget(self.matrix_widget)
 
-        self.solution_label = QLabel("")
-        self.solution_label.setStyleSheet("font-size: 16px; color: #FFFFFF;")
-        matrix_container_layout.addWidget(self.solution_label)
-
         left_panel_layout.addWidget(matrix_container)
 
         right_panel = QFrame()
@@ -91,10 +156,53 @@ class MainWindow(QMainWindow):
         self.solution_label = QLabel("")
         self.solution_label.setStyleSheet("font-size: 16px; color: #FFFFFF;")
         result_container_layout.addWidget(self.solution_label)
+
+        # Shipments and per-warehouse/per-client totals in a table that
+        # only formats the rows it shows.
+        self.solution_report = SolutionReportPanel()
+        result_container_layout.addWidget(self.solution_report, stretch=1)
+
+        self.progress_label = QLabel("")
+        self.progress_label.setStyleSheet("font-size: 13px; color: #D1D1D1;")
+        result_container_layout.addWidget(self.progress_label)
+
+        self.diagnostics_panel = DiagnosticsPanel()
+        result_container_layout.addWidget(self.diagnostics_panel)
         left_panel_layout.addWidget(result_container)
 
+        self.solve_controller = SolveController(self)
+        self.solve_controller.progress.connect(self.show_progress)
+        self.solve_controller.incumbent.connect(self.show_incumbent)
+        self.solve_controller.solved.connect(self.show_solution)
+        self.solve_controller.failed.connect(self.show_solve_error)
+        self.solve_controller.busy_changed.connect(self.cancel_btn.setEnabled)
+
 
         self.graph_view = GraphVisualizationWidget()
+
+        graph_options_layout = QHBoxLayout()
+        self.scalable_check = QCheckBox("Fast rendering")
+        self.scalable_check.toggled.connect(self.graph_view.set_scalable)
+        graph_options_layout.addWidget(self.scalable_check)
+        self.solution_only_check = QCheckBox("Solution arcs only")
+        self.solution_only_check.toggled.connect(self.graph_view.set_solution_only)
+        graph_options_layout.addWidget(self.solution_only_check)
+        self.sensitivity_check = QCheckBox("Shadow prices / reduced costs")
+        self.sensitivity_check.toggled.connect(self.toggle_sensitivity)
+        graph_options_layout.addWidget(self.sensitivity_check)
+        graph_options_layout.addStretch()
+        # Loaded projects are laid out off the GUI thread, and again by
+        # flow after each solve.
+        self.layout_combo = QComboBox()
+        for label, method in (("Automatic layout", "auto"), ("Layered layout", "layered"),
+                              ("Force-directed layout", "force"), ("Columns", "columns")):
+            self.layout_combo.addItem(label, method)
+        self.layout_combo.currentIndexChanged.connect(lambda _: self.request_layout())
+        graph_options_layout.addWidget(self.layout_combo)
+        self.layout_controller = LayoutController(self)
+        self.layout_controller.ready.connect(self.apply_layout)
+        self.layout_controller.failed.connect(lambda message: print(f"Layout failed: {message}"))
+        right_panel_layout.addLayout(graph_options_layout)
         right_panel_layout.addWidget(self.graph_view)
 
         main_layout.addWidget(left_panel)
@@ -116,6 +224,16 @@ class MainWindow(QMainWindow):
                 padding: 8px; color: white;
             }
             QPushButton:hover { background-color: #4752C4; }
+            QPushButton:disabled { background-color: #3E4246; color: #8E9297; }
+            QComboBox {
+                background-color: #3E4246; border: none; border-radius: 5px;
+                padding: 8px; color: white;
+            }
+            QLineEdit {
+                background-color: #3E4246; border: none; border-radius: 5px;
+                padding: 8px; color: white;
+            }
+            QLineEdit:disabled { color: #8E9297; }
             QFrame#resultContainer {
                 background-color: #2C2F33; 
                 border-radius: 15px; 
@@ -125,33 +243,77 @@ class MainWindow(QMainWindow):
         """)
 
     def add_node(self, node_type, node_name, capacity, index):
-        if node_name in self.warehouses or node_name in self.clients:
+        nodes = {"Warehouse": self.warehouses, "Hub": self.hubs}.get(node_type, self.clients)
+        if any(node_name in other for other in (self.warehouses, self.hubs, self.clients) if other is not nodes):
             return
         try:
-            capacity = int(capacity)
+            # A hub left without a throughput passes any amount.
+            capacity = float("inf") if node_type == "Hub" and not capacity else int(capacity)
             if capacity < 0:
                 raise ValueError("Capacity must be non-negative")
         except ValueError:
             self.solution_label.setText("Error: Invalid capacity/demand")
             return
+        if node_name in nodes:
+            # Re-adding a node edits its capacity/demand in place.
+            nodes[node_name] = capacity
+            self.graph_view.set_node_value(node_name, "∞" if capacity == float("inf") else capacity)
+            if self.session is not None and node_type != "Hub":
+                if node_type == "Warehouse":
+                    self.session.set_warehouse(node_name, capacity)
+                else:
+                    self.session.set_client(node_name, capacity)
+            return
+        resolve = False
         if node_type == "Warehouse":
             self.warehouses[node_name] = capacity
             self.matrix_widget.add_warehouse(node_name)
+        elif node_type == "Hub":
+            self.hubs[node_name] = capacity
+            self.matrix_widget.add_hub(node_name)
+            # The live Gurobi session only models direct shipments; a solve
+            # still queued on it runs again as a network solve.
+            resolve = self.close_session()
         else:
             self.clients[node_name] = capacity
             self.matrix_widget.add_client(node_name)
-        self.graph_view.add_node(node_name, node_type, index, capacity)
-
-    def add_cost(self, warehouse, client, cost):
+        self.graph_view.add_node(node_name, node_type, index, "∞" if capacity == float("inf") else capacity)
+        if resolve:
+            self.solve_transportation_problem()
+        if self.session is not None:
+            if node_type == "Warehouse":
+                self.session.set_warehouse(node_name, capacity)
+            else:
+                self.session.set_client(node_name, capacity)
+
+    def add_cost(self, warehouse, client, cost, capacity=None):
+        # warehouse and client are the two ends of the arc, which may be
+        # hubs; an empty capacity leaves the arc unlimited.
+        if warehouse == client:
+            return
         try:
             cost = int(cost)
             if cost < 0:
                 raise ValueError("Cost must be non-negative")
+            capacity = int(capacity) if capacity else None
+            if capacity is not None and capacity < 0:
+                raise ValueError("Capacity must be non-negative")
         except ValueError:
-            self.solution_label.setText("Error: Invalid cost")
+            self.solution_label.setText("Error: Invalid cost/capacity")
             return
+        resolve = False
+        if capacity is None:
+            self.arc_capacities.pop((warehouse, client), None)
+        else:
+            self.arc_capacities[(warehouse, client)] = capacity
+            resolve = self.close_session()
         self.matrix_widget.add_cost(warehouse, client, str(cost))
-        self.graph_view.add_edge(warehouse, client, cost)
+        self.graph_view.add_edge(warehouse, client, cost if capacity is None else f"{cost} ≤{capacity}")
+        self.scalable_check.setChecked(self.graph_view.scalable)
+        if resolve:
+            self.solve_transportation_problem()
+        if self.session is not None:
+            self.session.set_cost(warehouse, client, cost)
 
     def show_add_warehouse_dialog(self):
         dialog = AddNodeDialog("Warehouse", "Capacity", self)
@@ -173,44 +335,294 @@ class MainWindow(QMainWindow):
                 self.graph_view.add_node(node_name, "Client", index, demand)
                 print(f"Added client: {node_name}, Demand: {demand}")
 
+    def show_add_hub_dialog(self):
+        dialog = AddNodeDialog("Hub", "Throughput", self)
+        if dialog.exec_():
+            node_name, throughput = dialog.get_node_data()
+            if node_name:
+                self.add_node("Hub", node_name, throughput, len(self.hubs))
+                print(f"Added hub: {node_name}, Throughput: {throughput or 'unlimited'}")
+
     def show_add_cost_dialog(self):
-        dialog = AddCostDialog(self, self.warehouses.keys(), self.clients.keys())
+        dialog = AddCostDialog(self, self.warehouses.keys(), self.clients.keys(), self.hubs.keys())
         if dialog.exec_():
             warehouse, client, cost = dialog.get_cost_data()
             if warehouse and client and cost:
-                self.add_cost(warehouse, client, cost)
+                self.add_cost(warehouse, client, cost, dialog.get_capacity())
                 print(f"Added cost: {warehouse} -> {client}, Cost: {cost}")
 
-    def solve_transportation_problem(self):
-        cost = self.matrix_widget.get_cost_matrix()
-
-        model = Model("Transport_Optimization")
-        x = model.addVars(self.warehouses.keys(), 
-                          self.clients.keys(),
-                          vtype=GRB.INTEGER, 
-                          lb=0, 
-                          name="x")
-        model.setObjective(
-            sum(cost.get((w, c), 0) * x[w, c] for w in self.warehouses for c in self.clients),
-            GRB.MINIMIZE)
-
-        for w in self.warehouses:
-            model.addConstr(sum(x[w, c] for c in self.clients) <= self.warehouses[w], f"Supply_{w}")
-
-        for c in self.clients:
-            model.addConstr(sum(x[w, c] for w in self.warehouses) >= self.clients[c], f"Demand_{c}")
-
-        model.optimize()
-
-        if model.status == GRB.OPTIMAL:
-            solution = {(w, c): x[w, c].x for w in self.warehouses for c in self.clients if x[w, c].x > 0}
-            message = [f"Optimal Solution Found: Total Cost = {model.objVal:.2f}"]
-            for (w, c), qty in solution.items():
-                message.append(f"Ship {qty} units from {w} to {c} (cost per unit: {cost.get((w, c), 0)})")
-            self.solution_label.setText("\n".join(message))
+    def load_instance(self, instance):
+        # Replace the whole project in one pass instead of replaying
+        # add_node/add_cost per item.
+        self.warehouses = dict(zip(instance.warehouse_names, ProjectIO.plain_values(instance.supplies)))
+        self.clients = dict(zip(instance.client_names, ProjectIO.plain_values(instance.demands)))
+        self.hubs = {}
+        self.arc_capacities = {}
+        if isinstance(instance, NetworkInstance):
+            self.hubs = dict(zip(instance.hub_names, ProjectIO.plain_values(instance.throughputs)))
+            limited = np.flatnonzero(np.isfinite(instance.capacities))
+            self.arc_capacities = dict(zip((instance.arc_key(k) for k in limited.tolist()),
+                                           ProjectIO.plain_values(instance.capacities[limited])))
+        # A solve of the previous project must not report onto this one.
+        self.solve_controller.discard()
+        self.close_session()
+        self.matrix_widget.setUpdatesEnabled(False)
+        self.matrix_widget.blockSignals(True)
+        try:
+            self.matrix_widget.load_instance(instance)
+        finally:
+            self.matrix_widget.blockSignals(False)
+            self.matrix_widget.setUpdatesEnabled(True)
+        self.graph_view.load_instance(instance)
+        self.scalable_check.setChecked(self.graph_view.scalable)
+        self.last_result = None
+        self.request_layout(instance)
+        self.solution_label.setText("")
+        self.solution_report.clear()
+        self.progress_label.setText("")
+
+    def show_open_project_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Project", "", PROJECT_FILE_FILTER)
+        if not path:
+            return
+        try:
+            with instrumentation.span("project.read"):
+                instance = ProjectIO.load_instance(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.solution_label.setText(f"Error: Could not load project: {e}")
+            return
+        if isinstance(instance, DenseTransportInstance):
+            if instance.num_lanes > DENSE_WINDOW_MAX_LANES:
+                self.solution_label.setText(
+                    f"Error: {instance.num_lanes} lanes are too many for the window; "
+                    f"solve this project with 'main.py solve'")
+                return
+            instance = instance.to_transport()
+        elif isinstance(instance, MultiPeriodInstance):
+            self.solution_label.setText(
+                f"Error: a plan over {instance.num_periods} periods; plan it with 'main.py plan'")
+            return
+        self.load_instance(instance)
+        print(f"Loaded project: {path} ({instance.num_warehouses} warehouses, "
+              f"{instance.num_clients} clients, {instance.num_arcs} costs)")
+
+    def show_save_project_dialog(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Project", "", PROJECT_FILE_FILTER)
+        if not path:
+            return
+        try:
+            ProjectIO.save_instance(self.current_network() if self.is_network else self.current_instance(), path)
+        except (OSError, ValueError) as e:
+            self.solution_label.setText(f"Error: Could not save project: {e}")
+            return
+        print(f"Saved project: {path}")
+
+    def solver_session(self):
+        # Built on first use from the current data; afterwards add_node and
+        # add_cost edit the live model in place. The session takes its
+        # environment from the pool on the solve thread, so a pool still
+        # held by a retiring session never blocks the window.
+        if self.session is None:
+            from SolverSession import SolverSession
+
+            self.session = SolverSession.from_dicts(
+                self.warehouses, self.clients, self.matrix_widget.get_cost_matrix(),
+                pool=self.gurobi_pool())
+        return self.session
+
+    def gurobi_pool(self):
+        if self.env_pool is None:
+            # Imported here so that gurobipy only loads once Gurobi is used.
+            from EnvPool import EnvPool
+
+            self.env_pool = EnvPool()
+        return self.env_pool
+
+    def close_session(self):
+        # The session keeps its environment for its whole life; it goes
+        # back to the pool once no solve is using the model. Returns
+        # whether a repeat solve queued on the session was dropped.
+        if self.session is None:
+            return False
+        session, self.session = self.session, None
+        return self.solve_controller.retire(session, lambda retired: retired.close())
+
+    def current_instance(self):
+        # MatrixWidget rows/columns are kept in the same order as the
+        # warehouse/client dicts, so its arc arrays index them directly.
+        rows, cols, costs = self.matrix_widget.get_cost_arrays()
+        return TransportInstance(self.warehouses.keys(), list(self.warehouses.values()),
+                                 self.clients.keys(), list(self.clients.values()),
+                                 rows, cols, costs)
+
+    @property
+    def is_network(self):
+        return bool(self.hubs or self.arc_capacities)
+
+    def current_network(self):
+        # Matrix rows are the shipping nodes and columns the receiving ones,
+        # each in the order they were added, so arcs are mapped by name.
+        rows, cols, costs = self.matrix_widget.get_cost_arrays()
+        names = list(self.warehouses) + list(self.hubs) + list(self.clients)
+        node = {name: k for k, name in enumerate(names)}
+        tails = np.array([node[name] for name in self.matrix_widget.warehouses], dtype=np.int64)[rows]
+        heads = np.array([node[name] for name in self.matrix_widget.clients], dtype=np.int64)[cols]
+        keep = tails != heads
+        tails, heads, costs = tails[keep], heads[keep], costs[keep]
+        capacities = [self.arc_capacities.get((names[t], names[h]), np.inf)
+                      for t, h in zip(tails.tolist(), heads.tolist())] if self.arc_capacities else None
+        return NetworkInstance(self.warehouses.keys(), list(self.warehouses.values()),
+                               self.hubs.keys(), list(self.hubs.values()),
+                               self.clients.keys(), list(self.clients.values()),
+                               tails, heads, costs, capacities)
+
+    def _open_solution_cache(self):
+        # Solutions persist across sessions in the user's data directory;
+        # without a writable one the cache stays in memory only.
+        folder = QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            return SolutionCache(path=os.path.join(folder, "solutions.sqlite"))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Solution cache is memory-only: {e}")
+            return SolutionCache()
+
+    def solve_transportation_problem(self, backend_name=None):
+        backend_name = backend_name or self.backend_combo.currentData()
+        profile = self.diagnostics_panel.take_profile_request()
+        remote = self.remote_backend(backend_name)
+        if self.is_network:
+            # Min-cost flow; the cache and the live session cover only
+            # direct warehouse-to-client problems.
+            options = {"pool": self.gurobi_pool()} if backend_name == GurobiBackend.name else {}
+            solver = remote or get_backend(backend_name, network=True, **options)
+            self.solve_controller.submit(solver, self.current_network(), profile=profile)
+            self.progress_label.setText("Solving...")
+            return
+        instance = self.current_instance()
+        if not self.solve_controller.busy:
+            cached = self.solution_cache.get(instance)
+            if cached is not None:
+                self.show_solution(cached)
+                stats = self.solution_cache.stats()
+                self.progress_label.setText(f"Cached solution ({stats['hits'] + stats['disk_hits']} hits, "
+                                            f"{stats['misses']} misses)")
+                return
+        if remote is not None:
+            self.solve_controller.submit(remote, instance, profile=profile)
+        elif backend_name == GurobiBackend.name:
+            self.submit_session(profile)
+        else:
+            backend = get_backend(backend_name)
+            backend.warm_start = self.solution_cache.warm_start(instance)
+            self.solve_controller.submit(backend, instance, profile=profile)
+        self.progress_label.setText("Solving...")
+
+    def submit_session(self, profile=None):
+        # Ranges are only read from Gurobi while the overlay is on.
+        session = self.solver_session()
+        session.sensitivity = "full" if self.sensitivity_check.isChecked() else "off"
+        self.solve_controller.submit(session, profile=profile)
+
+    def remote_backend(self, backend_name):
+        if not self.server_check.isChecked():
+            return None
+        return RemoteBackend(self.server_edit.text().strip() or DEFAULT_ADDRESS, backend_name)
+
+    def cancel_solve(self):
+        self.solve_controller.cancel()
+
+    def show_progress(self, progress):
+        parts = [f"{progress['elapsed']:.1f}s"]
+        if progress["incumbent"] is not None:
+            parts.append(f"incumbent {progress['incumbent']:.2f}")
+        if progress["bound"] is not None:
+            parts.append(f"bound {progress['bound']:.2f}")
+        if progress["gap"] is not None:
+            parts.append(f"gap {progress['gap']:.2%}")
+        self.progress_label.setText("Solving... " + ", ".join(parts))
+
+    def show_solve_error(self, message):
+        self.progress_label.setText("")
+        self.solution_label.setText(f"Error while solving: {message}")
+        self.solution_report.clear()
+
+    def show_incumbent(self, result):
+        # A heuristic plan or an intermediate incumbent; the next one, and
+        # finally the optimum, replace it as they arrive.
+        self.show_flows(result, f"Best Solution So Far ({result.backend}): Total Cost = {result.objective:.2f}")
+
+    def show_flows(self, result, title):
+        with instrumentation.span("show_flows", backend=result.backend):
+            self.solution_label.setText(title)
+            self.solution_report.set_solution(result)
+            solution = result.as_dict()
             self.matrix_widget.update_solution(solution)
             self.graph_view.highlight_solution(solution)
-        elif model.status == GRB.INFEASIBLE:
-            self.solution_label.setText("Model is infeasible. Check inputs.")
+
+    def show_solution(self, result):
+        self.progress_label.setText(f"Solved by {result.backend} in {result.runtime:.2f}s")
+        if result.is_optimal:
+            if isinstance(result.instance, TransportInstance):
+                self.solution_cache.put(result)
+            self.show_flows(result, f"Optimal Solution Found: Total Cost = {result.objective:.2f}")
+            self.last_result = result
+            self.request_layout(result.instance, result)
+            self.show_sensitivity(self.sensitivity_check.isChecked())
+        else:
+            self.solution_report.clear()
+            if result.status == TransportSolution.INFEASIBLE:
+                self.solution_label.setText("Model is infeasible. Check inputs.")
+            elif result.status == TransportSolution.CANCELLED:
+                self.solution_label.setText("Solve cancelled.")
+            else:
+                self.solution_label.setText(f"Solution not optimal. Status: {result.status}")
+        self.diagnostics_panel.refresh()
+
+    def request_layout(self, instance=None, result=None):
+        # Without arguments the graph is laid out again as it stands,
+        # weighted by the flows of the last solution on the arcs it shares.
+        if instance is None:
+            result = self.last_result
+            instance = self.current_network() if self.is_network else self.current_instance()
+        flows = None
+        if result is not None and result.is_optimal:
+            if result.instance is instance:
+                flows = result.flows
+            else:
+                solution = result.as_dict()
+                flows = np.array([solution.get(instance.arc_key(k), 0) for k in range(instance.num_arcs)],
+                                 dtype=np.float64)
+        self.layout_controller.request(instance, self.layout_combo.currentData(), flows)
+
+    def apply_layout(self, layout):
+        self.graph_view.apply_layout(layout.names, layout.positions)
+
+    def toggle_sensitivity(self, enabled):
+        # A session solve skips the ranges while the overlay is off; turning
+        # it on re-solves the unchanged model from its basis to read them.
+        if (enabled and self.session is not None and self.last_result is not None
+                and self.last_result.sensitivity is None and not self.solve_controller.busy):
+            self.submit_session()
+            self.progress_label.setText("Computing sensitivity...")
+            return
+        self.show_sensitivity(enabled)
+
+    def show_sensitivity(self, enabled):
+        # Cached solutions carry no duals; the overlay stays off for them.
+        sensitivity = self.last_result.sensitivity if self.last_result is not None else None
+        if enabled and sensitivity is not None:
+            self.matrix_widget.show_sensitivity(sensitivity)
+            self.graph_view.show_sensitivity(sensitivity)
         else:
-            self.solution_label.setText(f"Solution not optimal. Status: {model.status}")
\ No newline at end of file
+            self.matrix_widget.hide_sensitivity()
+            self.graph_view.hide_sensitivity()
+
+    def closeEvent(self, event):
+        self.solve_controller.shutdown()
+        self.layout_controller.shutdown()
+        self.close_session()
+        if self.env_pool is not None:
+            self.env_pool.close()
+        self.solution_cache.close()
+        super().closeEvent(event)
\ No newline at end of file
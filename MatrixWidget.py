@@ -1,103 +1,110 @@
-from PyQt5.QtWidgets import  QTableWidget, QTableWidgetItem
-from PyQt5.QtGui import QColor
-from PyQt5.QtCore import Qt
+import numpy as np
+from PyQt5.QtWidgets import QTableView, QHeaderView
 
-class MatrixWidget(QTableWidget):
+from CostTableModel import CostTableModel
+from Instrumentation import instrumentation
+from NetworkInstance import NetworkInstance
+
+class MatrixWidget(QTableView):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setRowCount(0)
-        self.setColumnCount(0)
-        self.warehouses = []
-        self.clients = []
+        self.cost_model = CostTableModel(self)
+        self.setModel(self.cost_model)
+        # Fixed section sizes keep the view from measuring every row and
+        # column, so only the visible cells are ever asked for data.
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #2C2F33; color: white; gridline-color: #3E4246;
                 border-radius: 10px; border: none;
             }
-            QTableWidget::item { padding: 5px; border: none; }
-            QTableWidget::item:selected { background-color: #5865F2; }
+            QTableView::item { padding: 5px; border: none; }
+            QTableView::item:selected { background-color: #5865F2; }
             QHeaderView::section {
                 background-color: #23272A; color: white; padding: 5px; border: none;
             }
         """)
 
+    @property
+    def warehouses(self):
+        return self.cost_model.warehouses
+
+    @property
+    def clients(self):
+        return self.cost_model.clients
+
     def add_warehouse(self, warehouse_name):
-        if warehouse_name in self.warehouses:
-            return
-        self.warehouses.append(warehouse_name)
-        self.setRowCount(len(self.warehouses))
-        self.setVerticalHeaderItem(len(self.warehouses) - 1, QTableWidgetItem(warehouse_name))
-        for j in range(self.columnCount()):
-            item = QTableWidgetItem("∞")
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-            self.setItem(len(self.warehouses) - 1, j, item)
+        self.cost_model.add_warehouse(warehouse_name)
 
     def add_client(self, client_name):
-        if client_name in self.clients:
-            return
-        self.clients.append(client_name)
-        self.setColumnCount(len(self.clients))
-        self.setHorizontalHeaderItem(len(self.clients) - 1, QTableWidgetItem(client_name))
-        for i in range(self.rowCount()):
-            item = QTableWidgetItem("∞")
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-            self.setItem(i, len(self.clients) - 1, item)
+        self.cost_model.add_client(client_name)
+
+    def add_hub(self, hub_name):
+        # A hub both receives and ships, so it gets a row and a column.
+        self.cost_model.add_warehouse(hub_name)
+        self.cost_model.add_client(hub_name)
+
+    def load_instance(self, instance):
+        with instrumentation.span("matrix.load", arcs=instance.num_arcs):
+            if isinstance(instance, NetworkInstance):
+                # Rows are the shipping nodes (warehouses, then hubs) and
+                # columns the receiving ones (hubs, then clients).
+                self.cost_model.load(instance.warehouse_names + instance.hub_names,
+                                     instance.hub_names + instance.client_names,
+                                     instance.tails, instance.heads - instance.num_warehouses, instance.costs)
+            else:
+                self.cost_model.load(instance.warehouse_names, instance.client_names,
+                                     instance.rows, instance.cols, instance.costs)
 
     def add_cost(self, warehouse, client, cost):
-        if warehouse not in self.warehouses or client not in self.clients:
-            return
-        i = self.warehouses.index(warehouse)
-        j = self.clients.index(client)
-        item = QTableWidgetItem(cost)
-        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-        self.setItem(i, j, item)
+        self.cost_model.set_cost(warehouse, client, float(cost))
 
     def update_solution(self, solution):
-        if self.rowCount() != len(self.warehouses) or self.columnCount() != len(self.clients):
-            print(
-                f"Warning: Table dimensions mismatch. Rows: {self.rowCount()}/{len(self.warehouses)}, Columns: {self.columnCount()}/{len(self.clients)}")
-            self.setRowCount(len(self.warehouses))
-            self.setColumnCount(len(self.clients))
+        w_index = self.cost_model.warehouse_index
+        c_index = self.cost_model.client_index
+        with instrumentation.span("matrix.update_solution", arcs=len(solution)):
+            flows = {(w_index[w], c_index[c]): qty for (w, c), qty in solution.items()
+                     if qty > 0 and w in w_index and c in c_index}
+            self.cost_model.set_flows(flows)
+
+    def show_sensitivity(self, sensitivity):
+        # Reduced costs in the cells and shadow prices in the headers,
+        # mapped by name onto the current rows and columns.
+        inst = sensitivity.solution.instance
+        model = self.cost_model
+        shape = (len(model.warehouses), len(model.clients))
+        row_of = np.array([model.warehouse_index.get(w, -1) for w in inst.warehouse_names], dtype=np.int64)
+        col_of = np.array([model.client_index.get(c, -1) for c in inst.client_names], dtype=np.int64)
+        rows, cols = row_of[inst.rows], col_of[inst.cols]
+        known = (rows >= 0) & (cols >= 0)
+        overlay = {}
+        for key, values in (("reduced", sensitivity.reduced_costs), ("cost_low", sensitivity.cost_low),
+                            ("cost_up", sensitivity.cost_up)):
+            dense = np.full(shape, np.nan)
+            dense[rows[known], cols[known]] = values[known]
+            overlay[key] = dense
+        for key, index, values in (("row_prices", row_of, sensitivity.supply_duals),
+                                   ("col_prices", col_of, sensitivity.demand_duals)):
+            prices = np.full(shape[0] if key == "row_prices" else shape[1], np.nan)
+            prices[index[index >= 0]] = values[index >= 0]
+            overlay[key] = prices
+        model.set_overlay(overlay)
+
+    def hide_sensitivity(self):
+        self.cost_model.set_overlay(None)
+
+    def paintEvent(self, event):
+        with instrumentation.span("matrix.paint"):
+            super().paintEvent(event)
 
-        for i in range(self.rowCount()):
-            for j in range(self.columnCount()):
-                try:
-                    w = self.warehouses[i]
-                    c = self.clients[j]
-                    qty = solution.get((w, c), 0)
-                    if qty > 0:
-                        qty_text = f"{int(qty)}" if qty.is_integer() else f"{qty:.2f}"
-                        item = QTableWidgetItem(qty_text)
-                        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                        item.setBackground(QColor("#CE7B91"))
-                        self.setItem(i, j, item)
-                    else:
-                        current_item = self.item(i, j)
-                        if current_item and current_item.text() and current_item.text() != "∞":
-                            try:
-                                # Verify the text is a valid number (original cost)
-                                float(current_item.text())
-                                item = QTableWidgetItem(current_item.text())
-                                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                                self.setItem(i, j, item)
-                            except ValueError:
-                                # If text is invalid, set to "∞"
-                                item = QTableWidgetItem("∞")
-                                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                                self.setItem(i, j, item)
-                        else:
-                            # Set to "∞" if cell is empty or invalid
-                            item = QTableWidgetItem("∞")
-                            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                            self.setItem(i, j, item)
-                except Exception as e:
-                    print(f"Error in MatrixWidget.update_solution at cell ({i}, {j}): {e}")
+    def get_cost_arrays(self):
+        with instrumentation.span("matrix.extract"):
+            return self.cost_model.cost_arrays()
 
     def get_cost_matrix(self):
-        cost = {}
-        for i in range(self.rowCount()):
-            for j in range(self.columnCount()):
-                weight = self.item(i, j).text()
-                if weight != "∞":
-                    cost[(self.warehouses[i], self.clients[j])] = int(weight)
-        return cost
\ No newline at end of file
+        rows, cols, values = self.get_cost_arrays()
+        warehouses, clients = self.warehouses, self.clients
+        with instrumentation.span("matrix.to_dict", arcs=len(values)):
+            return {(warehouses[i], clients[j]): int(v) if v.is_integer() else float(v)
+                    for i, j, v in zip(rows.tolist(), cols.tolist(), values.tolist())}
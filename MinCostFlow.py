@@ -0,0 +1,194 @@
+import heapq
+from math import inf
+
+import numpy as np
+
+from TransportSolution import TransportSolution
+
+
+class MinCostFlow:
+    def __init__(self, network, max_iterations=None, tol=1e-9):
+        self.network = network
+        self.max_iterations = max_iterations
+        self.tol = tol
+        self.iterations = 0
+        self.progress = None
+        self.cancelled = False
+        self.potential = None
+
+    def solve(self):
+        # Primal-dual successive shortest paths: flow goes from a super
+        # source through the warehouses to a super sink behind the clients.
+        # A Dijkstra search on reduced costs updates the node potentials,
+        # then a blocking flow saturates every shortest path at once, so the
+        # number of searches follows the number of distinct route costs
+        # rather than the number of routes.
+        net = self.network
+        if net.num_arcs and net.costs.min() < 0:
+            raise ValueError("The native network engine needs non-negative arc costs")
+        flows = np.zeros(net.num_arcs)
+        required = float(net.demands.sum())
+        if required <= self.tol:
+            return TransportSolution.OPTIMAL, 0.0, flows
+        if net.supplies.sum() < required - self.tol:
+            return TransportSolution.INFEASIBLE, None, flows
+
+        self._build_graph()
+        source, sink = self._source, self._sink
+        potential = self.potential = [0.0] * self._num_nodes
+        shipped = 0.0
+        while shipped < required - self.tol:
+            if self.max_iterations is not None and self.iterations >= self.max_iterations:
+                return TransportSolution.ITERATION_LIMIT, None, flows
+            if self.cancelled:
+                return TransportSolution.CANCELLED, None, flows
+            if self.progress is not None and self.progress.due():
+                self.progress.update()
+            dist = self._shortest_paths(source, sink, potential)
+            if dist[sink] == inf:
+                return TransportSolution.INFEASIBLE, None, flows
+            reach = dist[sink]
+            for node, d in enumerate(dist):
+                potential[node] += d if d < reach else reach
+            shipped += self._blocking_flows(source, sink, potential, required - shipped)
+            self.iterations += 1
+
+        flows = np.array(self._residual[1:2 * net.num_arcs:2])
+        return TransportSolution.OPTIMAL, float(net.costs @ flows), flows
+
+    def node_duals(self):
+        # LP duals of an optimal solve, one per network node, read off the
+        # final potentials relative to the super source: supply duals <= 0
+        # and demand duals >= 0, as Gurobi reports them. A hub gets the
+        # price of its inbound half; throughput duals are not reported.
+        net = self.network
+        m, h = net.num_warehouses, net.num_hubs
+        prices = np.array(self.potential[:net.num_nodes]) - self.potential[self._source]
+        # An idle warehouse has a zero dual, and so has a client without
+        # demand; with non-negative costs clipping them keeps every
+        # reduced cost non-negative.
+        prices[:m] = np.minimum(-prices[:m], 0.0)
+        prices[m + h:] = np.maximum(prices[m + h:], 0.0)
+        return prices
+
+    def _build_graph(self):
+        # Residual graph in flat lists: edge 2e is arc e forwards, 2e + 1
+        # its reverse, which holds the flow pushed so far. Network arcs come
+        # first, so arc k of the instance is edge 2k. A hub with a
+        # throughput limit is split in two, joined by an arc of that
+        # capacity, and its outgoing arcs leave from the second half.
+        net = self.network
+        m, h = net.num_warehouses, net.num_hubs
+        n_nodes = net.num_nodes
+        hub_out = {}
+        for k, limit in enumerate(net.throughputs.tolist()):
+            if limit < inf:
+                hub_out[m + k] = n_nodes + len(hub_out)
+        self._source = n_nodes + len(hub_out)
+        self._sink = self._source + 1
+        self._num_nodes = self._sink + 1
+        self._head, self._residual, self._cost = [], [], []
+        self._max_cost = float(np.abs(net.costs).max()) if net.num_arcs else 0.0
+        self._adjacent = [[] for _ in range(self._num_nodes)]
+
+        def add(tail, head, capacity, cost):
+            self._adjacent[tail].append(len(self._head))
+            self._head.extend((head, tail))
+            self._residual.extend((capacity, 0.0))
+            self._cost.extend((cost, -cost))
+            self._adjacent[head].append(len(self._head) - 1)
+
+        for tail, head, cost, capacity in zip(net.tails.tolist(), net.heads.tolist(),
+                                              net.costs.tolist(), net.capacities.tolist()):
+            add(hub_out.get(tail, tail), head, capacity, cost)
+        for hub, out in hub_out.items():
+            add(hub, out, float(net.throughputs[hub - m]), 0.0)
+        for i, supply in enumerate(net.supplies.tolist()):
+            add(self._source, i, supply, 0.0)
+        for j, demand in enumerate(net.demands.tolist()):
+            add(m + h + j, self._sink, demand, 0.0)
+
+    def _shortest_paths(self, source, sink, potential):
+        # Dijkstra on reduced costs, stopped once the sink is settled.
+        head, residual, cost, adjacent = self._head, self._residual, self._cost, self._adjacent
+        tol = self.tol
+        dist = [inf] * self._num_nodes
+        done = [False] * self._num_nodes
+        dist[source] = 0.0
+        queue = [(0.0, source)]
+        while queue:
+            d, node = heapq.heappop(queue)
+            if done[node]:
+                continue
+            done[node] = True
+            if node == sink:
+                break
+            base = potential[node]
+            for edge in adjacent[node]:
+                if residual[edge] <= tol:
+                    continue
+                other = head[edge]
+                nd = d + cost[edge] + base - potential[other]
+                if nd < dist[other]:
+                    dist[other] = nd
+                    heapq.heappush(queue, (nd, other))
+        return dist
+
+    def _blocking_flows(self, source, sink, potential, limit):
+        # Max flow over the admissible edges, those with residual capacity
+        # and zero reduced cost, by Dinic phases: a BFS layering, then
+        # depth-first augmentations with a per-node edge pointer.
+        head, residual, cost, adjacent = self._head, self._residual, self._cost, self._adjacent
+        tol = self.tol
+        eps = 1e-9 * max(1.0, self._max_cost)
+        num_nodes = self._num_nodes
+
+        def admissible(edge, node):
+            return residual[edge] > tol and abs(cost[edge] + potential[node] - potential[head[edge]]) <= eps
+
+        total = 0.0
+        while total < limit - tol:
+            level = [-1] * num_nodes
+            level[source] = 0
+            frontier = [source]
+            while frontier and level[sink] < 0:
+                following = []
+                for node in frontier:
+                    for edge in adjacent[node]:
+                        other = head[edge]
+                        if level[other] < 0 and admissible(edge, node):
+                            level[other] = level[node] + 1
+                            following.append(other)
+                frontier = following
+            if level[sink] < 0:
+                break
+            pointer = [0] * num_nodes
+            path = []
+            node = source
+            while total < limit - tol:
+                if node == sink:
+                    amount = min(limit - total, min(residual[edge] for edge in path))
+                    for edge in path:
+                        residual[edge] -= amount
+                        residual[edge ^ 1] += amount
+                    total += amount
+                    path = []
+                    node = source
+                    continue
+                edges = adjacent[node]
+                while pointer[node] < len(edges):
+                    edge = edges[pointer[node]]
+                    if level[head[edge]] == level[node] + 1 and admissible(edge, node):
+                        break
+                    pointer[node] += 1
+                if pointer[node] < len(edges):
+                    path.append(edges[pointer[node]])
+                    node = head[path[-1]]
+                elif node == source:
+                    break
+                else:
+                    # Dead end: retreat and skip the edge that led here.
+                    level[node] = -1
+                    node = head[path.pop() ^ 1]
+                    pointer[node] += 1
+        return total
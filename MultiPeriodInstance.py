@@ -0,0 +1,104 @@
+import numpy as np
+
+from NetworkInstance import NetworkInstance
+from TransportInstance import TransportInstance
+
+
+class MultiPeriodInstance:
+    def __init__(self, warehouse_names, client_names, supplies, demands, rows, cols, costs, holding,
+                 initial_inventory=None):
+        # T periods over one set of lanes. supplies (T x warehouses) is what
+        # each warehouse receives per period, demands (T x clients) what
+        # each client needs, costs (T x arcs) the lane costs per period and
+        # holding (T x warehouses) the cost of carrying a unit from period
+        # t to t + 1. Supply not shipped can be kept in stock; supply
+        # neither shipped nor kept is lost. A single row of costs or
+        # holding applies to every period.
+        self.warehouse_names = list(warehouse_names)
+        self.client_names = list(client_names)
+        self.supplies = np.atleast_2d(np.asarray(supplies, dtype=np.float64))
+        self.demands = np.atleast_2d(np.asarray(demands, dtype=np.float64))
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        periods = len(self.supplies)
+        self.costs = np.broadcast_to(np.atleast_2d(np.asarray(costs, dtype=np.float64)),
+                                     (periods, len(self.rows)))
+        self.holding = np.broadcast_to(np.atleast_2d(np.asarray(holding, dtype=np.float64)),
+                                       (periods, self.num_warehouses))
+        self.initial_inventory = (np.zeros(self.num_warehouses) if initial_inventory is None
+                                  else np.asarray(initial_inventory, dtype=np.float64))
+        if self.supplies.shape != (periods, self.num_warehouses) or self.demands.shape != (periods, self.num_clients):
+            raise ValueError("Supplies and demands need one row per period and one column per node")
+
+    @property
+    def num_periods(self):
+        return len(self.supplies)
+
+    @property
+    def num_warehouses(self):
+        return len(self.warehouse_names)
+
+    @property
+    def num_clients(self):
+        return len(self.client_names)
+
+    @property
+    def num_arcs(self):
+        return len(self.rows)
+
+    def period(self, t):
+        # Period t on its own, as the window solves it today.
+        return TransportInstance(self.warehouse_names, self.supplies[t], self.client_names, self.demands[t],
+                                 self.rows, self.cols, self.costs[t])
+
+    def window(self, start, length, inventory=None):
+        # Supplies, demands, lane costs and holding costs of periods
+        # start .. start + length - 1, with inventory added to the first
+        # period's supply. Periods past the horizon have no supply or
+        # demand, so a window keeps its shape up to the end.
+        t = np.minimum(np.arange(start, start + length), self.num_periods - 1)
+        inside = (np.arange(start, start + length) < self.num_periods)[:, None]
+        supplies = np.where(inside, self.supplies[t], 0.0)
+        demands = np.where(inside, self.demands[t], 0.0)
+        if inventory is not None:
+            supplies[0] += inventory
+        return supplies, demands, self.costs[t], self.holding[t[:-1]]
+
+    def to_network(self, start=0, length=None, inventory=None):
+        # Time expansion: per period a supply node and a stock hub per
+        # warehouse, and a node per client. Supply enters stock for free,
+        # lanes leave stock, and stock moves to the next period at the
+        # holding cost. Arcs are grouped as supply (length x warehouses),
+        # lanes (length x arcs) and holding ((length - 1) x warehouses),
+        # each period-major.
+        length = self.num_periods - start if length is None else length
+        inventory = self.initial_inventory if inventory is None and start == 0 else inventory
+        supplies, demands, costs, holding = self.window(start, length, inventory)
+        m, n = self.num_warehouses, self.num_clients
+        offsets = np.arange(length)[:, None]
+        supply_nodes = offsets * m + np.arange(m)
+        stock_nodes = length * m + supply_nodes
+        client_nodes = 2 * length * m + offsets * n + np.arange(n)
+        tails = np.concatenate([supply_nodes.ravel(), stock_nodes[:, self.rows].ravel(),
+                                stock_nodes[:-1].ravel()])
+        heads = np.concatenate([stock_nodes.ravel(), client_nodes[:, self.cols].ravel(),
+                                stock_nodes[1:].ravel()])
+        arc_costs = np.concatenate([np.zeros(length * m), costs.ravel(), holding.ravel()])
+        periods = range(start, start + length)
+        return NetworkInstance([f"{w}@{t}" for t in periods for w in self.warehouse_names],
+                               supplies.ravel(),
+                               [f"stock:{w}@{t}" for t in periods for w in self.warehouse_names],
+                               np.full(length * m, np.inf),
+                               [f"{c}@{t}" for t in periods for c in self.client_names],
+                               demands.ravel(), tails, heads, arc_costs)
+
+    def split_flows(self, flows, length):
+        # Lane flows (length x arcs) and end-of-period stock (length x
+        # warehouses) from the arc flows of a to_network window; stock
+        # left at the end of the window is not modelled and reads 0.
+        m, a = self.num_warehouses, self.num_arcs
+        flows = np.asarray(flows)
+        lanes = flows[length * m:length * (m + a)].reshape(length, a)
+        stock = np.zeros((length, m))
+        stock[:-1] = flows[length * (m + a):].reshape(length - 1, m)
+        return lanes, stock
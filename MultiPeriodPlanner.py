@@ -0,0 +1,264 @@
+import time
+
+import numpy as np
+
+from Instrumentation import instrumentation
+from SolverBackend import get_backend
+from TransportSolution import TransportSolution
+
+
+class MultiPeriodSolution:
+    def __init__(self, instance, status, objective=None, flows=None, inventory=None, backend=None, runtime=0.0):
+        # flows (T x arcs) and inventory (T x warehouses, stock kept at the
+        # end of each period) of the committed plan. iterations counts
+        # simplex iterations over all solves, with Gurobi only.
+        self.instance = instance
+        self.status = status
+        self.objective = objective
+        periods = instance.num_periods
+        self.flows = np.zeros((periods, instance.num_arcs)) if flows is None else flows
+        self.inventory = np.zeros((periods, instance.num_warehouses)) if inventory is None else inventory
+        self.backend = backend
+        self.runtime = runtime
+        self.solves = 0
+        self.iterations = 0
+
+    @property
+    def is_optimal(self):
+        return self.status == TransportSolution.OPTIMAL
+
+    @property
+    def period_costs(self):
+        inst = self.instance
+        return (inst.costs * self.flows).sum(axis=1) + (inst.holding * self.inventory).sum(axis=1)
+
+    def period(self, t):
+        # Period t's shipments as a single-period solution.
+        return TransportSolution(self.instance.period(t), self.status, float(self.period_costs[t]),
+                                 self.flows[t], self.backend, self.runtime)
+
+
+class MultiPeriodPlanner:
+    def __init__(self, instance, backend="gurobi", mode="rolling", window=4, pool=None, env=None, warm=True):
+        # "monolithic" solves the whole time-expanded network at once.
+        # "rolling" solves window periods at a time, commits the first one
+        # and moves on by a period, carrying its stock over. With Gurobi
+        # and warm, every window is the same model: moving on rewrites its
+        # supplies, demands and costs and shifts the last basis back by a
+        # period, so each step is one incremental re-solve.
+        self.instance = instance
+        self.backend = backend
+        self.mode = mode
+        self.window = max(1, min(window, instance.num_periods))
+        self.pool = pool
+        self.env = env
+        self.warm = warm
+        self.progress = None
+        self.cancelled = False
+        self._solver = None
+
+    def solve(self, progress=None):
+        from SolveProgress import SolveProgress
+
+        start = time.perf_counter()
+        self.progress = SolveProgress(progress) if progress is not None else None
+        with instrumentation.span("plan", mode=self.mode, backend=self.backend,
+                                  periods=self.instance.num_periods):
+            if self.mode == "monolithic":
+                solution = self._solve_monolithic()
+            elif self.mode == "rolling":
+                solution = self._solve_rolling()
+            else:
+                raise ValueError(f"Unknown planning mode: {self.mode}")
+        solution.runtime = time.perf_counter() - start
+        return solution
+
+    def cancel(self):
+        self.cancelled = True
+        solver = self._solver
+        if solver is not None:
+            solver.cancel()
+
+    def _backend(self):
+        # As the window model: an env passed in is used as it is, otherwise
+        # each solve borrows one from the pool.
+        options = {}
+        if self.backend == "gurobi":
+            options = {"env": self.env} if self.env is not None else {"pool": self.pool}
+        return get_backend(self.backend, network=True, **options)
+
+    def _solve_monolithic(self):
+        inst = self.instance
+        self._solver = solver = self._backend()
+        result = solver.solve(inst.to_network())
+        self._solver = None
+        solution = MultiPeriodSolution(inst, result.status, backend=self.backend)
+        solution.solves = 1
+        if result.is_optimal:
+            solution.flows, solution.inventory = inst.split_flows(result.flows, inst.num_periods)
+            solution.objective = result.objective
+        return solution
+
+    def _solve_rolling(self):
+        inst = self.instance
+        periods, length = inst.num_periods, self.window
+        solution = MultiPeriodSolution(inst, TransportSolution.OPTIMAL, backend=self.backend)
+        if self.backend == "gurobi":
+            stepper = _GurobiWindow(inst, length, self.pool, self.env, self.warm)
+        else:
+            stepper = _ColdWindow(inst, length, self._backend)
+        self._solver = stepper
+        inventory = inst.initial_inventory
+        try:
+            for t in range(periods):
+                if self.cancelled:
+                    solution.status = TransportSolution.CANCELLED
+                    break
+                with instrumentation.span("plan.step", period=t):
+                    status, lanes, stock = stepper.solve(t, inventory)
+                solution.solves += 1
+                if status != TransportSolution.OPTIMAL:
+                    # Earlier commitments can leave a later window short:
+                    # the plan stops at the first period it cannot meet.
+                    solution.status = status
+                    break
+                solution.flows[t] = lanes
+                solution.inventory[t] = stock
+                inventory = stock
+                if self.progress is not None:
+                    self.progress.update(float(solution.period_costs[:t + 1].sum()), force=True)
+        finally:
+            solution.iterations = stepper.iterations
+            stepper.close()
+            self._solver = None
+        if solution.is_optimal:
+            solution.objective = float(solution.period_costs.sum())
+        return solution
+
+
+class _ColdWindow:
+    # Every window built and solved from scratch by a network backend that
+    # keeps no model between solves.
+
+    def __init__(self, instance, length, make_backend):
+        self.instance = instance
+        self.length = length
+        self.make_backend = make_backend
+        self.iterations = 0
+        self._backend = None
+
+    def solve(self, t, inventory):
+        inst = self.instance
+        self._backend = self.make_backend()
+        result = self._backend.solve(inst.to_network(t, self.length, inventory))
+        self._backend = None
+        if not result.is_optimal:
+            return result.status, None, None
+        lanes, stock = inst.split_flows(result.flows, self.length)
+        return result.status, lanes[0], stock[0]
+
+    def cancel(self):
+        backend = self._backend
+        if backend is not None:
+            backend.cancel()
+
+    def close(self):
+        pass
+
+
+class _GurobiWindow:
+    # One window model, kept for the whole horizon. Moving on a period
+    # rewrites right-hand sides and objective coefficients in place, and
+    # the basis of period p + 1 becomes the start of period p. Without
+    # warm, every window is built and solved from scratch instead.
+
+    def __init__(self, instance, length, pool, env, warm=True):
+        self.instance = instance
+        self.length = length
+        self.pool = pool
+        # An env passed in belongs to the caller; only one taken from the
+        # pool here goes back to it.
+        self._owned = env is None and pool is not None
+        self.env = pool.acquire() if self._owned else env
+        self.warm = warm
+        m, a = instance.num_warehouses, instance.num_arcs
+        # Period-major blocks of the variables and constraints, as
+        # (first index, block size, blocks).
+        self.var_blocks = [(0, m, length), (length * m, a, length), (length * (m + a), m, length - 1)]
+        self.constr_blocks = {"supply": m, "balance": m, "demand": instance.num_clients}
+        self.iterations = 0
+        self.model = None
+        self._solved = False
+
+    def _build(self, t, inventory):
+        from NetworkModelBuilder import NetworkModelBuilder
+
+        if self.model is not None:
+            self.model.dispose()
+        network = self.instance.to_network(t, self.length, inventory)
+        with instrumentation.span("model.build"):
+            self.model, self.x, self.constrs = NetworkModelBuilder(network).build("Rolling_Horizon", self.env)
+            self.model.update()
+        self._solved = False
+
+    def solve(self, t, inventory):
+        inst = self.instance
+        if self.model is None or not self.warm:
+            self._build(t, inventory)
+        else:
+            supplies, demands, costs, holding = inst.window(t, self.length, inventory)
+            basis = self._shifted_basis() if self._solved else None
+            self.constrs["supply"].RHS = supplies.ravel()
+            self.constrs["demand"].RHS = demands.ravel()
+            self.x.Obj = np.concatenate([np.zeros(supplies.size), costs.ravel(), holding.ravel()])
+            if basis is not None:
+                # A start basis is only read by a model without a solution.
+                self.model.reset()
+                self.x.VBasis, cbasis = basis
+                for name, values in cbasis.items():
+                    self.constrs[name].CBasis = values
+        with instrumentation.span("optimize") as span:
+            self.model.optimize()
+            instrumentation.record_gurobi(span, self.model)
+        self.iterations += int(self.model.IterCount)
+        status = TransportSolution.status_from_gurobi(self.model.status)
+        self._solved = status == TransportSolution.OPTIMAL
+        if not self._solved:
+            return status, None, None
+        lanes, stock = inst.split_flows(self.x.X, self.length)
+        return status, lanes[0], stock[0]
+
+    def _shifted_basis(self):
+        # The optimal basis moved back by one period, the final period
+        # repeating its statuses. None when the shift leaves the wrong
+        # number of basic columns; Gurobi then starts from the unshifted
+        # basis it still holds.
+        vbasis = self.x.VBasis.copy()
+        cbasis = {name: self.constrs[name].CBasis for name in self.constr_blocks}
+        for first, size, blocks in self.var_blocks:
+            _shift(vbasis, first, size, blocks)
+        for name, size in self.constr_blocks.items():
+            _shift(cbasis[name], 0, size, self.length)
+        basic = np.count_nonzero(vbasis == 0) + sum(np.count_nonzero(c == 0) for c in cbasis.values())
+        if basic != self.model.NumConstrs:
+            return None
+        return vbasis, cbasis
+
+    def cancel(self):
+        model = self.model
+        if model is not None:
+            model.terminate()
+
+    def close(self):
+        if self.model is not None:
+            self.model.dispose()
+        if self._owned:
+            self.pool.release(self.env)
+            self._owned = False
+
+
+def _shift(values, first, size, blocks):
+    # In place: block b + 1 of values[first:] moves to block b; the last
+    # block keeps its statuses.
+    end = first + size * blocks
+    values[first:end - size] = values[first + size:end].copy()
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class NetworkInstance:
+    def __init__(self, warehouse_names, supplies, hub_names, throughputs, client_names, demands,
+                 tails, heads, costs, capacities=None):
+        # A transshipment network: warehouses ship, hubs pass flow on up to
+        # their throughput, clients receive. Nodes are numbered warehouses
+        # first, then hubs, then clients; arc k carries flow from node
+        # tails[k] to node heads[k] at unit cost costs[k], up to
+        # capacities[k]. An infinite throughput or capacity is no limit.
+        self.warehouse_names = list(warehouse_names)
+        self.hub_names = list(hub_names)
+        self.client_names = list(client_names)
+        self.supplies = np.asarray(supplies, dtype=np.float64)
+        self.throughputs = np.asarray(throughputs, dtype=np.float64)
+        self.demands = np.asarray(demands, dtype=np.float64)
+        self.tails = np.asarray(tails, dtype=np.int64)
+        self.heads = np.asarray(heads, dtype=np.int64)
+        self.costs = np.asarray(costs, dtype=np.float64)
+        self.capacities = (np.full(len(self.costs), np.inf) if capacities is None
+                           else np.asarray(capacities, dtype=np.float64))
+        self.node_names = self.warehouse_names + self.hub_names + self.client_names
+        self.validate()
+
+    @classmethod
+    def from_dicts(cls, warehouses, hubs, clients, cost, capacity=None):
+        # cost and capacity map (from, to) name pairs to values, as the
+        # window keeps them.
+        capacity = capacity or {}
+        names = list(warehouses) + list(hubs) + list(clients)
+        node = {name: k for k, name in enumerate(names)}
+        arcs = [(node[a], node[b], value, capacity.get((a, b), np.inf))
+                for (a, b), value in cost.items() if a in node and b in node and a != b]
+        tails, heads, costs, capacities = zip(*arcs) if arcs else ((), (), (), ())
+        return cls(warehouses.keys(), list(warehouses.values()), hubs.keys(), list(hubs.values()),
+                   clients.keys(), list(clients.values()), tails, heads, costs, capacities)
+
+    @classmethod
+    def from_transport(cls, instance):
+        m = instance.num_warehouses
+        return cls(instance.warehouse_names, instance.supplies, [], [], instance.client_names,
+                   instance.demands, instance.rows, instance.cols + m, instance.costs)
+
+    def validate(self):
+        m, h = self.num_warehouses, self.num_hubs
+        if len(self.throughputs) != h:
+            raise ValueError("One throughput per hub is required")
+        if self.num_arcs and (self.tails >= m + h).any():
+            raise ValueError("Arcs cannot leave a client")
+        if self.num_arcs and (self.heads < m).any():
+            raise ValueError("Arcs cannot enter a warehouse")
+        if (self.tails == self.heads).any():
+            raise ValueError("Arcs must join two different nodes")
+        if (self.capacities < 0).any() or (self.throughputs < 0).any():
+            raise ValueError("Capacities must be non-negative")
+
+    @property
+    def num_warehouses(self):
+        return len(self.warehouse_names)
+
+    @property
+    def num_hubs(self):
+        return len(self.hub_names)
+
+    @property
+    def num_clients(self):
+        return len(self.client_names)
+
+    @property
+    def num_nodes(self):
+        return len(self.node_names)
+
+    @property
+    def num_arcs(self):
+        return len(self.costs)
+
+    def arc_key(self, k):
+        return self.node_names[self.tails[k]], self.node_names[self.heads[k]]
+
+    def solution_from_flows(self, flows, tol=1e-9):
+        flows = np.asarray(flows, dtype=np.float64)
+        active = np.flatnonzero(flows > tol)
+        return {self.arc_key(k): float(flows[k]) for k in active}
@@ -0,0 +1,50 @@
+import numpy as np
+import scipy.sparse as sp
+from gurobipy import Model, GRB
+
+
+class NetworkModelBuilder:
+    def __init__(self, network):
+        self.network = network
+
+    def incidence_matrices(self):
+        # Node-arc incidence: outflow has +1 at the tail of each arc,
+        # inflow +1 at its head.
+        net = self.network
+        arcs = np.arange(net.num_arcs)
+        ones = np.ones(net.num_arcs)
+        shape = (net.num_nodes, net.num_arcs)
+        outflow = sp.csr_matrix((ones, (net.tails, arcs)), shape=shape)
+        inflow = sp.csr_matrix((ones, (net.heads, arcs)), shape=shape)
+        return outflow, inflow
+
+    def build(self, name="Network_Optimization", env=None):
+        # Min-cost flow over the sparse arc list. The constraint matrix is a
+        # network matrix, so the LP optimum is integral for integral data
+        # and the variables can stay continuous.
+        net = self.network
+        m, h = net.num_warehouses, net.num_hubs
+        model = Model(name, env=env) if env is not None else Model(name)
+        x = model.addMVar(net.num_arcs, lb=0, ub=net.capacities, obj=net.costs)
+        model.ModelSense = GRB.MINIMIZE
+
+        outflow, inflow = self.incidence_matrices()
+        hubs = slice(m, m + h)
+        clients = slice(m + h, net.num_nodes)
+        limited = np.flatnonzero(np.isfinite(net.throughputs))
+
+        def add(matrix, sense, rhs, names):
+            # Gurobi rejects an empty constraint block, e.g. with no hubs.
+            return model.addMConstr(matrix, x, sense, rhs, name=names) if len(names) else []
+
+        constrs = {
+            "supply": add(outflow[:m], GRB.LESS_EQUAL, net.supplies,
+                          [f"Supply_{w}" for w in net.warehouse_names]),
+            "balance": add(inflow[hubs] - outflow[hubs], GRB.EQUAL, np.zeros(h),
+                           [f"Balance_{hub}" for hub in net.hub_names]),
+            "throughput": add(inflow[hubs][limited], GRB.LESS_EQUAL, net.throughputs[limited],
+                              [f"Throughput_{net.hub_names[k]}" for k in limited]),
+            "demand": add(inflow[clients], GRB.GREATER_EQUAL, net.demands,
+                          [f"Demand_{c}" for c in net.client_names]),
+        }
+        return model, x, constrs
@@ -0,0 +1,333 @@
+import csv
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from DenseTransportInstance import DenseTransportInstance
+from MultiPeriodInstance import MultiPeriodInstance
+from NetworkInstance import NetworkInstance
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+CHUNK_SIZE = 100_000
+CSV_HEADER = ["type", "name", "target", "value"]
+SOLUTION_CSV_HEADER = ["warehouse", "client", "quantity", "unit_cost"]
+
+
+def _format(name):
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in (".csv", ".json", ".npz"):
+        raise ValueError(f"Unsupported project format: {ext or name}")
+    return ext[1:]
+
+
+def load_instance(path, chunk_size=CHUNK_SIZE):
+    fmt = _format(path)
+    if fmt == "npz":
+        return _load_npz(path)
+    if fmt == "json":
+        return _load_json(path)
+    return _load_csv(path, chunk_size)
+
+
+def save_instance(instance, path, chunk_size=CHUNK_SIZE):
+    fmt = _format(path)
+    if isinstance(instance, NetworkInstance):
+        if fmt != "json":
+            raise ValueError("Networks with hubs or arc capacities are saved as .json")
+        _save_json(instance, path)
+    elif isinstance(instance, DenseTransportInstance):
+        if fmt != "npz":
+            raise ValueError("Dense cost matrices are saved as .npz")
+        _save_dense_npz(instance, path, chunk_size)
+    elif isinstance(instance, MultiPeriodInstance):
+        if fmt != "npz":
+            raise ValueError("Multi-period plans are saved as .npz")
+        _save_multi_period_npz(instance, path)
+    elif fmt == "npz":
+        _save_npz(instance, path)
+    elif fmt == "json":
+        _save_json(instance, path)
+    else:
+        _save_csv(instance, path, chunk_size)
+
+
+def _load_npz(path):
+    with np.load(path, allow_pickle=False) as data:
+        if "cost_matrix" in data:
+            return DenseTransportInstance(data["warehouse_names"].tolist(), data["supplies"],
+                                          data["client_names"].tolist(), data["demands"],
+                                          _memmap_member(path, "cost_matrix.npy"))
+        if "holding" in data:
+            return MultiPeriodInstance(data["warehouse_names"].tolist(), data["client_names"].tolist(),
+                                       data["supplies"], data["demands"], data["rows"], data["cols"],
+                                       data["costs"], data["holding"], data["initial_inventory"])
+        return TransportInstance(data["warehouse_names"].tolist(), data["supplies"],
+                                 data["client_names"].tolist(), data["demands"],
+                                 data["rows"], data["cols"], data["costs"])
+
+
+def _save_npz(instance, path):
+    np.savez_compressed(path,
+                        warehouse_names=np.array(instance.warehouse_names, dtype=str),
+                        supplies=instance.supplies,
+                        client_names=np.array(instance.client_names, dtype=str),
+                        demands=instance.demands,
+                        rows=instance.rows, cols=instance.cols, costs=instance.costs)
+
+
+def _save_multi_period_npz(instance, path):
+    # Per-period arrays are T x nodes or T x arcs; holding marks the file
+    # as multi-period.
+    np.savez_compressed(path,
+                        warehouse_names=np.array(instance.warehouse_names, dtype=str),
+                        client_names=np.array(instance.client_names, dtype=str),
+                        supplies=instance.supplies, demands=instance.demands,
+                        rows=instance.rows, cols=instance.cols, costs=instance.costs,
+                        holding=instance.holding, initial_inventory=instance.initial_inventory)
+
+
+def _save_dense_npz(instance, path, chunk_size):
+    # Stored uncompressed, so that loading can memory-map the cost matrix,
+    # and written a block of rows at a time, so that a memmapped matrix
+    # never has to fit in memory.
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for key, value in (("warehouse_names", np.array(instance.warehouse_names, dtype=str)),
+                           ("supplies", instance.supplies),
+                           ("client_names", np.array(instance.client_names, dtype=str)),
+                           ("demands", instance.demands)):
+            with archive.open(f"{key}.npy", "w") as f:
+                np.lib.format.write_array(f, value, allow_pickle=False)
+        m, n = instance.num_warehouses, instance.num_clients
+        with archive.open("cost_matrix.npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array_header_2_0(
+                f, {"descr": "<f8", "fortran_order": False, "shape": (m, n)})
+            for _, block in instance.row_blocks(chunk_size):
+                f.write(block.astype("<f8").tobytes())
+
+
+def _memmap_member(path, name):
+    # A read-only memmap onto an uncompressed .npy inside the archive; a
+    # compressed one is read into memory instead.
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        with np.load(path, allow_pickle=False) as data:
+            return data[os.path.splitext(name)[0]]
+    with open(path, "rb") as f:
+        # Skip the local file header: 30 bytes, then the name and extra
+        # fields whose lengths sit at its end.
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2").tolist()
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def _load_json(path):
+    # JSON has to be parsed whole; prefer CSV or NPZ for very large instances.
+    with open(path, encoding="utf-8") as f:
+        return instance_from_record(json.load(f))
+
+
+def _save_json(instance, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(instance_record(instance), f)
+
+
+def instance_from_record(data):
+    # The JSON project layout as parsed data; the solve server receives
+    # instances in the same shape.
+    warehouses = data.get("warehouses", {})
+    clients = data.get("clients", {})
+    costs = data.get("costs", [])
+    if "hubs" in data or any(len(entry) > 3 for entry in costs):
+        # Hubs, or cost entries with a fourth capacity value, make a
+        # network; null stands for an unlimited throughput or capacity.
+        hubs = {name: np.inf if value is None else value for name, value in data.get("hubs", {}).items()}
+        cost = {(a, b): entry[0] for a, b, *entry in costs}
+        capacity = {(a, b): entry[1] for a, b, *entry in costs if len(entry) > 1 and entry[1] is not None}
+        return NetworkInstance.from_dicts(warehouses, hubs, clients, cost, capacity)
+    cost = {(w, c): value for w, c, value in costs}
+    return TransportInstance.from_dicts(warehouses, clients, cost)
+
+
+def instance_record(instance):
+    if isinstance(instance, NetworkInstance):
+        return _network_record(instance)
+    return {
+        "warehouses": dict(zip(instance.warehouse_names, plain_values(instance.supplies))),
+        "clients": dict(zip(instance.client_names, plain_values(instance.demands))),
+        "costs": [[instance.warehouse_names[i], instance.client_names[j], v]
+                  for i, j, v in zip(instance.rows.tolist(), instance.cols.tolist(),
+                                     plain_values(instance.costs))],
+    }
+
+
+def _network_record(network):
+    def limit(value):
+        return None if value == np.inf else plain_values([value])[0]
+
+    costs = []
+    for k, (cost, capacity) in enumerate(zip(plain_values(network.costs), network.capacities.tolist())):
+        a, b = network.arc_key(k)
+        costs.append([a, b, cost] if capacity == np.inf else [a, b, cost, limit(capacity)])
+    return {
+        "warehouses": dict(zip(network.warehouse_names, plain_values(network.supplies))),
+        "hubs": {name: limit(value) for name, value in zip(network.hub_names, network.throughputs.tolist())},
+        "clients": dict(zip(network.client_names, plain_values(network.demands))),
+        "costs": costs,
+    }
+
+
+def _load_csv(path, chunk_size):
+    # Nodes must be declared before the costs that use them. Cost rows are
+    # gathered into fixed-size chunks and converted to arrays chunk by
+    # chunk, so the Python-object footprint stays bounded by chunk_size.
+    w_index, c_index = {}, {}
+    supplies, demands = [], []
+    row_chunks, col_chunks, cost_chunks = [], [], []
+    rows, cols, costs = [], [], []
+
+    def flush():
+        if rows:
+            row_chunks.append(np.array(rows, dtype=np.int64))
+            col_chunks.append(np.array(cols, dtype=np.int64))
+            cost_chunks.append(np.array(costs, dtype=np.float64))
+            rows.clear()
+            cols.clear()
+            costs.clear()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for line_no, record in enumerate(reader, start=1):
+            if not record or record == CSV_HEADER:
+                continue
+            kind, name, target, value = record
+            if kind == "cost":
+                try:
+                    rows.append(w_index[name])
+                    cols.append(c_index[target])
+                except KeyError as e:
+                    raise ValueError(f"{path}:{line_no}: unknown node {e.args[0]!r}")
+                costs.append(float(value))
+                if len(rows) >= chunk_size:
+                    flush()
+            elif kind == "warehouse":
+                if name in w_index:
+                    supplies[w_index[name]] = float(value)
+                else:
+                    w_index[name] = len(supplies)
+                    supplies.append(float(value))
+            elif kind == "client":
+                if name in c_index:
+                    demands[c_index[name]] = float(value)
+                else:
+                    c_index[name] = len(demands)
+                    demands.append(float(value))
+            else:
+                raise ValueError(f"{path}:{line_no}: unknown record type {kind!r}")
+    flush()
+
+    def joined(chunks, dtype):
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+
+    rows, cols, costs = joined(row_chunks, np.int64), joined(col_chunks, np.int64), joined(cost_chunks, np.float64)
+    # A lane given more than once keeps its last cost, as a JSON project
+    # and the cost table do.
+    cells = rows * len(demands) + cols
+    _, last = np.unique(cells[::-1], return_index=True)
+    if len(last) < len(cells):
+        keep = np.sort(len(cells) - 1 - last)
+        rows, cols, costs = rows[keep], cols[keep], costs[keep]
+    return TransportInstance(w_index.keys(), supplies, c_index.keys(), demands, rows, cols, costs)
+
+
+def _save_csv(instance, path, chunk_size):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(["warehouse", w, "", v]
+                         for w, v in zip(instance.warehouse_names, plain_values(instance.supplies)))
+        writer.writerows(["client", c, "", v]
+                         for c, v in zip(instance.client_names, plain_values(instance.demands)))
+        w_names, c_names = instance.warehouse_names, instance.client_names
+        for start in range(0, instance.num_arcs, chunk_size):
+            stop = start + chunk_size
+            writer.writerows(
+                ["cost", w_names[i], c_names[j], v]
+                for i, j, v in zip(instance.rows[start:stop].tolist(),
+                                   instance.cols[start:stop].tolist(),
+                                   plain_values(instance.costs[start:stop])))
+
+
+def solution_record(solution):
+    return {
+        "status": solution.status,
+        "objective": solution.objective,
+        "backend": solution.backend,
+        "runtime": solution.runtime,
+        "flows": [[w, c, *plain_values([qty, cost])] for w, c, qty, cost in solution.active_arcs()],
+    }
+
+
+def plan_record(plan):
+    # A multi-period solution: totals, then per period its cost, the
+    # shipments and the stock each warehouse carries into the next period.
+    inst = plan.instance
+    periods = []
+    if plan.is_optimal:
+        costs = plan.period_costs
+        for t in range(inst.num_periods):
+            periods.append({
+                "period": t,
+                "cost": plain_values([costs[t]])[0],
+                "flows": [[w, c, *plain_values([qty, cost])] for w, c, qty, cost in plan.period(t).active_arcs()],
+                "inventory": {w: v for w, v in zip(inst.warehouse_names, plain_values(plan.inventory[t])) if v},
+            })
+    return {"status": plan.status, "objective": plan.objective, "backend": plan.backend,
+            "runtime": plan.runtime, "solves": plan.solves, "iterations": plan.iterations,
+            "periods": periods}
+
+
+def solution_from_record(instance, record):
+    # The inverse of solution_record, with flows mapped back onto the
+    # instance's arcs by name.
+    arc_of = {instance.arc_key(k): k for k in range(instance.num_arcs)}
+    flows = np.zeros(instance.num_arcs)
+    for a, b, qty, _ in record["flows"]:
+        flows[arc_of[(a, b)]] = qty
+    return TransportSolution(instance, record["status"], record["objective"], flows,
+                             record["backend"], record["runtime"])
+
+
+def save_solution(solution, path):
+    fmt = _format(path)
+    if fmt == "npz":
+        raise ValueError("Solutions are written as .json or .csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        write_solution(solution, f, fmt)
+
+
+def write_solution(solution, f, fmt="json"):
+    # CSV carries only the shipments; status and objective need JSON.
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(SOLUTION_CSV_HEADER)
+        writer.writerows([w, c, *plain_values([qty, cost])] for w, c, qty, cost in solution.active_arcs())
+    else:
+        json.dump(solution_record(solution), f)
+        f.write("\n")
+
+
+def plain_values(values):
+    # Integral quantities without a trailing ".0".
+    return [int(v) if float(v).is_integer() else float(v) for v in np.asarray(values).tolist()]
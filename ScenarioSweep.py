@@ -0,0 +1,204 @@
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+
+class SweepResult:
+    def __init__(self, objectives, flows, statuses, runtime):
+        # objectives[s] is NaN and flows[s] zero for scenarios that were not
+        # solved to optimality; statuses[s] says why.
+        self.objectives = objectives
+        self.flows = flows
+        self.statuses = statuses
+        self.runtime = runtime
+
+    @property
+    def num_scenarios(self):
+        return len(self.objectives)
+
+    @property
+    def optimal(self):
+        return np.array([status == TransportSolution.OPTIMAL for status in self.statuses])
+
+    def save(self, path):
+        np.savez_compressed(path, objectives=self.objectives, flows=self.flows,
+                            statuses=np.array(self.statuses, dtype=str))
+
+
+class ScenarioSweep:
+    def __init__(self, instance, backend="gurobi", workers=None, threads=1, chunk_size=None, sessions=None):
+        # workers * threads should not exceed the cores available; each
+        # worker process holds one Gurobi environment with Threads=threads,
+        # and so one license session. With Gurobi the workers are capped
+        # at sessions, by default EnvPool.SESSION_LIMIT.
+        self.instance = instance
+        self.backend = backend
+        self.threads = threads
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads)
+        if backend == "gurobi":
+            from EnvPool import EnvPool
+
+            self.workers = max(1, min(self.workers, sessions or EnvPool.SESSION_LIMIT))
+        self.chunk_size = chunk_size
+
+    def run(self, demands=None, cost_scale=None, outages=None):
+        # Perturbations are stacked along the first axis, one row per
+        # scenario: demands (S, clients) replaces the demand vector,
+        # cost_scale (S,) or (S, arcs) multiplies the arc costs, and
+        # outages (S, warehouses) switches warehouses off.
+        inst = self.instance
+        count = self._count(demands, cost_scale, outages)
+        if demands is None:
+            demands = inst.demands[None, :]
+        if cost_scale is None:
+            cost_scale = np.ones((1, 1))
+        if outages is None:
+            outages = np.zeros((1, inst.num_warehouses), dtype=bool)
+        cost_scale = np.asarray(cost_scale, dtype=np.float64)
+        if cost_scale.ndim == 1:
+            cost_scale = cost_scale[:, None]
+        arrays = {
+            "supplies": inst.supplies, "demands": inst.demands,
+            "rows": inst.rows, "cols": inst.cols, "costs": inst.costs,
+            "scenario_demands": np.asarray(demands, dtype=np.float64),
+            "scenario_cost_scale": cost_scale,
+            "scenario_outages": np.asarray(outages, dtype=bool),
+            "objectives": np.full(count, np.nan),
+            "flows": np.zeros((count, inst.num_arcs)),
+        }
+        start = time.perf_counter()
+        shared = _SharedArrays(arrays)
+        try:
+            chunk = self.chunk_size or max(1, math.ceil(count / (self.workers * 4)))
+            statuses = [None] * count
+            with ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker,
+                                     initargs=(shared.spec, self.backend, self.threads)) as pool:
+                futures = [pool.submit(_solve_range, low, min(low + chunk, count))
+                           for low in range(0, count, chunk)]
+                for future in futures:
+                    low, chunk_statuses = future.result()
+                    statuses[low:low + len(chunk_statuses)] = chunk_statuses
+            objectives = shared.arrays["objectives"].copy()
+            flows = shared.arrays["flows"].copy()
+        finally:
+            shared.close()
+        return SweepResult(objectives, flows, statuses, time.perf_counter() - start)
+
+    def _count(self, *perturbations):
+        counts = {len(p) for p in perturbations if p is not None}
+        if len(counts) != 1:
+            raise ValueError("Scenario arrays must be given and share their first dimension")
+        return counts.pop()
+
+
+class _SharedArrays:
+    # Each array is copied once into its own shared-memory block; workers
+    # attach to the blocks by name instead of receiving pickled copies.
+    def __init__(self, arrays=None, spec=None):
+        self.blocks = []
+        self.arrays = {}
+        self.owner = spec is None
+        if self.owner:
+            spec = {}
+            for key, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                view = np.ndarray(array.shape, array.dtype, buffer=block.buf)
+                view[...] = array
+                spec[key] = (block.name, array.shape, array.dtype.str)
+                self.blocks.append(block)
+                self.arrays[key] = view
+        else:
+            for key, (name, shape, dtype) in spec.items():
+                block = shared_memory.SharedMemory(name=name)
+                self.blocks.append(block)
+                self.arrays[key] = np.ndarray(shape, dtype, buffer=block.buf)
+        self.spec = spec
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = []
+
+
+_worker = {}
+
+
+def _init_worker(spec, backend, threads):
+    shared = _SharedArrays(spec=spec)
+    arrays = shared.arrays
+    instance = TransportInstance(range(len(arrays["supplies"])), arrays["supplies"],
+                                 range(len(arrays["demands"])), arrays["demands"],
+                                 arrays["rows"], arrays["cols"], arrays["costs"])
+    _worker.update(shared=shared, arrays=arrays, instance=instance, backend=backend)
+    if backend == "gurobi":
+        # One environment and one LP per worker; scenarios only change the
+        # right-hand sides and objective, so each solve warm-starts from
+        # the previous basis.
+        from gurobipy import Env, GRB
+        from TransportModelBuilder import TransportModelBuilder
+
+        env = Env(empty=True)
+        env.setParam("OutputFlag", 0)
+        env.setParam("Threads", threads)
+        env.start()
+        model, x, supply_constrs, demand_constrs = TransportModelBuilder(instance).build(
+            "Scenario_Sweep", vtype=GRB.CONTINUOUS, env=env)
+        _worker.update(env=env, model=model, x=x, supply_constrs=supply_constrs,
+                       demand_constrs=demand_constrs)
+
+
+def _scenario(s):
+    arrays = _worker["arrays"]
+
+    def row(key):
+        stacked = arrays[key]
+        return stacked[s] if len(stacked) > 1 else stacked[0]
+
+    supplies = np.where(row("scenario_outages"), 0.0, arrays["supplies"])
+    return supplies, row("scenario_demands"), arrays["costs"] * row("scenario_cost_scale")
+
+
+def _solve_range(low, high):
+    arrays = _worker["arrays"]
+    statuses = []
+    for s in range(low, high):
+        supplies, demands, costs = _scenario(s)
+        if _worker["backend"] == "gurobi":
+            status, objective, flows = _solve_gurobi(supplies, demands, costs)
+        else:
+            from TransportSimplex import TransportSimplex
+
+            base = _worker["instance"]
+            instance = TransportInstance(base.warehouse_names, supplies, base.client_names, demands,
+                                         base.rows, base.cols, costs)
+            status, objective, flows = TransportSimplex(instance).solve()
+        if status == TransportSolution.OPTIMAL:
+            arrays["objectives"][s] = objective
+            arrays["flows"][s] = flows
+        statuses.append(status)
+    return low, statuses
+
+
+def _solve_gurobi(supplies, demands, costs):
+    model, x = _worker["model"], _worker["x"]
+    _worker["supply_constrs"].RHS = supplies
+    _worker["demand_constrs"].RHS = demands
+    x.Obj = costs
+    model.optimize()
+    status = TransportSolution.status_from_gurobi(model.status)
+    if status != TransportSolution.OPTIMAL:
+        return status, None, None
+    return status, model.objVal, x.X
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class Sensitivity:
+    def __init__(self, solution, supply_duals, demand_duals, reduced_costs,
+                 cost_low=None, cost_up=None, supply_low=None, supply_up=None,
+                 demand_low=None, demand_up=None):
+        # LP sensitivity of an optimal solution, aligned with its instance:
+        # one entry per warehouse, client or arc. Ranges say how far a single
+        # cost or right-hand side can move before the optimal basis changes;
+        # NaN marks a range the backend could not provide.
+        inst = solution.instance
+        self.solution = solution
+        self.supply_duals = np.asarray(supply_duals, dtype=np.float64)
+        self.demand_duals = np.asarray(demand_duals, dtype=np.float64)
+        self.reduced_costs = np.asarray(reduced_costs, dtype=np.float64)
+
+        def ranges(values, size):
+            return np.full(size, np.nan) if values is None else _finite(values)
+
+        self.cost_low = ranges(cost_low, inst.num_arcs)
+        self.cost_up = ranges(cost_up, inst.num_arcs)
+        self.supply_low = ranges(supply_low, inst.num_warehouses)
+        self.supply_up = ranges(supply_up, inst.num_warehouses)
+        self.demand_low = ranges(demand_low, inst.num_clients)
+        self.demand_up = ranges(demand_up, inst.num_clients)
+        self._warehouse_index = None
+        self._client_index = None
+        self._arc_index = None
+
+    @classmethod
+    def from_gurobi(cls, solution, model, variables, supply_constrs, demand_constrs, ranges=True):
+        # Needs the optimal basis of an LP; Gurobi reports no duals for a MIP.
+        # Without ranges only the duals and reduced costs are read.
+        def get(attr, items):
+            return model.getAttr(attr, items) if len(items) else []
+
+        if not ranges:
+            return cls(solution, get("Pi", supply_constrs), get("Pi", demand_constrs), get("RC", variables))
+        return cls(solution, get("Pi", supply_constrs), get("Pi", demand_constrs), get("RC", variables),
+                   get("SAObjLow", variables), get("SAObjUp", variables),
+                   get("SARHSLow", supply_constrs), get("SARHSUp", supply_constrs),
+                   get("SARHSLow", demand_constrs), get("SARHSUp", demand_constrs))
+
+    @classmethod
+    def from_potentials(cls, solution, u, v):
+        # Transportation simplex potentials: duals and reduced costs are
+        # exact; only the cost range of nonbasic arcs follows from them.
+        inst = solution.instance
+        reduced = inst.costs - u[inst.rows] - v[inst.cols]
+        nonbasic = solution.flows <= 0
+        cost_low = np.where(nonbasic, inst.costs - reduced, np.nan)
+        cost_up = np.where(nonbasic, np.inf, np.nan)
+        return cls(solution, u, v, reduced, cost_low, cost_up)
+
+    def _indices(self):
+        if self._arc_index is None:
+            inst = self.solution.instance
+            self._warehouse_index = {w: i for i, w in enumerate(inst.warehouse_names)}
+            self._client_index = {c: j for j, c in enumerate(inst.client_names)}
+            # A lane listed twice is priced by its cheapest listing, the one
+            # a plan ships on first.
+            self._arc_index = {}
+            costs = inst.costs.tolist()
+            for k, (i, j) in enumerate(zip(inst.rows.tolist(), inst.cols.tolist())):
+                key = inst.warehouse_names[i], inst.client_names[j]
+                if key not in self._arc_index or costs[k] < costs[self._arc_index[key]]:
+                    self._arc_index[key] = k
+
+    def shadow_price(self, name):
+        self._indices()
+        if name in self._warehouse_index:
+            return float(self.supply_duals[self._warehouse_index[name]])
+        return float(self.demand_duals[self._client_index[name]])
+
+    def reduced_cost(self, warehouse, client):
+        self._indices()
+        return float(self.reduced_costs[self._arc_index[(warehouse, client)]])
+
+    # The what-if answers below are the new optimal objective after a single
+    # change, or None when the change leaves the range in which the current
+    # basis stays optimal and only a re-solve can tell.
+
+    def cost_change(self, warehouse, client, delta):
+        self._indices()
+        k = self._arc_index[(warehouse, client)]
+        cost = self.solution.instance.costs[k] + delta
+        if not self.cost_low[k] <= cost <= self.cost_up[k]:
+            return None
+        return self.solution.objective + delta * float(self.solution.flows[k])
+
+    def supply_change(self, warehouse, delta):
+        self._indices()
+        i = self._warehouse_index[warehouse]
+        return self._rhs_change(self.solution.instance.supplies[i] + delta, self.supply_low[i],
+                                self.supply_up[i], self.supply_duals[i], delta)
+
+    def demand_change(self, client, delta):
+        self._indices()
+        j = self._client_index[client]
+        return self._rhs_change(self.solution.instance.demands[j] + delta, self.demand_low[j],
+                                self.demand_up[j], self.demand_duals[j], delta)
+
+    def _rhs_change(self, rhs, low, up, dual, delta):
+        if not low <= rhs <= up:
+            return None
+        return self.solution.objective + float(dual) * delta
+
+
+def _finite(values):
+    # Gurobi reports unbounded ranges as +/-1e100.
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.abs(values) >= 1e100, np.copysign(np.inf, values), values)
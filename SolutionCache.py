@@ -0,0 +1,216 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from TransportSolution import TransportSolution
+
+
+class SolutionCache:
+    def __init__(self, capacity=64, path=None, disk_bytes=256 * 2**20):
+        # Optimal solutions keyed by a fingerprint of the instance data.
+        # Names are not part of the key: flows are stored in canonical arc
+        # order (by warehouse, then client) and mapped back onto whichever
+        # instance asks for them. The file keeps at most disk_bytes of
+        # flows; the solutions looked up longest ago go first.
+        self.capacity = capacity
+        self.disk_bytes = disk_bytes
+        self._entries = OrderedDict()
+        self._topologies = {}
+        # The latest solution with its lane names, to warm-start instances
+        # whose lanes differ: (warehouse names, client names, rows, cols,
+        # flows) of its active arcs.
+        self._latest = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions ("
+                             "fingerprint TEXT PRIMARY KEY, topology TEXT, objective REAL, "
+                             "flows BLOB, backend TEXT, created REAL)")
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(solutions)")]
+            if "used" not in columns:
+                # Files written before eviction count their last use from
+                # when the solution was stored.
+                self._db.execute("ALTER TABLE solutions ADD COLUMN used REAL")
+                self._db.execute("UPDATE solutions SET used = created")
+            self._db.execute("CREATE INDEX IF NOT EXISTS solutions_topology ON solutions (topology)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS latest ("
+                             "id INTEGER PRIMARY KEY CHECK (id = 0), names TEXT, rows BLOB, cols BLOB, flows BLOB)")
+            self._db.commit()
+
+    @staticmethod
+    def _canonical(instance):
+        order = np.lexsort((instance.cols, instance.rows))
+        return order, instance.rows[order], instance.cols[order]
+
+    @classmethod
+    def fingerprint(cls, instance):
+        return cls._keys(instance)[1]
+
+    @classmethod
+    def _keys(cls, instance):
+        order, rows, cols = cls._canonical(instance)
+        topology = hashlib.sha256()
+        topology.update(np.array([instance.num_warehouses, instance.num_clients], dtype="<i8").tobytes())
+        topology.update(rows.astype("<i8").tobytes())
+        topology.update(cols.astype("<i8").tobytes())
+        full = topology.copy()
+        for values in (instance.supplies, instance.demands, instance.costs[order]):
+            full.update(np.ascontiguousarray(values, dtype="<f8").tobytes())
+        return order, full.hexdigest(), topology.hexdigest()
+
+    def get(self, instance):
+        start = time.perf_counter()
+        order, key, _ = self._keys(instance)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        elif self._db is not None:
+            row = self._db.execute("SELECT topology, objective, flows, backend FROM solutions "
+                                   "WHERE fingerprint = ?", (key,)).fetchone()
+            if row is not None:
+                topology, objective, flows, backend = row
+                entry = (topology, objective, np.frombuffer(flows, dtype="<f8"), backend)
+                self._remember(key, entry)
+                self.disk_hits += 1
+        if entry is None:
+            self.misses += 1
+            return None
+        if self._db is not None:
+            self._db.execute("UPDATE solutions SET used = ? WHERE fingerprint = ?", (time.time(), key))
+            self._db.commit()
+        _, objective, flows, backend = entry
+        return TransportSolution(instance, TransportSolution.OPTIMAL, objective,
+                                 self._unorder(order, flows), f"cache ({backend})",
+                                 time.perf_counter() - start)
+
+    def put(self, solution):
+        if not solution.is_optimal:
+            return
+        inst = solution.instance
+        active = np.flatnonzero(solution.flows > 0)
+        self._latest = (inst.warehouse_names, inst.client_names, inst.rows[active], inst.cols[active],
+                        solution.flows[active])
+        order, key, topology = self._keys(inst)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        flows = np.ascontiguousarray(solution.flows[order], dtype="<f8")
+        entry = (topology, float(solution.objective), flows, solution.backend)
+        self._remember(key, entry)
+        if self._db is not None:
+            now = time.time()
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (key, topology, entry[1], flows.tobytes(), entry[3], now, now))
+            self._db.execute("INSERT OR REPLACE INTO latest VALUES (0, ?, ?, ?, ?)",
+                             (json.dumps([inst.warehouse_names, inst.client_names]),
+                              inst.rows[active].astype("<i8").tobytes(), inst.cols[active].astype("<i8").tobytes(),
+                              np.ascontiguousarray(solution.flows[active], dtype="<f8").tobytes()))
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        # Least recently used first, until the flows fit in disk_bytes.
+        total = self._db.execute("SELECT COALESCE(SUM(LENGTH(flows)), 0) FROM solutions").fetchone()[0]
+        if total <= self.disk_bytes:
+            return
+        doomed = []
+        for key, size in self._db.execute("SELECT fingerprint, LENGTH(flows) FROM solutions ORDER BY used"):
+            if total <= self.disk_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM solutions WHERE fingerprint = ?", doomed)
+        self.evicted += len(doomed)
+
+    def warm_start(self, instance):
+        # Flows of the most recent optimal solution on the same lanes, for
+        # an instance that differs only in its numbers; failing that, the
+        # latest solution's flows carried over by lane name, for one with
+        # lanes or sites added or removed. They may no longer be feasible;
+        # the backends check before using them.
+        order, _, topology = self._keys(instance)
+        key = self._topologies.get(topology)
+        flows = self._entries[key][2] if key in self._entries else None
+        if flows is None and self._db is not None:
+            row = self._db.execute("SELECT flows FROM solutions WHERE topology = ? "
+                                   "ORDER BY created DESC LIMIT 1", (topology,)).fetchone()
+            if row is not None:
+                flows = np.frombuffer(row[0], dtype="<f8")
+        if flows is not None:
+            return self._unorder(order, flows)
+        return self._by_name(instance)
+
+    def _by_name(self, instance):
+        latest = self._latest
+        if latest is None and self._db is not None:
+            row = self._db.execute("SELECT names, rows, cols, flows FROM latest").fetchone()
+            if row is not None:
+                names, rows, cols, flows = row
+                latest = (*json.loads(names), np.frombuffer(rows, dtype="<i8"), np.frombuffer(cols, dtype="<i8"),
+                          np.frombuffer(flows, dtype="<f8"))
+        if latest is None:
+            return None
+        warehouse_names, client_names, rows, cols, flows = latest
+        # Old indices to new, -1 for sites that are gone; a lane keeps its
+        # flow where both ends and the lane itself remain.
+        w_index = {w: i for i, w in enumerate(instance.warehouse_names)}
+        c_index = {c: j for j, c in enumerate(instance.client_names)}
+        rows = np.array([w_index.get(w, -1) for w in warehouse_names], dtype=np.int64)[rows]
+        cols = np.array([c_index.get(c, -1) for c in client_names], dtype=np.int64)[cols]
+        kept = (rows >= 0) & (cols >= 0)
+        n = instance.num_clients
+        cells = instance.rows * n + instance.cols
+        by_cell = np.argsort(cells, kind="stable")
+        wanted = rows[kept] * n + cols[kept]
+        at = np.minimum(np.searchsorted(cells[by_cell], wanted), max(len(cells) - 1, 0))
+        found = (cells[by_cell][at] == wanted) if len(cells) else np.zeros(len(wanted), dtype=bool)
+        if not found.any():
+            return None
+        result = np.zeros(instance.num_arcs)
+        np.add.at(result, by_cell[at[found]], flows[kept][found])
+        return result
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._topologies[entry[0]] = key
+        while len(self._entries) > self.capacity:
+            old_key, old_entry = self._entries.popitem(last=False)
+            if self._topologies.get(old_entry[0]) == old_key:
+                del self._topologies[old_entry[0]]
+
+    @staticmethod
+    def _unorder(order, flows):
+        result = np.empty(len(order))
+        result[order] = flows
+        return result
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "entries": len(self._entries), "evicted": self.evicted,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0}
+
+    def clear(self):
+        self._entries.clear()
+        self._topologies.clear()
+        self._latest = None
+        if self._db is not None:
+            self._db.execute("DELETE FROM solutions")
+            self._db.execute("DELETE FROM latest")
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
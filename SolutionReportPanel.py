@@ -0,0 +1,100 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QLabel,
+                             QPushButton, QTableView, QHeaderView, QFileDialog)
+from PyQt5.QtCore import Qt
+
+from Instrumentation import instrumentation
+from SolutionTableModel import SolutionTableModel
+
+
+class SolutionReportPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        options_layout = QHBoxLayout()
+        self.view_combo = QComboBox()
+        for label, view in (("Lanes", "lanes"), ("By warehouse", "warehouses"), ("By client", "clients")):
+            self.view_combo.addItem(label, view)
+        self.view_combo.currentIndexChanged.connect(self.set_view)
+        options_layout.addWidget(self.view_combo)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by name")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.set_filter)
+        options_layout.addWidget(self.filter_edit, stretch=1)
+        self.export_btn = QPushButton("Export CSV")
+        self.export_btn.clicked.connect(self.export_csv)
+        options_layout.addWidget(self.export_btn)
+        layout.addLayout(options_layout)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("font-size: 13px; color: #D1D1D1;")
+        layout.addWidget(self.summary_label)
+
+        # Fixed row heights and pages fetched on scroll keep the table from
+        # touching rows it does not show.
+        self.model = SolutionTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+        self.setStyleSheet("""
+            QTableView {
+                background-color: #2C2F33; color: white; gridline-color: #3E4246;
+                border: 1px solid #3E4246; border-radius: 5px;
+            }
+            QTableView::item:selected { background-color: #5865F2; }
+            QHeaderView::section { background-color: #23272A; color: white; padding: 4px; border: none; }
+        """)
+        self._show_table(False)
+
+    def _show_table(self, visible):
+        self.table.setVisible(visible)
+        self.view_combo.setEnabled(visible)
+        self.filter_edit.setEnabled(visible)
+        self.export_btn.setEnabled(visible)
+
+    def set_solution(self, result):
+        with instrumentation.span("report.set_solution", arcs=result.instance.num_arcs):
+            self.model.set_solution(result)
+        self._show_table(True)
+        self.refresh_summary()
+
+    def clear(self):
+        self.model.clear()
+        self._show_table(False)
+        self.summary_label.setText("")
+
+    def set_view(self, _=None):
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.model.set_view(self.view_combo.currentData())
+        self.refresh_summary()
+
+    def set_filter(self, text):
+        self.model.set_filter(text)
+        self.refresh_summary()
+
+    def refresh_summary(self):
+        totals = self.model.totals()
+        if totals is None:
+            self.summary_label.setText("")
+            return
+        self.summary_label.setText(f"{totals['rows']} {self.model.view}, quantity {totals['quantity']:g}, "
+                                   f"cost {totals['cost']:.2f}")
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Solution", "solution.csv", "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            with instrumentation.span("report.export_csv"), open(path, "w", newline="", encoding="utf-8") as f:
+                rows = self.model.write_csv(f)
+        except OSError as e:
+            self.summary_label.setText(f"Error: Could not export: {e}")
+            return
+        self.summary_label.setText(f"Exported {rows} rows to {path}")
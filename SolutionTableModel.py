@@ -0,0 +1,235 @@
+import csv
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from NetworkInstance import NetworkInstance
+
+VIEWS = ("lanes", "warehouses", "clients")
+
+
+class SolutionTableModel(QAbstractTableModel):
+    PAGE_SIZE = 5000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # One view of the solution at a time: its columns as whole arrays,
+        # (header, values, is_name) with name columns holding node indices,
+        # and order, the rows that pass the filter in their sorted order.
+        # The table exposes order a page at a time and formats a cell only
+        # when the view asks for it.
+        self.result = None
+        self.view = "lanes"
+        self.names = []
+        self.lowered = np.zeros(0, dtype=str)
+        self.name_rank = np.zeros(0, dtype=np.int64)
+        self.views = {}
+        self.columns = []
+        self.order = np.zeros(0, dtype=np.int64)
+        self.loaded = 0
+        self.filter_text = ""
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    @property
+    def num_rows(self):
+        # Rows that pass the filter, loaded or not.
+        return len(self.order)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.order)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self.order) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        _, values, is_name = self.columns[index.column()]
+        value = values[self.order[index.row()]]
+        if role == Qt.DisplayRole:
+            return self.names[value] if is_name else _format(value)
+        if role == Qt.TextAlignmentRole and not is_name:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section][0] if 0 <= section < len(self.columns) else None
+        return section + 1
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def set_solution(self, result, tol=1e-9):
+        # Flows become lanes, warehouse and client totals as arrays, in a
+        # few vectorised passes over the active arcs.
+        self.result = result
+        inst = result.instance
+        if isinstance(inst, NetworkInstance):
+            names = inst.node_names
+            tails, heads, capacities = inst.tails, inst.heads, inst.capacities
+            first_client = inst.num_warehouses + inst.num_hubs
+        else:
+            names = inst.warehouse_names + inst.client_names
+            tails, heads = inst.rows, inst.cols + inst.num_warehouses
+            capacities = np.full(inst.num_arcs, np.inf)
+            first_client = inst.num_warehouses
+        m, n = inst.num_warehouses, inst.num_clients
+        active = np.flatnonzero(result.flows > tol)
+        flows, costs = result.flows[active], inst.costs[active]
+        tails, heads = tails[active], heads[active]
+        self.names = names
+        self.lowered = np.array([name.lower() for name in names], dtype=str)
+        self.name_rank = np.argsort(np.argsort(np.array(names, dtype=str), kind="stable"))
+
+        limited = np.isfinite(capacities[active])
+        lane_use = np.full(len(active), np.nan)
+        lane_use[limited] = 100.0 * flows[limited] / np.maximum(capacities[active][limited], 1e-12)
+        lanes = [("From", tails, True), ("To", heads, True), ("Quantity", flows, False),
+                 ("Unit cost", costs, False), ("Cost", flows * costs, False),
+                 ("Utilization %", lane_use, False)]
+
+        # Warehouse totals count what leaves a warehouse, client totals
+        # what reaches a client, through hubs or directly.
+        out = tails < m
+        sources = tails[out]
+        shipped = np.bincount(sources, flows[out], m)
+        warehouses = [("Warehouse", np.arange(m), True),
+                      ("Lanes", np.bincount(sources, minlength=m), False),
+                      ("Shipped", shipped, False),
+                      ("Cost", np.bincount(sources, (flows * costs)[out], m), False),
+                      ("Supply", inst.supplies, False),
+                      ("Utilization %", _percent(shipped, inst.supplies), False)]
+        into = heads >= first_client
+        sinks = heads[into] - first_client
+        received = np.bincount(sinks, flows[into], n)
+        clients = [("Client", np.arange(n) + first_client, True),
+                   ("Lanes", np.bincount(sinks, minlength=n), False),
+                   ("Received", received, False),
+                   ("Cost", np.bincount(sinks, (flows * costs)[into], n), False),
+                   ("Demand", inst.demands, False),
+                   ("Fill %", _percent(received, inst.demands), False)]
+        self.views = {"lanes": lanes, "warehouses": warehouses, "clients": clients}
+        self._refresh()
+
+    def clear(self):
+        self.result = None
+        self.views = {}
+        self._refresh()
+
+    def set_view(self, view):
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view}; use one of {', '.join(VIEWS)}")
+        self.view = view
+        self.sort_column = None
+        self._refresh()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip().lower()
+        self._refresh(keep_columns=True)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column if 0 <= column < len(self.columns) else None
+        self.sort_order = order
+        self._refresh(keep_columns=True)
+
+    def _refresh(self, keep_columns=False):
+        # Filtering keeps rows whose names contain the text; names are
+        # matched once per node and rows pick the result up by index.
+        # Sorting is one stable argsort of the column (names by rank).
+        self.beginResetModel()
+        if not keep_columns:
+            self.columns = self.views.get(self.view, []) if self.result is not None else []
+        if not self.columns:
+            self.order = np.zeros(0, dtype=np.int64)
+        else:
+            rows = np.arange(len(self.columns[0][1]))
+            if self.filter_text:
+                matched = np.char.find(self.lowered, self.filter_text) >= 0
+                keep = np.zeros(len(rows), dtype=bool)
+                for _, values, is_name in self.columns:
+                    if is_name:
+                        keep |= matched[values]
+                rows = rows[keep]
+            if self.sort_column is not None:
+                _, values, is_name = self.columns[self.sort_column]
+                key = self.name_rank[values[rows]] if is_name else values[rows]
+                if self.sort_order == Qt.DescendingOrder:
+                    key = -key
+                if key.dtype.kind == "f":
+                    # NaN (no capacity) sorts last either way.
+                    key = np.where(np.isnan(key), np.inf, key)
+                rows = rows[np.argsort(key, kind="stable")]
+            self.order = rows
+        self.loaded = min(self.PAGE_SIZE, len(self.order))
+        self.endResetModel()
+
+    def totals(self):
+        # Totals of the rows that pass the filter, for the summary line.
+        if not self.columns:
+            return None
+        rows = self.order
+        if self.view == "lanes":
+            quantity, cost = self.columns[2][1], self.columns[4][1]
+        else:
+            quantity, cost = self.columns[2][1], self.columns[3][1]
+        return {"rows": len(rows), "quantity": float(quantity[rows].sum()), "cost": float(cost[rows].sum())}
+
+    def write_csv(self, f, chunk_rows=50_000):
+        # Every row that passes the filter, in the table's order, written a
+        # chunk at a time; nothing is formatted for the table itself.
+        writer = csv.writer(f)
+        writer.writerow([header for header, _, _ in self.columns])
+        names = self.names
+        for start in range(0, len(self.order), chunk_rows):
+            rows = self.order[start:start + chunk_rows]
+            cells = []
+            for _, values, is_name in self.columns:
+                chunk = values[rows]
+                if is_name:
+                    cells.append([names[k] for k in chunk.tolist()])
+                else:
+                    cells.append(_plain(chunk))
+            writer.writerows(zip(*cells))
+        return len(self.order)
+
+
+def _plain(values):
+    # As ProjectIO.plain_values, decided per chunk rather than per value,
+    # with an empty cell where there is no value.
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return values.tolist()
+    missing = np.isnan(values)
+    if missing.all():
+        return [""] * len(values)
+    if not missing.any() and np.all(values == np.round(values)):
+        return values.astype(np.int64).tolist()
+    return ["" if m else (int(v) if v.is_integer() else v) for v, m in zip(values.tolist(), missing.tolist())]
+
+
+def _percent(part, whole):
+    whole = np.asarray(whole, dtype=np.float64)
+    return np.where(whole > 0, 100.0 * part / np.where(whole > 0, whole, 1.0), np.nan)
+
+
+def _format(value):
+    if np.isnan(value):
+        return ""
+    return f"{int(value)}" if float(value).is_integer() else f"{value:.2f}"
@@ -0,0 +1,107 @@
+import json
+import socket
+import threading
+
+import ProjectIO
+from SolverBackend import SolverBackend
+from TransportSolution import TransportSolution
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+
+def parse_address(address):
+    # "unix:/path/to/socket" (or a bare absolute path) names a Unix socket,
+    # anything else "host:port".
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("/"):
+        return socket.AF_UNIX, address
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class SolveClient:
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=10.0):
+        # One connection per request: the server streams newline-delimited
+        # JSON events back on it until the request is answered.
+        self.address = address
+        self.timeout = timeout
+
+    def _connect(self):
+        family, target = parse_address(self.address)
+        conn = socket.socket(family, socket.SOCK_STREAM)
+        conn.settimeout(self.timeout)
+        conn.connect(target)
+        # Solves may take longer than the connect timeout.
+        conn.settimeout(None)
+        return conn
+
+    def events(self, request, conn=None):
+        conn = conn or self._connect()
+        try:
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as lines:
+                for line in lines:
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+    def status(self):
+        for event in self.events({"op": "status"}):
+            return event
+
+    def solve(self, instance, backend=None, priority="normal", progress=None, incumbent=None, conn=None):
+        # Blocks until the server answers; progress receives the same dicts
+        # a local solve reports and incumbent intermediate solutions.
+        request = {"op": "solve", "instance": ProjectIO.instance_record(instance), "priority": priority}
+        if backend is not None:
+            request["backend"] = backend
+        for event in self.events(request, conn):
+            kind = event["event"]
+            if kind == "progress" and progress is not None:
+                progress({key: event.get(key) for key in ("incumbent", "bound", "gap", "elapsed")})
+            elif kind == "incumbent" and incumbent is not None:
+                incumbent(ProjectIO.solution_from_record(instance, event["solution"]))
+            elif kind == "result":
+                return ProjectIO.solution_from_record(instance, event["solution"])
+            elif kind == "error":
+                raise RuntimeError(event["message"])
+        # The connection closed before a result: cancelled here, or the
+        # server went away.
+        return TransportSolution(instance, TransportSolution.CANCELLED, backend=backend)
+
+
+class RemoteBackend(SolverBackend):
+    name = "remote"
+    label = "Solve server"
+    preview = None
+
+    def __init__(self, address=DEFAULT_ADDRESS, backend=None, priority="normal"):
+        self.client = SolveClient(address)
+        self.backend = backend
+        self.priority = priority
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def solve(self, instance, progress=None, incumbent=None):
+        try:
+            with self._lock:
+                if self._cancelled:
+                    return TransportSolution(instance, TransportSolution.CANCELLED, backend=self.backend)
+                self._conn = self.client._connect()
+            return self.client.solve(instance, self.backend, self.priority, progress, incumbent, self._conn)
+        finally:
+            with self._lock:
+                self._conn = None
+                self._cancelled = False
+
+    def cancel(self):
+        # Dropping the connection withdraws this client from the job; the
+        # server stops it once no other client is waiting on it.
+        with self._lock:
+            self._cancelled = True
+            if self._conn is not None:
+                try:
+                    self._conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
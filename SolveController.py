@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from Instrumentation import instrumentation
+
+
+class SolveController(QObject):
+    progress = pyqtSignal(dict)
+    # Feasible plans found before the solve finishes, best last.
+    incumbent = pyqtSignal(object)
+    solved = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+    # Worker-side signals, tagged with the generation of their solve.
+    _progress = pyqtSignal(int, object)
+    _incumbent = pyqtSignal(int, object)
+    _finished = pyqtSignal(int, object, object)
+
+    def __init__(self, parent=None, max_workers=1):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solve")
+        self.running = None
+        self.pending = None
+        # discard() moves to a new generation; anything a solve of an older
+        # one still reports is dropped.
+        self.generation = 0
+        # (solver, close) pairs waiting for the running solve to return.
+        self.retired = []
+        self._progress.connect(self._on_progress)
+        self._incumbent.connect(self._on_incumbent)
+        self._finished.connect(self._on_finished)
+
+    @property
+    def busy(self):
+        return self.running is not None
+
+    def submit(self, solver, *args, profile=False):
+        # Clicks that arrive while a solve is running collapse into a single
+        # follow-up solve with the latest data. With profile, the solve runs
+        # under cProfile and leaves its statistics in instrumentation.
+        if self.busy:
+            self.pending = (solver, args, profile)
+            return
+        self._start(solver, args, profile)
+
+    def cancel(self):
+        self.pending = None
+        if self.running is not None:
+            self.running.cancel()
+
+    def discard(self):
+        # Cancels the running solve and drops its progress and result, for
+        # when the data it was solving is gone.
+        self.generation += 1
+        self.cancel()
+
+    def retire(self, solver, close):
+        # Calls close(solver) once no solve uses solver: at once when it is
+        # not running, otherwise when the running solve returns. A repeat
+        # solve queued with it is dropped; returns whether there was one.
+        dropped = self.pending is not None and self.pending[0] is solver
+        if dropped:
+            self.pending = None
+        if self.running is solver:
+            self.retired.append((solver, close))
+        else:
+            close(solver)
+        return dropped
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=True)
+        # The worker is done; its _finished will not be delivered any more.
+        self.running = None
+        self._close_retired()
+
+    def _start(self, solver, args, profile=False):
+        self.running = solver
+        self.busy_changed.emit(True)
+        self.executor.submit(self._run, self.generation, solver, args, profile)
+
+    def _run(self, generation, solver, args, profile):
+        def progress(values):
+            self._progress.emit(generation, values)
+
+        def incumbent(result):
+            self._incumbent.emit(generation, result)
+
+        try:
+            if profile:
+                with instrumentation.profile():
+                    result = solver.solve(*args, progress=progress, incumbent=incumbent)
+            else:
+                result = solver.solve(*args, progress=progress, incumbent=incumbent)
+        except Exception as e:
+            self._finished.emit(generation, None, e)
+        else:
+            self._finished.emit(generation, result, None)
+
+    def _on_progress(self, generation, values):
+        if generation == self.generation:
+            self.progress.emit(values)
+
+    def _on_incumbent(self, generation, result):
+        if generation == self.generation:
+            self.incumbent.emit(result)
+
+    def _close_retired(self):
+        retired, self.retired = self.retired, []
+        for solver, close in retired:
+            close(solver)
+
+    def _on_finished(self, generation, result, error):
+        self.running = None
+        self._close_retired()
+        if generation == self.generation:
+            if error is not None:
+                self.failed.emit(str(error))
+            else:
+                self.solved.emit(result)
+        if self.pending is not None:
+            solver, args, profile = self.pending
+            self.pending = None
+            self._start(solver, args, profile)
+        else:
+            self.busy_changed.emit(False)
@@ -0,0 +1,54 @@
+import time
+
+
+class SolveProgress:
+    def __init__(self, report=None, interval=0.1, on_solution=None):
+        # report receives throttled progress dicts; on_solution(objective,
+        # flows) receives every new incumbent solution.
+        self.report = report
+        self.on_solution = on_solution
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last = float("-inf")
+
+    def due(self):
+        return time.perf_counter() - self._last >= self.interval
+
+    def update(self, incumbent=None, bound=None, elapsed=None, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        if self.report is None:
+            return
+        gap = None
+        if incumbent is not None and bound is not None:
+            gap = abs(incumbent - bound) / max(abs(incumbent), 1e-10)
+        self.report({
+            "incumbent": incumbent,
+            "bound": bound,
+            "gap": gap,
+            "elapsed": now - self.start if elapsed is None else elapsed,
+        })
+
+    def gurobi_callback(self, variables=None):
+        from gurobipy import GRB
+
+        def callback(model, where):
+            if where == GRB.Callback.MIPSOL and self.on_solution is not None and variables is not None:
+                self.on_solution(model.cbGet(GRB.Callback.MIPSOL_OBJ), model.cbGetSolution(variables))
+            elif where == GRB.Callback.MIP:
+                incumbent = model.cbGet(GRB.Callback.MIP_OBJBST)
+                self.update(incumbent if incumbent < GRB.INFINITY else None,
+                            model.cbGet(GRB.Callback.MIP_OBJBND),
+                            model.cbGet(GRB.Callback.RUNTIME))
+            elif where == GRB.Callback.SIMPLEX:
+                # A primal feasible simplex iterate is an incumbent; a dual
+                # feasible one bounds the optimum from below.
+                objective = model.cbGet(GRB.Callback.SPX_OBJVAL)
+                primal_ok = model.cbGet(GRB.Callback.SPX_PRIMINF) <= 1e-6
+                dual_ok = model.cbGet(GRB.Callback.SPX_DUALINF) <= 1e-6
+                self.update(objective if primal_ok else None,
+                            objective if dual_ok else None,
+                            model.cbGet(GRB.Callback.RUNTIME))
+        return callback
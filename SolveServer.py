@@ -0,0 +1,339 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import ProjectIO
+from Instrumentation import instrumentation
+from NetworkInstance import NetworkInstance
+from SolveClient import parse_address
+from SolverBackend import GurobiBackend, get_backend
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+class _Job:
+    def __init__(self, job_id, key, instance, backend, priority, seq):
+        self.id = job_id
+        self.key = key
+        self.instance = instance
+        self.backend = backend
+        self.priority = priority
+        self.seq = seq
+        # One event queue per connection waiting on this job.
+        self.subscribers = []
+        self.solver = None
+        self.cancelled = False
+
+    @property
+    def entry(self):
+        # Heap entry: priority level, then submission order.
+        return self.priority, self.seq, self
+
+
+class SolveServer:
+    def __init__(self, backend="gurobi", max_queue=64, workers=1, batch_size=8, batch_max_arcs=5_000,
+                 recent=64, solver_factory=None):
+        # Jobs wait in a bounded priority queue. An identical submission,
+        # same data and backend, joins the queued or running job, or gets
+        # the recent result. A worker that picks a small job takes up to
+        # batch_size - 1 more small ones and solves them in one go on the
+        # "batch" Gurobi profile. solver_factory(instance, backend, profile)
+        # returns an object with solve(instance, progress, incumbent) and
+        # cancel(), as the backends have; it defaults to get_backend.
+        self.backend = backend
+        self.max_queue = max_queue
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_max_arcs = batch_max_arcs
+        self.solver_factory = solver_factory or self._make_solver
+        self._heap = []
+        self._jobs = {}
+        self._recent = OrderedDict()
+        self._recent_size = recent
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._ready = None
+        self._loop = None
+        self._server = None
+        self._tasks = []
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serve")
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "completed": 0,
+                      "cancelled": 0, "failed": 0, "batches": 0, "running": 0}
+
+    async def start(self, address):
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Condition()
+        family, target = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(target):
+                os.unlink(target)
+            self._server = await asyncio.start_unix_server(self._handle, target)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self._server
+
+    async def serve_forever(self, address):
+        server = await self.start(address)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for job in list(self._jobs.values()):
+            if job.solver is not None:
+                job.solver.cancel()
+        self._executor.shutdown(wait=True)
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _make_solver(self, instance, backend, profile):
+        options = {}
+        if backend == GurobiBackend.name:
+            with self._pool_lock:
+                if self._pool is None:
+                    from EnvPool import EnvPool
+
+                    self._pool = EnvPool(size=self.workers)
+            options = {"pool": self._pool, "profile": profile}
+        return get_backend(backend, network=isinstance(instance, NetworkInstance), **options)
+
+    # Connections
+
+    async def _handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                op = request.get("op", "solve")
+            except (ValueError, AttributeError) as e:
+                await self._send(writer, {"event": "error", "message": f"Bad request: {e}"})
+                return
+            if op == "status":
+                await self._send(writer, self.status())
+            elif op == "solve":
+                await self._handle_solve(request, reader, writer)
+            else:
+                await self._send(writer, {"event": "error", "message": f"Unknown operation: {op}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, event):
+        writer.write(json.dumps(event).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def _handle_solve(self, request, reader, writer):
+        events = asyncio.Queue()
+        try:
+            job = self._submit(request, events)
+        except (ValueError, KeyError, TypeError) as e:
+            await self._send(writer, {"event": "error", "message": str(e)})
+            return
+        if job is None:
+            # Answered at once, from the recent results or with a refusal.
+            await self._send(writer, events.get_nowait())
+            return
+        async with self._ready:
+            self._ready.notify()
+        # A client drops its interest by closing the connection; watch for
+        # that while the job's events are relayed.
+        closed = asyncio.create_task(reader.read())
+        try:
+            while True:
+                next_event = asyncio.create_task(events.get())
+                done, _ = await asyncio.wait({next_event, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event not in done:
+                    next_event.cancel()
+                    break
+                event = next_event.result()
+                await self._send(writer, event)
+                if event["event"] in ("result", "error"):
+                    break
+        finally:
+            closed.cancel()
+            self._unsubscribe(job, events)
+
+    # Queue
+
+    def _submit(self, request, events):
+        instance = ProjectIO.instance_from_record(request["instance"])
+        backend = request.get("backend") or self.backend
+        priority = PRIORITIES.get(request.get("priority", "normal"))
+        if priority is None:
+            raise ValueError(f"Unknown priority: {request['priority']}; use one of {', '.join(PRIORITIES)}")
+        data = json.dumps([backend, request["instance"]], sort_keys=True).encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        self.stats["submitted"] += 1
+        instrumentation.count("server.submitted")
+
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            self.stats["deduplicated"] += 1
+            events.put_nowait({"event": "result", "job": None, "duplicate": True,
+                               "solution": self._recent[key]})
+            return None
+        job = self._jobs.get(key)
+        # A cancelled job may still be running; a new submission gets a
+        # fresh job rather than its cancelled result.
+        if job is not None and not job.cancelled:
+            self.stats["deduplicated"] += 1
+            if priority < job.priority and job.solver is None:
+                # The most urgent submitter sets the place in the queue.
+                job.priority = priority
+                self._heap = [queued.entry for _, _, queued in self._heap]
+                heapq.heapify(self._heap)
+            job.subscribers.append(events)
+            events.put_nowait({"event": "accepted", "job": job.id, "duplicate": True,
+                               "position": self._position(job)})
+            return job
+        if len(self._heap) >= self.max_queue:
+            self.stats["rejected"] += 1
+            events.put_nowait({"event": "error", "job": None,
+                               "message": f"Queue full ({self.max_queue} jobs waiting)"})
+            return None
+
+        job = _Job(next(self._ids), key, instance, backend, priority, next(self._seq))
+        job.subscribers.append(events)
+        self._jobs[key] = job
+        heapq.heappush(self._heap, job.entry)
+        events.put_nowait({"event": "accepted", "job": job.id, "duplicate": False,
+                           "position": self._position(job)})
+        return job
+
+    def _position(self, job):
+        # Jobs ahead of this one, 0 when it is next or already running.
+        return sum(1 for entry in self._heap if entry < job.entry)
+
+    def _unsubscribe(self, job, events):
+        if events in job.subscribers:
+            job.subscribers.remove(events)
+        if job.subscribers or job.cancelled or self._jobs.get(job.key) is not job:
+            return
+        # Nobody is waiting any more: drop a queued job, stop a running one.
+        # A job already taken into a batch is dropped, and counted, when
+        # the batch reaches it.
+        job.cancelled = True
+        if job.solver is not None:
+            job.solver.cancel()
+            return
+        queued = [entry for entry in self._heap if entry[2] is not job]
+        if len(queued) < len(self._heap):
+            self._heap = queued
+            heapq.heapify(self._heap)
+            del self._jobs[job.key]
+            self.stats["cancelled"] += 1
+
+    def _publish(self, job, event):
+        event = dict(event, job=job.id)
+        for events in job.subscribers:
+            events.put_nowait(event)
+
+    def _finish(self, job, event, record=None):
+        if event["event"] == "error":
+            self.stats["failed"] += 1
+        elif job.cancelled:
+            self.stats["cancelled"] += 1
+        else:
+            self.stats["completed"] += 1
+        self._publish(job, event)
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        if record is not None:
+            self._recent[job.key] = record
+            while len(self._recent) > self._recent_size:
+                self._recent.popitem(last=False)
+
+    def status(self):
+        return dict(self.stats, event="status", queued=len(self._heap), max_queue=self.max_queue)
+
+    # Workers
+
+    async def _next_batch(self):
+        async with self._ready:
+            await self._ready.wait_for(lambda: self._heap)
+            batch = [heapq.heappop(self._heap)[2]]
+            # Small jobs join while they are next in line at the same
+            # priority, so a batch never runs a job ahead of one that
+            # should go first.
+            if self._is_small(batch[0]):
+                while self._heap and len(batch) < self.batch_size:
+                    job = self._heap[0][2]
+                    if job.priority != batch[0].priority or not self._is_small(job):
+                        break
+                    batch.append(heapq.heappop(self._heap)[2])
+            return batch
+
+    def _is_small(self, job):
+        return job.instance.num_arcs <= self.batch_max_arcs
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            self.stats["batches"] += 1
+            self.stats["running"] += len(batch)
+            profile = "batch" if len(batch) > 1 else "interactive"
+            for job in batch:
+                self._publish(job, {"event": "started", "batch": len(batch)})
+            try:
+                await self._loop.run_in_executor(self._executor, self._run_batch, batch, profile)
+            finally:
+                self.stats["running"] -= len(batch)
+
+    def _run_batch(self, batch, profile):
+        # Runs on an executor thread; events go back through the loop.
+        loop = self._loop
+        for job in batch:
+            if job.cancelled:
+                loop.call_soon_threadsafe(self._drop, job)
+                continue
+
+            def progress(values, job=job):
+                loop.call_soon_threadsafe(self._publish, job, dict(values, event="progress"))
+
+            def incumbent(result, job=job):
+                loop.call_soon_threadsafe(self._publish, job, {
+                    "event": "incumbent", "solution": ProjectIO.solution_record(result)})
+
+            try:
+                job.solver = self.solver_factory(job.instance, job.backend, profile)
+                if job.cancelled:
+                    job.solver.cancel()
+                with instrumentation.span("server.solve", job=job.id, batch=len(batch)):
+                    solution = job.solver.solve(job.instance, progress=progress, incumbent=incumbent)
+            except Exception as e:
+                loop.call_soon_threadsafe(self._finish, job, {"event": "error",
+                                                              "message": f"{type(e).__name__}: {e}"})
+                continue
+            record = ProjectIO.solution_record(solution)
+            # Only an optimal solve is worth handing to the next identical
+            # submission.
+            loop.call_soon_threadsafe(self._finish, job, {"event": "result", "solution": record},
+                                      record if solution.is_optimal else None)
+
+    def _drop(self, job):
+        self.stats["cancelled"] += 1
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
@@ -0,0 +1,271 @@
+import time
+
+from Instrumentation import instrumentation
+from Sensitivity import Sensitivity
+from SolveProgress import SolveProgress
+from TransportHeuristics import preview_flows
+from TransportSolution import TransportSolution
+
+
+def heuristic_preview(instance, method, incumbent=None):
+    # Flows of a constructive heuristic, reported to incumbent as the first
+    # shipping plan; None when disabled or when it found no feasible plan.
+    if method is None:
+        return None
+    start = time.perf_counter()
+    with instrumentation.span("heuristic", method=method):
+        flows = preview_flows(instance, method)
+    if flows is not None and incumbent is not None:
+        incumbent(TransportSolution(instance, TransportSolution.FEASIBLE, float(instance.costs @ flows),
+                                    flows, "heuristic", time.perf_counter() - start))
+    return flows
+
+
+def solve_progress(instance, backend, progress=None, incumbent=None):
+    # A SolveProgress forwarding progress dicts, and intermediate solutions
+    # as TransportSolutions, or None when nobody is listening.
+    if progress is None and incumbent is None:
+        return None
+    on_solution = None
+    if incumbent is not None:
+        def on_solution(objective, flows):
+            incumbent(TransportSolution(instance, TransportSolution.FEASIBLE, objective, flows, backend))
+    return SolveProgress(progress, on_solution=on_solution)
+
+
+class SolverBackend:
+    name = None
+    label = None
+    # Flows per arc from a nearby solved instance, used as a starting point
+    # when the backend supports one.
+    warm_start = None
+    # Constructive heuristic run before the exact solve: it is reported as
+    # the first incumbent and seeds the solver. None skips it.
+    preview = "auto"
+    # Set by cancel() and kept until the solve it stops has ended: a cancel
+    # that arrives during the heuristic or the model build, or before
+    # solve() is even called, still stops the solve.
+    _cancelled = False
+
+    def solve(self, instance, progress=None, incumbent=None):
+        raise NotImplementedError
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _cancelled_solution(self, instance, start):
+        return TransportSolution(instance, TransportSolution.CANCELLED, backend=self.name,
+                                 runtime=time.perf_counter() - start)
+
+
+class GurobiBackend(SolverBackend):
+    name = "gurobi"
+    label = "Gurobi"
+
+    def __init__(self, env=None, pool=None, profile=None, sensitivity=False):
+        # Either a fixed environment, or an EnvPool to borrow one from for
+        # the duration of each solve. With sensitivity the LP relaxation is
+        # solved instead of the MIP; it is integral for transportation
+        # problems and yields duals and ranges.
+        self.env = env
+        self.pool = pool
+        self.profile = profile
+        self.sensitivity = sensitivity
+        self._model = None
+
+    def solve(self, instance, progress=None, incumbent=None):
+        try:
+            with instrumentation.span("solve", backend=self.name, arcs=instance.num_arcs):
+                if self._cancelled:
+                    return self._cancelled_solution(instance, time.perf_counter())
+                if self.pool is None:
+                    return self._solve(instance, progress, incumbent, self.env)
+                with instrumentation.span("env.acquire"):
+                    env = self.pool.acquire(self.profile)
+                try:
+                    return self._solve(instance, progress, incumbent, env)
+                finally:
+                    self.pool.release(env)
+        finally:
+            self._cancelled = False
+
+    def _start_model(self, model, instance, start):
+        # Publishes the model to cancel(), then returns a cancelled solution
+        # if a cancel came first; terminate() before optimize() is lost.
+        self._model = model
+        if not self._cancelled:
+            return None
+        self._model = None
+        model.dispose()
+        return self._cancelled_solution(instance, start)
+
+    def _solve(self, instance, progress, incumbent, env):
+        from gurobipy import GRB
+        from TransportModelBuilder import TransportModelBuilder
+
+        start = time.perf_counter()
+        preview = heuristic_preview(instance, self.preview, incumbent)
+        if self._cancelled:
+            return self._cancelled_solution(instance, start)
+        vtype = GRB.CONTINUOUS if self.sensitivity else GRB.INTEGER
+        with instrumentation.span("model.build"):
+            model, x, supply_constrs, demand_constrs = TransportModelBuilder(instance).build(
+                "Transport_Optimization", vtype, env)
+            model.update()
+        cancelled = self._start_model(model, instance, start)
+        if cancelled is not None:
+            return cancelled
+        initial = self.warm_start if self.warm_start is not None else preview
+        if initial is not None:
+            if self.sensitivity:
+                x.PStart = initial
+            else:
+                x.Start = initial
+        reporter = solve_progress(instance, self.name, progress, incumbent)
+        with instrumentation.span("optimize") as span:
+            if reporter is not None:
+                model.optimize(reporter.gurobi_callback(x))
+            else:
+                model.optimize()
+            instrumentation.record_gurobi(span, model)
+        self._model = None
+        status = TransportSolution.status_from_gurobi(model.status)
+        if status == TransportSolution.OPTIMAL:
+            solution = TransportSolution(instance, status, model.objVal, x.X, self.name)
+            if self.sensitivity:
+                solution.sensitivity = Sensitivity.from_gurobi(
+                    solution, model, x.tolist(), supply_constrs.tolist(), demand_constrs.tolist())
+        else:
+            solution = TransportSolution(instance, status, backend=self.name)
+        solution.runtime = time.perf_counter() - start
+        model.dispose()
+        return solution
+
+    def cancel(self):
+        super().cancel()
+        model = self._model
+        if model is not None:
+            model.terminate()
+
+
+class NativeBackend(SolverBackend):
+    name = "native"
+    label = "Transportation simplex"
+
+    def __init__(self, initial="auto"):
+        self.initial = initial
+        self._engine = None
+
+    def solve(self, instance, progress=None, incumbent=None):
+        from TransportSimplex import TransportSimplex
+
+        start = time.perf_counter()
+        try:
+            with instrumentation.span("solve", backend=self.name, arcs=instance.num_arcs):
+                preview = None if self._cancelled else heuristic_preview(instance, self.preview, incumbent)
+                initial = self.warm_start if self.warm_start is not None else preview
+                self._engine = engine = TransportSimplex(instance, self.initial, start=initial)
+                engine.progress = solve_progress(instance, self.name, progress, incumbent)
+                # Checked after publishing the engine, so a cancel either
+                # sees the engine or is seen here.
+                if self._cancelled:
+                    return self._cancelled_solution(instance, start)
+                with instrumentation.span("optimize") as span:
+                    status, objective, flows = engine.solve()
+                    span.set(iterations=engine.iterations)
+                instrumentation.count("native.iterations", engine.iterations)
+        finally:
+            self._engine = None
+            self._cancelled = False
+        solution = TransportSolution(instance, status, objective, flows, self.name)
+        if solution.is_optimal:
+            solution.sensitivity = Sensitivity.from_potentials(solution, engine.u, engine.v)
+        solution.runtime = time.perf_counter() - start
+        return solution
+
+    def cancel(self):
+        super().cancel()
+        engine = self._engine
+        if engine is not None:
+            engine.cancelled = True
+
+
+class GurobiNetworkBackend(GurobiBackend):
+    # Min-cost flow over a NetworkInstance with hubs and arc capacities.
+
+    def __init__(self, env=None, pool=None, profile=None):
+        super().__init__(env, pool, profile)
+
+    def _solve(self, network, progress, incumbent, env):
+        from NetworkModelBuilder import NetworkModelBuilder
+
+        start = time.perf_counter()
+        with instrumentation.span("model.build"):
+            model, x, _ = NetworkModelBuilder(network).build(env=env)
+            model.update()
+        cancelled = self._start_model(model, network, start)
+        if cancelled is not None:
+            return cancelled
+        reporter = solve_progress(network, self.name, progress, incumbent)
+        with instrumentation.span("optimize") as span:
+            if reporter is not None:
+                model.optimize(reporter.gurobi_callback())
+            else:
+                model.optimize()
+            instrumentation.record_gurobi(span, model)
+        self._model = None
+        status = TransportSolution.status_from_gurobi(model.status)
+        if status == TransportSolution.OPTIMAL:
+            solution = TransportSolution(network, status, model.objVal, x.X, self.name)
+        else:
+            solution = TransportSolution(network, status, backend=self.name)
+        solution.runtime = time.perf_counter() - start
+        model.dispose()
+        return solution
+
+
+class NativeNetworkBackend(SolverBackend):
+    name = "native"
+    label = "Successive shortest paths"
+
+    def __init__(self):
+        self._engine = None
+
+    def solve(self, network, progress=None, incumbent=None):
+        from MinCostFlow import MinCostFlow
+
+        start = time.perf_counter()
+        try:
+            with instrumentation.span("solve", backend=self.name, arcs=network.num_arcs):
+                self._engine = engine = MinCostFlow(network)
+                engine.progress = solve_progress(network, self.name, progress)
+                if self._cancelled:
+                    return self._cancelled_solution(network, start)
+                with instrumentation.span("optimize") as span:
+                    status, objective, flows = engine.solve()
+                    span.set(iterations=engine.iterations)
+                instrumentation.count("native.augmentations", engine.iterations)
+        finally:
+            self._engine = None
+            self._cancelled = False
+        return TransportSolution(network, status, objective, flows, self.name,
+                                 time.perf_counter() - start)
+
+    def cancel(self):
+        super().cancel()
+        engine = self._engine
+        if engine is not None:
+            engine.cancelled = True
+
+
+BACKENDS = {backend.name: backend for backend in (GurobiBackend, NativeBackend)}
+# Backends for networks with hubs, under the same names.
+NETWORK_BACKENDS = {backend.name: backend for backend in (GurobiNetworkBackend, NativeNetworkBackend)}
+
+
+def get_backend(name, network=False, **kwargs):
+    try:
+        backend = (NETWORK_BACKENDS if network else BACKENDS)[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver backend: {name}")
+    return backend(**kwargs)
@@ -0,0 +1,256 @@
+import threading
+import time
+
+import numpy as np
+from gurobipy import Column, GRB, LinExpr, Model
+
+from Instrumentation import instrumentation
+from Sensitivity import Sensitivity
+from SolverBackend import heuristic_preview, solve_progress
+from TransportInstance import TransportInstance
+from TransportModelBuilder import TransportModelBuilder
+from TransportSolution import TransportSolution
+
+
+class SolverSession:
+    name = "gurobi"
+    preview = "auto"
+    # "off", "duals" for shadow prices and reduced costs only, or "full"
+    # to add Gurobi's cost and right-hand side ranges, which cost far more.
+    sensitivity = "off"
+
+    # How long a solve waits for an environment from the pool.
+    acquire_timeout = 30.0
+
+    def __init__(self, name="Transport_Optimization", env=None, pool=None):
+        # With a pool the environment is taken by the first solve, on the
+        # thread that runs it, and handed back by close().
+        self.env = env
+        self.pool = pool
+        self.model_name = name
+        self.model = None
+        if pool is None:
+            self._create_model()
+        self.supply_constrs = {}
+        self.demand_constrs = {}
+        self.arc_index = {}
+        self.arc_vars = []
+        # The instance the model solves, kept as arrays and edited in place:
+        # warehouses and clients in the order they were added, and arc k
+        # from rows[k] to cols[k] at costs[k] in buffers that grow by
+        # doubling, as are supplies and demands. instance() snapshots them,
+        # and the snapshot is reused until the next edit.
+        self.warehouse_index = {}
+        self.client_index = {}
+        self.supplies = np.zeros(16)
+        self.demands = np.zeros(16)
+        self.arc_rows = np.zeros(16, dtype=np.int64)
+        self.arc_cols = np.zeros(16, dtype=np.int64)
+        self.arc_costs = np.zeros(16)
+        self._instance = None
+        self._stale_constrs = False
+        self._has_basis = False
+        self._cancelled = False
+        # Edits may arrive from the UI thread while a worker is inside
+        # optimize(); they are queued and replayed before the next solve.
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def _create_model(self):
+        self.model = Model(self.model_name, env=self.env) if self.env is not None else Model(self.model_name)
+        self.model.ModelSense = GRB.MINIMIZE
+
+    @classmethod
+    def from_dicts(cls, warehouses, clients, cost, **kwargs):
+        session = cls(**kwargs)
+        session.load(TransportInstance.from_dicts(warehouses, clients, cost))
+        return session
+
+    def load(self, instance):
+        with self._lock:
+            self._pending.append((self._load, instance))
+
+    def set_warehouse(self, name, capacity):
+        with self._lock:
+            self._pending.append((self._set_warehouse, name, capacity))
+
+    def set_client(self, name, demand):
+        with self._lock:
+            self._pending.append((self._set_client, name, demand))
+
+    def set_cost(self, warehouse, client, cost):
+        with self._lock:
+            self._pending.append((self._set_cost, warehouse, client, cost))
+
+    def _apply_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for op, *args in pending:
+            op(*args)
+
+    def _load(self, instance):
+        if self.warehouse_index or self.client_index:
+            # Into a model that already has rows, one edit at a time.
+            for w, capacity in zip(instance.warehouse_names, instance.supplies.tolist()):
+                self._set_warehouse(w, capacity)
+            for c, demand in zip(instance.client_names, instance.demands.tolist()):
+                self._set_client(c, demand)
+            for k, cost in enumerate(instance.costs.tolist()):
+                self._set_cost(*instance.arc_key(k), cost)
+            return
+        # The first build goes in as one batch of matrix rows; a column per
+        # arc is far slower and only pays off for later edits.
+        x, supply_constrs, demand_constrs = TransportModelBuilder(instance).add_to(self.model, GRB.CONTINUOUS)
+        self._stale_constrs = True
+        self.arc_vars = x.tolist()
+        self.supply_constrs = dict(zip(instance.warehouse_names, supply_constrs.tolist()))
+        self.demand_constrs = dict(zip(instance.client_names, demand_constrs.tolist()))
+        self.warehouse_index = {w: i for i, w in enumerate(instance.warehouse_names)}
+        self.client_index = {c: j for j, c in enumerate(instance.client_names)}
+        self.arc_index = {instance.arc_key(k): k for k in range(instance.num_arcs)}
+        self.supplies = _with_room(instance.supplies)
+        self.demands = _with_room(instance.demands)
+        self.arc_rows = _with_room(instance.rows)
+        self.arc_cols = _with_room(instance.cols)
+        self.arc_costs = _with_room(instance.costs)
+        self._instance = None
+
+    def _set_warehouse(self, name, capacity):
+        i = self.warehouse_index.get(name)
+        if i is not None:
+            self.supply_constrs[name].RHS = capacity
+            self.supplies[i] = capacity
+        else:
+            self.supply_constrs[name] = self.model.addLConstr(
+                LinExpr(), GRB.LESS_EQUAL, capacity, name=f"Supply_{name}")
+            self._stale_constrs = True
+            i = len(self.warehouse_index)
+            if i == len(self.supplies):
+                self.supplies = np.resize(self.supplies, 2 * i)
+            self.warehouse_index[name] = i
+            self.supplies[i] = capacity
+        self._instance = None
+
+    def _set_client(self, name, demand):
+        j = self.client_index.get(name)
+        if j is not None:
+            self.demand_constrs[name].RHS = demand
+            self.demands[j] = demand
+        else:
+            self.demand_constrs[name] = self.model.addLConstr(
+                LinExpr(), GRB.GREATER_EQUAL, demand, name=f"Demand_{name}")
+            self._stale_constrs = True
+            j = len(self.client_index)
+            if j == len(self.demands):
+                self.demands = np.resize(self.demands, 2 * j)
+            self.client_index[name] = j
+            self.demands[j] = demand
+        self._instance = None
+
+    def _set_cost(self, warehouse, client, cost):
+        if warehouse not in self.supply_constrs or client not in self.demand_constrs:
+            return
+        k = self.arc_index.get((warehouse, client))
+        self._instance = None
+        if k is not None:
+            self.arc_vars[k].Obj = cost
+            self.arc_costs[k] = cost
+            return
+        if self._stale_constrs:
+            # A column can only reference constraints Gurobi has already
+            # materialised, so flush pending rows once before adding it.
+            self.model.update()
+            self._stale_constrs = False
+        column = Column([1.0, 1.0], [self.supply_constrs[warehouse], self.demand_constrs[client]])
+        k = len(self.arc_vars)
+        if k == len(self.arc_costs):
+            self.arc_rows = np.resize(self.arc_rows, 2 * k)
+            self.arc_cols = np.resize(self.arc_cols, 2 * k)
+            self.arc_costs = np.resize(self.arc_costs, 2 * k)
+        self.arc_index[(warehouse, client)] = k
+        self.arc_vars.append(self.model.addVar(lb=0, obj=cost, column=column))
+        self.arc_rows[k] = self.warehouse_index[warehouse]
+        self.arc_cols[k] = self.client_index[client]
+        self.arc_costs[k] = cost
+
+    def instance(self):
+        # Costs, supplies and demands change in place, so the snapshot
+        # copies them; rows and columns are only ever appended to.
+        if self._instance is None:
+            k = len(self.arc_vars)
+            self._instance = TransportInstance(self.warehouse_index, self.supplies[:len(self.warehouse_index)].copy(),
+                                               self.client_index, self.demands[:len(self.client_index)].copy(),
+                                               self.arc_rows[:k], self.arc_cols[:k], self.arc_costs[:k].copy())
+        return self._instance
+
+    def solve(self, progress=None, incumbent=None):
+        # The variables are continuous: the transportation constraint
+        # matrix is totally unimodular, so simplex lands on an integral
+        # vertex, and an LP keeps its basis across edits for a warm start.
+        start = time.perf_counter()
+        try:
+            with instrumentation.span("solve", backend=self.name, arcs=len(self.arc_vars)):
+                return self._solve(start, progress, incumbent)
+        finally:
+            self._cancelled = False
+
+    def _solve(self, start, progress, incumbent):
+        if self.model is None:
+            with instrumentation.span("env.acquire"):
+                self.env = self.pool.acquire(timeout=self.acquire_timeout)
+            self._create_model()
+        with instrumentation.span("model.update"):
+            self._apply_pending()
+            self.model.update()
+        instance = self.instance()
+        if not self._has_basis:
+            # Until a first solve leaves a basis behind, seed simplex with
+            # the heuristic plan; later solves warm-start from the basis.
+            flows = heuristic_preview(instance, self.preview, incumbent)
+            if flows is not None and self.arc_vars:
+                self.model.update()
+                self.model.setAttr("PStart", self.arc_vars, flows.tolist())
+        if self._cancelled:
+            # terminate() only reaches a running optimize().
+            return TransportSolution(instance, TransportSolution.CANCELLED, backend=self.name,
+                                     runtime=time.perf_counter() - start)
+        reporter = solve_progress(instance, self.name, progress, incumbent)
+        with instrumentation.span("optimize") as span:
+            if reporter is not None:
+                self.model.optimize(reporter.gurobi_callback())
+            else:
+                self.model.optimize()
+            instrumentation.record_gurobi(span, self.model)
+        status = TransportSolution.status_from_gurobi(self.model.status)
+        if status == TransportSolution.OPTIMAL:
+            flows = self.model.getAttr("X", self.arc_vars) if self.arc_vars else []
+            solution = TransportSolution(instance, status, self.model.objVal, flows, self.name)
+            if self.sensitivity != "off":
+                solution.sensitivity = Sensitivity.from_gurobi(
+                    solution, self.model, self.arc_vars, list(self.supply_constrs.values()),
+                    list(self.demand_constrs.values()), ranges=self.sensitivity == "full")
+            self._has_basis = True
+        else:
+            solution = TransportSolution(instance, status, backend=self.name)
+        solution.runtime = time.perf_counter() - start
+        return solution
+
+    def cancel(self):
+        self._cancelled = True
+        model = self.model
+        if model is not None:
+            model.terminate()
+
+    def close(self):
+        if self.model is not None:
+            self.model.dispose()
+            self.model = None
+        if self.pool is not None and self.env is not None:
+            self.pool.release(self.env)
+            self.env = None
+
+
+def _with_room(values):
+    # A copy with spare room, so the first edits after a load append in place.
+    values = np.array(values)
+    return np.resize(values, max(16, 2 * len(values)))
@@ -0,0 +1,202 @@
+import time
+
+import numpy as np
+
+from Instrumentation import instrumentation
+from TransportSolution import TransportSolution
+
+DISTRIBUTIONS = ("normal", "lognormal", "poisson", "uniform")
+
+
+def sample_demands(mean, count, distribution="normal", spread=0.2, seed=0):
+    # count scenarios (count x clients) of demand around mean. spread is
+    # the coefficient of variation, except for Poisson demand, whose
+    # variance equals its mean. Negative draws are cut to zero.
+    rng = np.random.default_rng(seed)
+    mean = np.asarray(mean, dtype=np.float64)
+    shape = (count, len(mean))
+    if distribution == "normal":
+        draws = rng.normal(mean, spread * mean, shape)
+    elif distribution == "lognormal":
+        sigma = np.sqrt(np.log1p(spread ** 2))
+        draws = mean * rng.lognormal(-sigma ** 2 / 2, sigma, shape)
+    elif distribution == "poisson":
+        draws = rng.poisson(mean, shape).astype(np.float64)
+    elif distribution == "uniform":
+        half = np.sqrt(3.0) * spread * mean
+        draws = rng.uniform(mean - half, mean + half, shape)
+    else:
+        raise ValueError(f"Unknown demand distribution: {distribution}; use one of {', '.join(DISTRIBUTIONS)}")
+    return np.maximum(draws, 0.0)
+
+
+class CostDistribution:
+    def __init__(self, costs, shipping, shortage, surplus, demand):
+        # Per scenario: total cost, and the units short of and beyond each
+        # scenario's total demand. shipping is the same in every scenario.
+        self.costs = costs
+        self.shipping = shipping
+        self.shortage = shortage
+        self.surplus = surplus
+        self.demand = demand
+
+    @property
+    def num_scenarios(self):
+        return len(self.costs)
+
+    @property
+    def mean(self):
+        return float(self.costs.mean())
+
+    def quantile(self, q):
+        return float(np.quantile(self.costs, q))
+
+    def cvar(self, alpha=0.95):
+        # Mean cost of the worst 1 - alpha share of scenarios.
+        tail = np.sort(self.costs)[int(np.floor(alpha * self.num_scenarios)):]
+        return float(tail.mean()) if len(tail) else self.quantile(1.0)
+
+    def summary(self):
+        served = 1.0 - self.shortage / np.maximum(self.demand, 1e-12)
+        return {
+            "scenarios": self.num_scenarios,
+            "mean": self.mean,
+            "std": float(self.costs.std()),
+            "min": float(self.costs.min()),
+            "p05": self.quantile(0.05),
+            "median": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": float(self.costs.max()),
+            "cvar95": self.cvar(0.95),
+            "shipping": self.shipping,
+            "mean_shortage": float(self.shortage.mean()),
+            "stockout_probability": float((self.shortage > 1e-9).mean()),
+            "mean_fill_rate": float(served.mean()),
+        }
+
+
+class StochasticTransport:
+    def __init__(self, instance, scenarios, shortage_penalty, surplus_cost=0.0, probabilities=None,
+                 pool=None, env=None):
+        # Two-stage sample-average approximation. Shipments are fixed before
+        # demand is known; once a scenario's demand (a row of scenarios, S x
+        # clients) is seen, every unit short costs shortage_penalty and
+        # every unit delivered beyond demand surplus_cost (scalars or one
+        # value per client). The instance's own demands are ignored.
+        self.instance = instance
+        self.scenarios = np.atleast_2d(np.asarray(scenarios, dtype=np.float64))
+        n = instance.num_clients
+        self.shortage_penalty = np.broadcast_to(np.asarray(shortage_penalty, dtype=np.float64), (n,))
+        self.surplus_cost = np.broadcast_to(np.asarray(surplus_cost, dtype=np.float64), (n,))
+        count = len(self.scenarios)
+        self.probabilities = (np.full(count, 1.0 / count) if probabilities is None
+                              else np.asarray(probabilities, dtype=np.float64))
+        if self.scenarios.shape[1] != n or len(self.probabilities) != count:
+            raise ValueError("Scenarios need one column per client and one probability per row")
+        self.pool = pool
+        self.env = env
+        self.model = None
+
+    @property
+    def num_scenarios(self):
+        return len(self.scenarios)
+
+    def build(self, name="Stochastic_Transport", env=None):
+        # Variables in one vector: shipments x (arcs), deliveries y
+        # (clients), then shortage u and, with a surplus cost, surplus o,
+        # both scenario-major (S x clients). The constraint matrix is
+        # assembled in one go from sparse blocks:
+        #   supply       x summed per warehouse      <= supplies
+        #   delivery     x summed per client - y      = 0
+        #   shortage     y + u_s                     >= d_s
+        #   surplus      o_s - y                     >= -d_s
+        # Loaded here so that importing the module for DISTRIBUTIONS stays
+        # as cheap as the command line needs.
+        import scipy.sparse as sp
+        from gurobipy import Model, GRB
+        from TransportModelBuilder import TransportModelBuilder
+
+        inst = self.instance
+        a, n, count = inst.num_arcs, inst.num_clients, self.num_scenarios
+        with_surplus = bool(np.any(self.surplus_cost))
+        weights = self.probabilities[:, None]
+        objective = [inst.costs, np.zeros(n), (weights * self.shortage_penalty).ravel()]
+        if with_surplus:
+            objective.append((weights * self.surplus_cost).ravel())
+        objective = np.concatenate(objective)
+
+        supply, delivery = TransportModelBuilder(inst).incidence_matrices()
+        stacked = sp.kron(np.ones((count, 1)), sp.identity(n), format="csr")
+        recourse = sp.identity(count * n, format="csr")
+        blocks = [[supply, None, None], [delivery, -sp.identity(n), None], [None, stacked, recourse]]
+        rhs = [inst.supplies, np.zeros(n), self.scenarios.ravel()]
+        senses = [GRB.LESS_EQUAL, GRB.EQUAL, GRB.GREATER_EQUAL]
+        rows = [inst.num_warehouses, n, count * n]
+        if with_surplus:
+            for row in blocks:
+                row.append(None)
+            blocks.append([None, -stacked, None, recourse])
+            rhs.append(-self.scenarios.ravel())
+            senses.append(GRB.GREATER_EQUAL)
+            rows.append(count * n)
+        matrix = sp.bmat(blocks, format="csr")
+
+        model = Model(name, env=env) if env is not None else Model(name)
+        z = model.addMVar(len(objective), lb=0, obj=objective)
+        model.ModelSense = GRB.MINIMIZE
+        model.addMConstr(matrix, z, np.repeat(senses, rows), np.concatenate(rhs))
+        self.model = model
+        return model, z[:a]
+
+    def solve(self):
+        # The first-stage plan as a solution of the instance; its objective
+        # is the expected cost over the scenarios.
+        start = time.perf_counter()
+        with instrumentation.span("stochastic.solve", scenarios=self.num_scenarios):
+            if self.env is None and self.pool is not None:
+                with self.pool.env() as env:
+                    solution = self._solve(env)
+            else:
+                solution = self._solve(self.env)
+        solution.runtime = time.perf_counter() - start
+        return solution
+
+    def _solve(self, env):
+        with instrumentation.span("model.build"):
+            model, x = self.build(env=env)
+        try:
+            with instrumentation.span("optimize") as span:
+                model.optimize()
+                instrumentation.record_gurobi(span, model)
+            status = TransportSolution.status_from_gurobi(model.status)
+            if status != TransportSolution.OPTIMAL:
+                return TransportSolution(self.instance, status, backend="gurobi")
+            return TransportSolution(self.instance, status, model.objVal, x.X, "gurobi")
+        finally:
+            model.dispose()
+            self.model = None
+
+    def cancel(self):
+        model = self.model
+        if model is not None:
+            model.terminate()
+
+    def evaluate(self, flows, scenarios=None, chunk_rows=4096):
+        # Cost of a fixed plan in every scenario (default: the model's own),
+        # a block of scenario rows at a time.
+        inst = self.instance
+        scenarios = self.scenarios if scenarios is None else np.atleast_2d(scenarios)
+        flows = np.asarray(flows, dtype=np.float64)
+        delivered = np.bincount(inst.cols, flows, inst.num_clients)
+        shipping = float(inst.costs @ flows)
+        count = len(scenarios)
+        costs, shortage, surplus = np.empty(count), np.empty(count), np.empty(count)
+        with instrumentation.span("stochastic.evaluate", scenarios=count):
+            for low in range(0, count, chunk_rows):
+                demand = scenarios[low:low + chunk_rows]
+                short = np.maximum(demand - delivered, 0.0)
+                over = np.maximum(delivered - demand, 0.0)
+                costs[low:low + len(demand)] = shipping + short @ self.shortage_penalty + over @ self.surplus_cost
+                shortage[low:low + len(demand)] = short.sum(axis=1)
+                surplus[low:low + len(demand)] = over.sum(axis=1)
+        return CostDistribution(costs, shipping, shortage, surplus, scenarios.sum(axis=1))
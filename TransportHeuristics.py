@@ -0,0 +1,158 @@
+import numpy as np
+
+VOGEL_MAX_CELLS = 40_000
+
+
+def least_cost(cost, supply, demand, tol=1e-9):
+    cost = np.asarray(cost, dtype=np.float64)
+    s = np.array(supply, dtype=np.float64)
+    d = np.array(demand, dtype=np.float64)
+    n = cost.shape[1]
+    remaining = min(s.sum(), d.sum())
+    rows, cols, flows = [], [], []
+    for flat in np.argsort(cost, axis=None, kind="stable"):
+        if remaining <= tol:
+            break
+        i, j = divmod(int(flat), n)
+        if s[i] <= tol or d[j] <= tol:
+            continue
+        qty = min(s[i], d[j])
+        rows.append(i)
+        cols.append(j)
+        flows.append(qty)
+        s[i] -= qty
+        d[j] -= qty
+        remaining -= qty
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(flows)
+
+
+def vogel(cost, supply, demand, tol=1e-9):
+    cost = np.asarray(cost, dtype=np.float64)
+    s = np.array(supply, dtype=np.float64)
+    d = np.array(demand, dtype=np.float64)
+    row_alive = s > tol
+    col_alive = d > tol
+    rows, cols, flows = [], [], []
+
+    def allocate(i, j):
+        qty = min(s[i], d[j])
+        rows.append(i)
+        cols.append(j)
+        flows.append(qty)
+        s[i] -= qty
+        d[j] -= qty
+        if s[i] <= tol:
+            row_alive[i] = False
+        if d[j] <= tol:
+            col_alive[j] = False
+
+    while row_alive.any() and col_alive.any():
+        alive_rows = np.flatnonzero(row_alive)
+        alive_cols = np.flatnonzero(col_alive)
+        sub = cost[np.ix_(alive_rows, alive_cols)]
+        if len(alive_rows) == 1 or len(alive_cols) == 1:
+            # Only one line left: the remaining allocations are forced,
+            # cheapest first.
+            for flat in np.argsort(sub, axis=None, kind="stable"):
+                i_loc, j_loc = divmod(int(flat), len(alive_cols))
+                i, j = alive_rows[i_loc], alive_cols[j_loc]
+                if s[i] > tol and d[j] > tol:
+                    allocate(i, j)
+            break
+        # Penalty of a line = gap between its two cheapest cells.
+        row_two = np.partition(sub, 1, axis=1)[:, :2]
+        col_two = np.partition(sub, 1, axis=0)[:2, :]
+        row_penalty = row_two[:, 1] - row_two[:, 0]
+        col_penalty = col_two[1] - col_two[0]
+        r = int(np.argmax(row_penalty))
+        c = int(np.argmax(col_penalty))
+        if row_penalty[r] >= col_penalty[c]:
+            i_loc, j_loc = r, int(np.argmin(sub[r]))
+        else:
+            i_loc, j_loc = int(np.argmin(sub[:, c])), c
+        allocate(alive_rows[i_loc], alive_cols[j_loc])
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(flows)
+
+
+def north_west_corner(supply, demand, tol=1e-9):
+    # Each allocation covers the overlap of one warehouse's and one
+    # client's slice of the cumulative supply/demand line, so the whole
+    # allocation falls out of two cumsums without a loop.
+    s_cum = np.cumsum(np.asarray(supply, dtype=np.float64))
+    d_cum = np.cumsum(np.asarray(demand, dtype=np.float64))
+    if not len(s_cum) or not len(d_cum):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    total = min(s_cum[-1], d_cum[-1])
+    points = np.unique(np.concatenate([[0.0], s_cum[s_cum < total], d_cum[d_cum < total], [total]]))
+    lows, qty = points[:-1], np.diff(points)
+    keep = qty > tol
+    rows = np.searchsorted(s_cum, lows[keep], side="right")
+    cols = np.searchsorted(d_cum, lows[keep], side="right")
+    return rows.astype(np.int64), cols.astype(np.int64), qty[keep]
+
+
+def least_cost_arcs(rows, cols, costs, supply, demand, tol=1e-9, chunk=4096):
+    # Least-cost rule over a sparse arc list; returns arc indices and flows.
+    # Arcs are visited in cost order a chunk at a time, and arcs whose
+    # warehouse or client is already exhausted are masked out per chunk.
+    s = np.array(supply, dtype=np.float64)
+    d = np.array(demand, dtype=np.float64)
+    remaining = min(s.sum(), d.sum())
+    order = np.argsort(costs, kind="stable")
+    arcs, flows = [], []
+    for low in range(0, len(order), chunk):
+        if remaining <= tol:
+            break
+        block = order[low:low + chunk]
+        block = block[(s[rows[block]] > tol) & (d[cols[block]] > tol)]
+        for k, i, j in zip(block.tolist(), rows[block].tolist(), cols[block].tolist()):
+            if s[i] <= tol or d[j] <= tol:
+                continue
+            qty = min(s[i], d[j])
+            arcs.append(k)
+            flows.append(qty)
+            s[i] -= qty
+            d[j] -= qty
+            remaining -= qty
+            if remaining <= tol:
+                break
+    return np.array(arcs, dtype=np.int64), np.array(flows)
+
+
+def preview_flows(instance, method="auto", tol=1e-9):
+    # Per-arc flows from a constructive heuristic, or None when it could
+    # not meet every demand over the lanes that exist.
+    inst = instance
+    m, n = inst.num_warehouses, inst.num_clients
+    if method == "auto":
+        method = "vogel" if m * n <= VOGEL_MAX_CELLS else "least_cost"
+    flows = np.zeros(inst.num_arcs)
+    if method == "least_cost":
+        arcs, qty = least_cost_arcs(inst.rows, inst.cols, inst.costs, inst.supplies, inst.demands, tol)
+        flows[arcs] = qty
+    else:
+        if method == "vogel":
+            # Vogel's penalties assume a balanced problem: spare supply goes
+            # to a zero-cost dummy client whose allocations are dropped.
+            excess = max(inst.supplies.sum() - inst.demands.sum(), 0.0)
+            max_cost = inst.costs.max() if inst.num_arcs else 0.0
+            cost = np.full((m, n + 1), (abs(max_cost) + 1.0) * (inst.demands.sum() + 1.0))
+            cost[:, n] = 0.0
+            cost[inst.rows, inst.cols] = inst.costs
+            rows, cols, qty = vogel(cost, inst.supplies, np.append(inst.demands, excess), tol)
+            real = cols < n
+            rows, cols, qty = rows[real], cols[real], qty[real]
+        elif method == "north_west":
+            rows, cols, qty = north_west_corner(inst.supplies, inst.demands, tol)
+        else:
+            raise ValueError(f"Unknown heuristic: {method}")
+        arc_of = np.full((m, n), -1, dtype=np.int64)
+        arc_of[inst.rows, inst.cols] = np.arange(inst.num_arcs)
+        arcs = arc_of[rows, cols]
+        if (arcs < 0).any():
+            return None
+        np.add.at(flows, arcs, qty)
+    received = np.bincount(inst.cols, flows, minlength=n)
+    if (np.abs(received - inst.demands) > tol * max(1.0, inst.demands.sum())).any():
+        return None
+    return flows
@@ -0,0 +1,57 @@
+from math import isfinite
+
+import numpy as np
+
+
+class TransportInstance:
+    def __init__(self, warehouse_names, supplies, client_names, demands, rows, cols, costs):
+        self.warehouse_names = list(warehouse_names)
+        self.client_names = list(client_names)
+        self.supplies = np.asarray(supplies, dtype=np.float64)
+        self.demands = np.asarray(demands, dtype=np.float64)
+        # Arcs are stored as parallel index arrays: arc k goes from
+        # warehouse rows[k] to client cols[k] at unit cost costs[k].
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.costs = np.asarray(costs, dtype=np.float64)
+
+    @classmethod
+    def from_dicts(cls, warehouses, clients, cost):
+        w_index = {w: i for i, w in enumerate(warehouses)}
+        c_index = {c: j for j, c in enumerate(clients)}
+        arcs = [(w_index[w], c_index[c], value) for (w, c), value in cost.items()
+                if w in w_index and c in c_index and isfinite(value)]
+        if arcs:
+            rows, cols, costs = zip(*arcs)
+        else:
+            rows, cols, costs = (), (), ()
+        return cls(warehouses.keys(), list(warehouses.values()),
+                   clients.keys(), list(clients.values()),
+                   rows, cols, costs)
+
+    @classmethod
+    def from_dense(cls, warehouse_names, supplies, client_names, demands, cost_matrix):
+        cost_matrix = np.asarray(cost_matrix, dtype=np.float64)
+        rows, cols = np.nonzero(np.isfinite(cost_matrix))
+        return cls(warehouse_names, supplies, client_names, demands,
+                   rows, cols, cost_matrix[rows, cols])
+
+    @property
+    def num_warehouses(self):
+        return len(self.warehouse_names)
+
+    @property
+    def num_clients(self):
+        return len(self.client_names)
+
+    @property
+    def num_arcs(self):
+        return len(self.costs)
+
+    def arc_key(self, k):
+        return self.warehouse_names[self.rows[k]], self.client_names[self.cols[k]]
+
+    def solution_from_flows(self, flows, tol=1e-9):
+        flows = np.asarray(flows, dtype=np.float64)
+        active = np.flatnonzero(flows > tol)
+        return {self.arc_key(k): float(flows[k]) for k in active}
@@ -0,0 +1,38 @@
+import numpy as np
+import scipy.sparse as sp
+from gurobipy import Model, GRB
+
+
+class TransportModelBuilder:
+    def __init__(self, instance):
+        self.instance = instance
+
+    def incidence_matrices(self):
+        inst = self.instance
+        arcs = np.arange(inst.num_arcs)
+        ones = np.ones(inst.num_arcs)
+        supply = sp.csr_matrix((ones, (inst.rows, arcs)),
+                               shape=(inst.num_warehouses, inst.num_arcs))
+        demand = sp.csr_matrix((ones, (inst.cols, arcs)),
+                               shape=(inst.num_clients, inst.num_arcs))
+        return supply, demand
+
+    def build(self, name="Transport_Optimization", vtype=GRB.INTEGER, env=None):
+        model = Model(name, env=env) if env is not None else Model(name)
+        model.ModelSense = GRB.MINIMIZE
+        return (model, *self.add_to(model, vtype))
+
+    def add_to(self, model, vtype=GRB.INTEGER):
+        inst = self.instance
+        # Only arcs with a finite cost get a variable; a missing lane is
+        # simply absent from the model instead of being a free shipment.
+        x = model.addMVar(inst.num_arcs, lb=0, vtype=vtype, obj=inst.costs)
+
+        supply, demand = self.incidence_matrices()
+        supply_constrs = model.addMConstr(
+            supply, x, GRB.LESS_EQUAL, inst.supplies,
+            name=[f"Supply_{w}" for w in inst.warehouse_names])
+        demand_constrs = model.addMConstr(
+            demand, x, GRB.GREATER_EQUAL, inst.demands,
+            name=[f"Demand_{c}" for c in inst.client_names])
+        return x, supply_constrs, demand_constrs
@@ -0,0 +1,298 @@
+import numpy as np
+
+from TransportHeuristics import VOGEL_MAX_CELLS, least_cost, vogel
+from TransportSolution import TransportSolution
+
+
+class TransportSimplex:
+    VOGEL_MAX_CELLS = VOGEL_MAX_CELLS
+    PRICING_BLOCK_CELLS = 65_536
+
+    def __init__(self, instance, initial="auto", max_iterations=None, tol=1e-9, start=None):
+        self.instance = instance
+        self.initial = initial
+        self.start = start
+        self.max_iterations = max_iterations
+        self.tol = tol
+        self.iterations = 0
+        self.progress = None
+        self.cancelled = False
+        self.u = None
+        self.v = None
+
+    def solve(self):
+        inst = self.instance
+        m, n = inst.num_warehouses, inst.num_clients
+        flows = np.zeros(inst.num_arcs)
+        total_supply = inst.supplies.sum()
+        total_demand = inst.demands.sum()
+        if total_demand <= self.tol:
+            self.u, self.v = np.zeros(m), np.zeros(n)
+            return TransportSolution.OPTIMAL, 0.0, flows
+        if total_supply < total_demand - self.tol:
+            return TransportSolution.INFEASIBLE, None, flows
+
+        # Balance the problem with a zero-cost dummy client that absorbs
+        # spare capacity, and give missing lanes a prohibitive cost: any
+        # optimal basis that still ships on one proves infeasibility.
+        excess = total_supply - total_demand
+        width = n + 1 if excess > self.tol else n
+        max_cost = inst.costs.max() if inst.num_arcs else 0.0
+        big_m = (abs(max_cost) + 1.0) * (total_demand + 1.0)
+        cost = np.full((m, width), big_m)
+        if width > n:
+            cost[:, n] = 0.0
+        np.minimum.at(cost, (inst.rows, inst.cols), inst.costs)
+        demand = inst.demands if width == n else np.append(inst.demands, excess)
+
+        self._tol = self.tol * max(1.0, big_m)
+        # A cell with several lanes is priced at its cheapest one, so flow
+        # goes back onto that lane: writing dearest first lets it win.
+        self._arc_of = np.full((m, width), -1, dtype=np.int64)
+        dearest_first = np.argsort(-inst.costs, kind="stable")
+        self._arc_of[inst.rows[dearest_first], inst.cols[dearest_first]] = dearest_first
+        self._init_basis(cost, inst.supplies, demand)
+        status = self._iterate(cost)
+        if status != TransportSolution.OPTIMAL:
+            return status, None, flows
+
+        flows = self._arc_flows()
+        if flows is None:
+            return TransportSolution.INFEASIBLE, None, np.zeros(inst.num_arcs)
+        # Potentials are defined up to a constant. Shift them to the LP's
+        # dual convention: supply duals <= 0, and zero for warehouses with
+        # spare capacity (whose dummy-client cell is priced at 0).
+        shift = -self.pi[m + n] if width > n else (self.pi[:m].max() if m else 0.0)
+        self.u = self.pi[:m] - shift
+        self.v = self.pi[m:m + n] + shift
+        return TransportSolution.OPTIMAL, float(inst.costs @ flows), flows
+
+    def _arc_flows(self):
+        # Current basis as per-arc flows, or None while it still ships on
+        # a missing lane.
+        n = self.instance.num_clients
+        shipped = (self.cell_flow > self.tol) & (self.cell_col < n)
+        arcs = self._arc_of[self.cell_row[shipped], self.cell_col[shipped]]
+        if (arcs < 0).any():
+            return None
+        flows = np.zeros(self.instance.num_arcs)
+        flows[arcs] = self.cell_flow[shipped]
+        return flows
+
+    def _init_basis(self, cost, supply, demand):
+        m, width = cost.shape
+        allocation = self._start_allocation(supply, width) if self.start is not None else None
+        if allocation is None:
+            method = self.initial
+            if method == "auto":
+                method = "vogel" if m * width <= self.VOGEL_MAX_CELLS else "least_cost"
+            heuristic = vogel if method == "vogel" else least_cost
+            allocation = heuristic(cost, supply, demand)
+        rows, cols, flows = allocation
+
+        # Union-find over rows (0..m-1) and columns (m..m+width-1); the
+        # allocation is a forest, degenerate bases are completed with
+        # zero-flow cells until it spans every line.
+        root = list(range(m + width))
+
+        def find(a):
+            while root[a] != a:
+                root[a] = root[root[a]]
+                a = root[a]
+            return a
+
+        cells = []
+        for i, j, f in zip(rows.tolist(), cols.tolist(), flows.tolist()):
+            a, b = find(i), find(m + j)
+            if a != b:
+                root[a] = b
+                cells.append((i, j, f))
+            elif f > self.tol:
+                # The warm start carries flow around a cycle, so it is not a
+                # basic solution; fall back to the heuristic.
+                self.start = None
+                return self._init_basis(cost, supply, demand)
+
+        if not any(find(m + j) == find(0) for j in range(width)):
+            j = int(np.argmin(cost[0]))
+            root[find(m + j)] = find(0)
+            cells.append((0, j, 0.0))
+        main_rows = [i for i in range(m) if find(i) == find(0)]
+        main_cols = [j for j in range(width) if find(m + j) == find(0)]
+        for node in range(m + width):
+            a = find(node)
+            if a == find(0):
+                continue
+            if node < m:
+                j = main_cols[int(np.argmin(cost[node, main_cols]))]
+                cells.append((node, j, 0.0))
+                main_rows.append(node)
+            else:
+                i = main_rows[int(np.argmin(cost[main_rows, node - m]))]
+                cells.append((i, node - m, 0.0))
+                main_cols.append(node - m)
+            root[a] = find(0)
+
+        self.cell_row = np.array([c[0] for c in cells], dtype=np.int64)
+        self.cell_col = np.array([c[1] for c in cells], dtype=np.int64)
+        self.cell_flow = np.array([c[2] for c in cells], dtype=np.float64)
+        self._build_tree(cost)
+
+    def _start_allocation(self, supply, width):
+        # Reuse given per-arc flows as the starting basis when they still
+        # satisfy this instance's supplies and demands.
+        inst = self.instance
+        start = np.asarray(self.start, dtype=np.float64)
+        if start.shape != (inst.num_arcs,) or (start < -self.tol).any():
+            return None
+        used = start > self.tol
+        m, n = inst.num_warehouses, inst.num_clients
+        # Flows on repeated lanes of one cell add up to one basic cell.
+        cells, merged = np.unique(inst.rows[used] * n + inst.cols[used], return_inverse=True)
+        rows, cols = np.divmod(cells, n)
+        flows = np.bincount(merged, start[used], len(cells))
+        shipped = np.bincount(rows, flows, minlength=m)
+        received = np.bincount(cols, flows, minlength=n)
+        tol = self.tol * max(1.0, inst.demands.sum())
+        if (np.abs(received - inst.demands) > tol).any() or (shipped > inst.supplies + tol).any():
+            return None
+        spare = supply - shipped
+        if width == n:
+            if (spare > tol).any():
+                return None
+            return rows, cols, flows
+        slack = np.flatnonzero(spare > tol)
+        return (np.concatenate([rows, slack]), np.concatenate([cols, np.full(len(slack), n)]),
+                np.concatenate([flows, spare[slack]]))
+
+    def _build_tree(self, cost):
+        m, width = cost.shape
+        self._m = m
+        nodes = m + width
+        self.adj = [dict() for _ in range(nodes)]
+        for slot, (i, j) in enumerate(zip(self.cell_row.tolist(), self.cell_col.tolist())):
+            self.adj[i][m + j] = slot
+            self.adj[m + j][i] = slot
+        self.parent = [-1] * nodes
+        self.parent_cell = [-1] * nodes
+        self.depth = [0] * nodes
+        self.pi = np.zeros(nodes)
+        stack = [0]
+        seen = [False] * nodes
+        seen[0] = True
+        while stack:
+            node = stack.pop()
+            for other, slot in self.adj[node].items():
+                if seen[other]:
+                    continue
+                seen[other] = True
+                self.parent[other] = node
+                self.parent_cell[other] = slot
+                self.depth[other] = self.depth[node] + 1
+                c = cost[self.cell_row[slot], self.cell_col[slot]]
+                self.pi[other] = c - self.pi[node]
+                stack.append(other)
+
+    def _iterate(self, cost):
+        m, width = cost.shape
+        rows_per_block = max(1, self.PRICING_BLOCK_CELLS // width)
+        starts = list(range(0, m, rows_per_block))
+        block = 0
+        clean = 0
+        while True:
+            if self.max_iterations is not None and self.iterations >= self.max_iterations:
+                return TransportSolution.ITERATION_LIMIT
+            if self.cancelled:
+                return TransportSolution.CANCELLED
+            if self.progress is not None and self.progress.due():
+                # Every basis of the transportation simplex is primal feasible.
+                basis_cost = float(cost[self.cell_row, self.cell_col] @ self.cell_flow)
+                self.progress.update(incumbent=basis_cost)
+                if self.progress.on_solution is not None:
+                    flows = self._arc_flows()
+                    if flows is not None:
+                        self.progress.on_solution(basis_cost, flows)
+            # Partial pricing: scan one block of rows per step and only
+            # declare optimality after a full clean sweep.
+            r0 = starts[block]
+            r1 = min(r0 + rows_per_block, m)
+            reduced = cost[r0:r1] - self.pi[r0:r1, None] - self.pi[None, m:]
+            k = int(np.argmin(reduced))
+            value = reduced.flat[k]
+            block = (block + 1) % len(starts)
+            if value >= -self._tol:
+                clean += 1
+                if clean >= len(starts):
+                    return TransportSolution.OPTIMAL
+                continue
+            clean = 0
+            i, j = divmod(k, width)
+            self._pivot(r0 + i, j, value)
+            self.iterations += 1
+
+    def _pivot(self, i, j, reduced_cost):
+        m = self._m
+        parent, parent_cell, depth = self.parent, self.parent_cell, self.depth
+        a, b = i, m + j
+
+        # Walk both endpoints up to their common ancestor; the cycle is the
+        # entering cell plus the tree path from column b back to row a.
+        path_b, path_a = [], []
+        x, y = b, a
+        while depth[x] > depth[y]:
+            path_b.append(parent_cell[x])
+            x = parent[x]
+        while depth[y] > depth[x]:
+            path_a.append(parent_cell[y])
+            y = parent[y]
+        while x != y:
+            path_b.append(parent_cell[x])
+            x = parent[x]
+            path_a.append(parent_cell[y])
+            y = parent[y]
+        cycle = path_b + path_a[::-1]
+        minus = np.array(cycle[0::2], dtype=np.int64)
+        plus = np.array(cycle[1::2], dtype=np.int64)
+        leave = int(minus[np.argmin(self.cell_flow[minus])])
+        theta = self.cell_flow[leave]
+        self.cell_flow[plus] += theta
+        self.cell_flow[minus] -= theta
+
+        # Cut the leaving cell: q is its lower endpoint, heading the subtree
+        # that gets re-hung from the entering cell.
+        lr, lc = int(self.cell_row[leave]), m + int(self.cell_col[leave])
+        q = lc if parent_cell[lc] == leave else lr
+        del self.adj[lr][lc]
+        del self.adj[lc][lr]
+        x = a
+        while depth[x] > depth[q]:
+            x = parent[x]
+        s, t = (a, b) if x == q else (b, a)
+
+        self.cell_row[leave] = i
+        self.cell_col[leave] = j
+        self.cell_flow[leave] = theta
+        self.adj[a][b] = leave
+        self.adj[b][a] = leave
+        parent[s] = t
+        parent_cell[s] = leave
+        depth[s] = depth[t] + 1
+        subtree = [s]
+        stack = [s]
+        while stack:
+            node = stack.pop()
+            for other, slot in self.adj[node].items():
+                if other == parent[node]:
+                    continue
+                parent[other] = node
+                parent_cell[other] = slot
+                depth[other] = depth[node] + 1
+                subtree.append(other)
+                stack.append(other)
+
+        # Shift potentials of the re-hung subtree so the entering cell
+        # becomes tight while every other tree cell stays tight.
+        subtree = np.array(subtree, dtype=np.int64)
+        sign = 1.0 if s < m else -1.0
+        self.pi[subtree[subtree < m]] += sign * reduced_cost
+        self.pi[subtree[subtree >= m]] -= sign * reduced_cost
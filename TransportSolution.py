@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class TransportSolution:
+    OPTIMAL = "optimal"
+    # A valid shipping plan that is not proven optimal: a heuristic
+    # preview or an intermediate incumbent.
+    FEASIBLE = "feasible"
+    INFEASIBLE = "infeasible"
+    ITERATION_LIMIT = "iteration_limit"
+    CANCELLED = "cancelled"
+
+    def __init__(self, instance, status, objective=None, flows=None, backend=None, runtime=0.0):
+        self.instance = instance
+        self.status = status
+        self.objective = objective
+        self.flows = np.zeros(instance.num_arcs) if flows is None else np.asarray(flows, dtype=np.float64)
+        self.backend = backend
+        self.runtime = runtime
+        # Sensitivity of an LP-optimal solution, when the backend provides it.
+        self.sensitivity = None
+
+    @classmethod
+    def status_from_gurobi(cls, code):
+        from gurobipy import GRB
+
+        return {GRB.OPTIMAL: cls.OPTIMAL,
+                GRB.INFEASIBLE: cls.INFEASIBLE,
+                GRB.INF_OR_UNBD: cls.INFEASIBLE,
+                GRB.ITERATION_LIMIT: cls.ITERATION_LIMIT,
+                GRB.INTERRUPTED: cls.CANCELLED}.get(code, code)
+
+    @property
+    def is_optimal(self):
+        return self.status == self.OPTIMAL
+
+    def as_dict(self):
+        return self.instance.solution_from_flows(self.flows)
+
+    def active_arcs(self, tol=1e-9):
+        inst = self.instance
+        for k in np.flatnonzero(self.flows > tol):
+            w, c = inst.arc_key(k)
+            yield w, c, float(self.flows[k]), float(inst.costs[k])
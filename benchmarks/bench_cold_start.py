@@ -0,0 +1,82 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import ProjectIO
+from TransportInstance import TransportInstance
+
+
+def generate(num_warehouses, num_clients, seed):
+    rng = np.random.default_rng(seed)
+    return TransportInstance.from_dense([f"W{i}" for i in range(num_warehouses)], rng.integers(50, 500, num_warehouses),
+                                        [f"C{j}" for j in range(num_clients)], rng.integers(10, 100, num_clients),
+                                        rng.integers(1, 100, (num_warehouses, num_clients)))
+
+
+def wall_times(command, runs):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def slowest_imports(command, count):
+    # python -X importtime reports cumulative microseconds per module on stderr.
+    result = subprocess.run([sys.executable, "-X", "importtime"] + command[1:], cwd=ROOT,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time of one-shot headless solves.")
+    parser.add_argument("--size", default="20x40", help="instance size as WAREHOUSESxCLIENTS")
+    parser.add_argument("--backends", default="native,gurobi")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--imports", type=int, default=8, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    m, n = (int(v) for v in args.size.split("x"))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "instance.npz")
+        ProjectIO.save_instance(generate(m, n, args.seed), path)
+        output = os.path.join(folder, "solution.json")
+        commands = {"python startup": [sys.executable, "-c", "pass"],
+                    "import MainWindow (GUI modules)": [sys.executable, "-c", "import MainWindow"]}
+        for backend in args.backends.split(","):
+            commands[f"main.py solve --backend {backend}"] = [
+                sys.executable, "main.py", "solve", path, "--backend", backend, "-o", output]
+
+        print(f"{m}x{n} instance, median of {args.runs} runs")
+        for label, command in commands.items():
+            print(f"  {label:<40} {wall_times(command, args.runs) * 1000:8.1f} ms")
+        for label, command in commands.items():
+            if not label.startswith("main.py"):
+                continue
+            print(f"\nSlowest imports for {label}:")
+            for cumulative, name in slowest_imports(command, args.imports):
+                print(f"  {name:<40} {cumulative / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColumnGeneration import ColumnGeneration
+from EnvPool import EnvPool
+from InstanceGenerator import generate_dense
+from SolverBackend import get_backend
+
+
+def measure(fn, memory):
+    # Timed untraced; the peak of Python and NumPy allocations comes from a
+    # second run under tracemalloc. Pages of the memmapped cost matrix are
+    # not allocations and are not counted.
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = "-"
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = f"{tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f}"
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lane pricing on memory-mapped dense instances against solving every lane at once.")
+    parser.add_argument("--sizes", nargs="+", default=["100x1000", "500x5000", "2000x20000"],
+                        help="instances as WAREHOUSESxCLIENTS")
+    parser.add_argument("--backend", choices=["native", "gurobi"], default="native",
+                        help="solver of the restricted model and of the full instance")
+    parser.add_argument("--lanes-per-client", type=int, default=5)
+    parser.add_argument("--max-full-lanes", type=int, default=1_000_000,
+                        help="largest instance also solved with every lane as a variable")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc runs, which take several times longer")
+    args = parser.parse_args()
+
+    pool = EnvPool() if args.backend == "gurobi" else None
+    print(f"{'instance':>12} {'lanes':>11} {'model lanes':>12} {'rounds':>7} {'seconds':>8} "
+          f"{'peak MB':>8} {'full s':>8} {'full MB':>8} {'objectives':>22}")
+    with tempfile.TemporaryDirectory() as folder:
+        for size in args.sizes:
+            m, n = (int(v) for v in size.lower().split("x"))
+            path = os.path.join(folder, f"{size}.npy")
+            instance = generate_dense(m, n, path, seed=args.seed)
+
+            def lane_pricing():
+                engine = ColumnGeneration(instance, args.backend, pool=pool,
+                                          lanes_per_client=args.lanes_per_client)
+                return engine, engine.solve()
+
+            (engine, solution), seconds, peak = measure(lane_pricing, not args.no_memory)
+            full_seconds, full_peak, full_objective = "-", "-", "-"
+            if instance.num_lanes <= args.max_full_lanes:
+                kwargs = {"pool": pool} if args.backend == "gurobi" else {}
+
+                def every_lane():
+                    try:
+                        return get_backend(args.backend, **kwargs).solve(instance.to_transport()).objective
+                    except Exception as e:
+                        return type(e).__name__
+
+                full_objective, full_seconds, full_peak = measure(every_lane, not args.no_memory)
+                full_seconds = f"{full_seconds:.2f}"
+            print(f"{size:>12} {instance.num_lanes:>11} {solution.instance.num_arcs:>12} {engine.rounds:>7} "
+                  f"{seconds:>8.2f} {peak:>8} {full_seconds:>8} {full_peak:>8} "
+                  f"{solution.objective!s:>10} / {full_objective!s}")
+            del instance
+    if pool is not None:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
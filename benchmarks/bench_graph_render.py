@@ -0,0 +1,81 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from GraphVisualizationWidget import GraphVisualizationWidget
+from TransportInstance import TransportInstance
+
+
+def generate(num_warehouses, num_clients, num_arcs, seed):
+    rng = np.random.default_rng(seed)
+    cells = rng.choice(num_warehouses * num_clients, size=min(num_arcs, num_warehouses * num_clients),
+                       replace=False)
+    rows, cols = np.divmod(cells, num_clients)
+    return TransportInstance([f"W{i}" for i in range(num_warehouses)], rng.integers(50, 500, num_warehouses),
+                             [f"C{j}" for j in range(num_clients)], rng.integers(10, 100, num_clients),
+                             rows, cols, rng.integers(1, 100, len(cells)))
+
+
+def frame_times(view, frames):
+    # Each frame repaints the viewport after a view change: fitted overview,
+    # a zoomed-in detail view, then panning at that zoom.
+    times = []
+    view.fitInView(view.scene.sceneRect(), Qt.KeepAspectRatio)
+    for k in range(frames):
+        if k == frames // 3:
+            view.scale(6, 6)
+        elif k > frames // 3:
+            view.translate(0, 25)
+        start = time.perf_counter()
+        view.viewport().grab()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame times of the graph view on generated graphs.")
+    parser.add_argument("--graphs", nargs="+", default=["20x40:500", "50x100:2000", "100x200:10000"],
+                        help="graphs as WAREHOUSESxCLIENTS:ARCS")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-classic", action="store_true",
+                        help="only measure the scalable mode (for very large graphs)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'graph':>16} {'mode':>9} {'load s':>8} {'median ms':>10} {'max ms':>8}")
+    for spec in args.graphs:
+        size, arcs = spec.split(":")
+        m, n = (int(v) for v in size.lower().split("x"))
+        instance = generate(m, n, int(arcs), args.seed)
+        solution = {instance.arc_key(k): 1.0 for k in range(0, instance.num_arcs, 7)}
+        modes = [("scalable", True)] if args.skip_classic else [("classic", False), ("scalable", True)]
+        for label, scalable in modes:
+            view = GraphVisualizationWidget()
+            view.resize(1000, 800)
+            view.SCALABLE_EDGE_THRESHOLD = 0 if scalable else float("inf")
+            view.show()
+            start = time.perf_counter()
+            view.load_instance(instance)
+            view.highlight_solution(solution)
+            app.processEvents()
+            load = time.perf_counter() - start
+            times = frame_times(view, args.frames)
+            print(f"{spec:>16} {label:>9} {load:>8.2f} {statistics.median(times) * 1000:>10.1f} "
+                  f"{max(times) * 1000:>8.1f}")
+            view.close()
+            view.deleteLater()
+            app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
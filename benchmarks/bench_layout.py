@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_transshipment import generate
+from GraphLayout import column_layout, force_layout, layered_layout
+from NetworkInstance import NetworkInstance
+from TransportInstance import TransportInstance
+
+
+def regional(num_warehouses, num_clients, lanes, seed):
+    # Sites on a line, each client served by its nearest warehouses, listed
+    # in random order: a graph that can be drawn with few crossings, but
+    # not in the order it was entered.
+    rng = np.random.default_rng(seed)
+    warehouses, clients = rng.random(num_warehouses), rng.random(num_clients)
+    nearest = np.argsort(np.abs(clients[:, None] - warehouses[None, :]), axis=1)[:, :lanes]
+    rows = nearest.ravel()
+    cols = np.repeat(np.arange(num_clients), lanes)
+    instance = TransportInstance([f"W{i}" for i in range(num_warehouses)], np.full(num_warehouses, 1.0),
+                                 [f"C{j}" for j in range(num_clients)], np.zeros(num_clients),
+                                 rows, cols, np.ones(len(rows)))
+    return NetworkInstance.from_transport(instance)
+
+
+def crossings(network, positions):
+    # Crossing arcs of a two-layer drawing: pairs whose ends are in opposite
+    # order, counted as inversions by merge sort. Folded layers are read
+    # row by row, as the layout orders them.
+    order = positions[:, 1] * 1e6 + positions[:, 0]
+    tails, heads = order[network.tails], order[network.heads]
+    heads = heads[np.lexsort((heads, tails))]
+
+    def count(values):
+        if len(values) < 2:
+            return values, 0
+        half = len(values) // 2
+        left, a = count(values[:half])
+        right, b = count(values[half:])
+        between = int((len(left) - np.searchsorted(left, right, side="right")).sum())
+        return np.sort(np.concatenate([left, right]), kind="mergesort"), a + b + between
+
+    return count(heads)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layout time and arc crossings of the graph view's layouts.")
+    parser.add_argument("--bipartite", nargs="+", default=["20x200", "50x1000", "200x5000"],
+                        help="regional instances as WAREHOUSESxCLIENTS")
+    parser.add_argument("--networks", nargs="+", default=["5x4x40", "20x10x300", "50x30x1500"],
+                        help="transshipment networks as WAREHOUSESxHUBSxCLIENTS")
+    parser.add_argument("--lanes", type=int, default=3, help="lanes per client of the regional instances")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'instance':>14} {'arcs':>7} {'layered s':>10} {'crossings as entered':>21} {'layered':>10} "
+          f"{'height':>8}")
+    for size in args.bipartite:
+        m, n = (int(v) for v in size.lower().split("x"))
+        network = regional(m, n, args.lanes, args.seed)
+        start = time.perf_counter()
+        positions = layered_layout(network)
+        seconds = time.perf_counter() - start
+        height = np.ptp(positions[:, 1])
+        print(f"{size:>14} {network.num_arcs:>7} {seconds:>10.3f} {crossings(network, column_layout(network)):>21} "
+              f"{crossings(network, positions):>10} {height:>8.0f}")
+
+    print(f"\n{'network':>14} {'arcs':>7} {'force s':>10} {'extent':>12} {'closest nodes':>14}")
+    for size in args.networks:
+        m, h, n = (int(v) for v in size.lower().split("x"))
+        network = generate(m, h, n, 2, 2, args.seed)
+        start = time.perf_counter()
+        positions = force_layout(network)
+        seconds = time.perf_counter() - start
+        gaps, _ = cKDTree(positions).query(positions, k=2)
+        extent = np.ptp(positions, axis=0)
+        print(f"{size:>14} {network.num_arcs:>7} {seconds:>10.3f} {extent[0]:>5.0f}x{extent[1]:<6.0f} "
+              f"{np.median(gaps[:, 1]):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
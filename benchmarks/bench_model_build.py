@@ -0,0 +1,84 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from gurobipy import Env, Model, GRB
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TransportInstance import TransportInstance
+from TransportModelBuilder import TransportModelBuilder
+
+
+def generate(num_warehouses, num_clients, density, seed):
+    rng = np.random.default_rng(seed)
+    warehouses = {f"W{i}": int(v) for i, v in enumerate(rng.integers(50, 500, num_warehouses))}
+    clients = {f"C{j}": int(v) for j, v in enumerate(rng.integers(10, 100, num_clients))}
+    mask = rng.random((num_warehouses, num_clients)) < density
+    rows, cols = np.nonzero(mask)
+    values = rng.integers(1, 100, len(rows))
+    w_names, c_names = list(warehouses), list(clients)
+    cost = {(w_names[i], c_names[j]): int(v) for i, j, v in zip(rows, cols, values)}
+    return warehouses, clients, cost
+
+
+def build_legacy(env, warehouses, clients, cost):
+    # The original MainWindow formulation: a variable for every pair and
+    # generator sums for the objective and each row.
+    model = Model("Transport_Optimization", env=env)
+    x = model.addVars(warehouses.keys(), clients.keys(), vtype=GRB.INTEGER, lb=0, name="x")
+    model.setObjective(
+        sum(cost.get((w, c), 0) * x[w, c] for w in warehouses for c in clients),
+        GRB.MINIMIZE)
+    for w in warehouses:
+        model.addConstr(sum(x[w, c] for c in clients) <= warehouses[w], f"Supply_{w}")
+    for c in clients:
+        model.addConstr(sum(x[w, c] for w in warehouses) >= clients[c], f"Demand_{c}")
+    model.update()
+    return model
+
+
+def build_vectorized(env, warehouses, clients, cost):
+    instance = TransportInstance.from_dicts(warehouses, clients, cost)
+    model = TransportModelBuilder(instance).build(env=env)[0]
+    model.update()
+    return model
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    model = fn(*args)
+    elapsed = time.perf_counter() - start
+    stats = (model.NumVars, model.NumConstrs, model.NumNZs)
+    model.dispose()
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transport model build times.")
+    parser.add_argument("--sizes", nargs="+", default=["50x100", "200x500", "500x1000"],
+                        help="instance sizes as WAREHOUSESxCLIENTS")
+    parser.add_argument("--density", type=float, default=0.3, help="fraction of lanes with a cost")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="only time the vectorized builder (for very large sizes)")
+    args = parser.parse_args()
+
+    env = Env(params={"OutputFlag": 0})
+    print(f"{'size':>12} {'builder':>10} {'seconds':>10} {'vars':>10} {'constrs':>8} {'nonzeros':>10}")
+    for size in args.sizes:
+        m, n = (int(v) for v in size.lower().split("x"))
+        warehouses, clients, cost = generate(m, n, args.density, args.seed)
+        builders = [("vectorized", build_vectorized)]
+        if not args.skip_legacy:
+            builders.insert(0, ("legacy", build_legacy))
+        for label, fn in builders:
+            elapsed, (nvars, nconstrs, nnz) = timed(fn, env, warehouses, clients, cost)
+            print(f"{size:>12} {label:>10} {elapsed:>10.3f} {nvars:>10} {nconstrs:>8} {nnz:>10}")
+    env.dispose()
+
+
+if __name__ == "__main__":
+    main()
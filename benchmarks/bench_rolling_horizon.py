@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EnvPool import EnvPool
+from InstanceGenerator import generate_multi_period
+from MultiPeriodPlanner import MultiPeriodPlanner
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="A yearly plan by rolling horizon, updated in place or rebuilt per week, "
+                    "against the whole time-expanded model.")
+    parser.add_argument("--warehouses", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=12)
+    parser.add_argument("--periods", type=int, default=52)
+    parser.add_argument("--windows", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    instance = generate_multi_period(args.warehouses, args.clients, args.periods, seed=args.seed)
+    pool = EnvPool(profiles={"bench": {"OutputFlag": 0, "Threads": 1}}, default_profile="bench")
+    runs = [("monolithic", "native", "monolithic", 0, False),
+            ("monolithic", "gurobi", "monolithic", 0, False)]
+    for window in args.windows:
+        runs += [(f"rolling {window}", "native", "rolling", window, False),
+                 (f"rolling {window}", "gurobi", "rolling", window, False),
+                 (f"rolling {window}", "gurobi", "rolling", window, True)]
+
+    print(f"{instance.num_periods} periods, {instance.num_warehouses} warehouses, "
+          f"{instance.num_clients} clients, {instance.num_arcs} lanes")
+    print(f"{'plan':>12} {'backend':>8} {'model':>8} {'seconds':>8} {'solves':>7} {'iterations':>10} "
+          f"{'per solve':>9} {'objective':>12}")
+    for label, backend, mode, window, warm in runs:
+        best, plan = None, None
+        for _ in range(args.repeat):
+            planner = MultiPeriodPlanner(instance, backend, mode, window or 1, pool=pool, warm=warm)
+            try:
+                plan = planner.solve()
+            except Exception as e:
+                # The whole year may exceed a size-limited license.
+                plan = type(e).__name__
+                break
+            best = plan.runtime if best is None else min(best, plan.runtime)
+        model = "updated" if warm else "rebuilt" if mode == "rolling" else "-"
+        if isinstance(plan, str):
+            print(f"{label:>12} {backend:>8} {model:>8} {plan:>8}")
+            continue
+        # Simplex iterations are only counted for Gurobi.
+        iterations, per_solve = "-", "-"
+        if backend == "gurobi":
+            iterations, per_solve = plan.iterations, f"{plan.iterations / plan.solves:.1f}"
+        print(f"{label:>12} {backend:>8} {model:>8} {best:>8.3f} {plan.solves:>7} {iterations:>10} "
+              f"{per_solve:>9} {plan.objective!s:>12}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
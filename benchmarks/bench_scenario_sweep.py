@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from EnvPool import EnvPool
+from HeadlessSolve import solve_instance
+from ScenarioSweep import ScenarioSweep
+from TransportInstance import TransportInstance
+
+
+def generate(num_warehouses, num_clients, num_scenarios, seed):
+    rng = np.random.default_rng(seed)
+    instance = TransportInstance.from_dense(
+        [f"W{i}" for i in range(num_warehouses)], rng.integers(100, 500, num_warehouses),
+        [f"C{j}" for j in range(num_clients)], rng.integers(10, 60, num_clients),
+        rng.integers(1, 100, (num_warehouses, num_clients)))
+    demands = instance.demands * rng.uniform(0.8, 1.2, (num_scenarios, num_clients))
+    cost_scale = rng.uniform(0.9, 1.4, num_scenarios)
+    outages = rng.random((num_scenarios, num_warehouses)) < 0.05
+    return instance, demands, cost_scale, outages
+
+
+def sequential(instance, demands, cost_scale, outages, backend):
+    # One model per scenario in this process, as repeated Solve clicks would.
+    pool = EnvPool(profiles={"sequential": {"OutputFlag": 0, "Threads": 1}},
+                   default_profile="sequential") if backend == "gurobi" else None
+    start = time.perf_counter()
+    for s in range(len(demands)):
+        variant = TransportInstance(instance.warehouse_names, np.where(outages[s], 0, instance.supplies),
+                                    instance.client_names, demands[s],
+                                    instance.rows, instance.cols, instance.costs * cost_scale[s])
+        solve_instance(variant, backend, pool=pool)
+    elapsed = time.perf_counter() - start
+    if pool is not None:
+        pool.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario sweep throughput against sequential solves.")
+    parser.add_argument("--size", default="20x40", help="instance size as WAREHOUSESxCLIENTS")
+    parser.add_argument("--scenarios", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--backend", default="gurobi")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    m, n = (int(v) for v in args.size.split("x"))
+    instance, demands, cost_scale, outages = generate(m, n, args.scenarios, args.seed)
+    print(f"{m}x{n}, {args.scenarios} scenarios, backend {args.backend}, {os.cpu_count()} cores")
+    elapsed = sequential(instance, demands, cost_scale, outages, args.backend)
+    print(f"  {'sequential':<12} {elapsed:8.2f} s {args.scenarios / elapsed:10.1f} scenarios/s")
+    for workers in (int(w) for w in args.workers.split(",")):
+        # With Gurobi the sweep stays within GUROBI_SESSION_LIMIT workers.
+        sweep = ScenarioSweep(instance, args.backend, workers, args.threads)
+        result = sweep.run(demands, cost_scale, outages)
+        print(f"  {f'{sweep.workers} workers':<12} {result.runtime:8.2f} s "
+              f"{args.scenarios / result.runtime:10.1f} scenarios/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from SolutionReportPanel import SolutionReportPanel
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+
+def generate(num_warehouses, num_clients, active, seed):
+    # A solution with the given number of active lanes among three times
+    # as many lanes.
+    rng = np.random.default_rng(seed)
+    cells = rng.choice(num_warehouses * num_clients, size=min(3 * active, num_warehouses * num_clients),
+                       replace=False)
+    rows, cols = np.divmod(cells, num_clients)
+    instance = TransportInstance([f"W{i}" for i in range(num_warehouses)], np.full(num_warehouses, 1e6),
+                                 [f"C{j}" for j in range(num_clients)], np.full(num_clients, 100.0),
+                                 rows, cols, rng.integers(1, 100, len(cells)))
+    flows = np.zeros(instance.num_arcs)
+    flows[rng.choice(instance.num_arcs, size=min(active, instance.num_arcs), replace=False)] = \
+        rng.integers(1, 50, min(active, instance.num_arcs))
+    return TransportSolution(instance, TransportSolution.OPTIMAL, float(instance.costs @ flows), flows, "bench")
+
+
+def timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def label_seconds(app, solution):
+    # The old result view: one line per shipment in a single label, shown.
+    label = QLabel()
+    label.resize(600, 400)
+    label.show()
+
+    def show():
+        lines = [f"Ship {qty:g} units from {w} to {c} (cost per unit: {unit_cost:g})"
+                 for w, c, qty, unit_cost in solution.active_arcs()]
+        label.setText("\n".join(lines))
+        label.adjustSize()
+        app.processEvents()
+
+    seconds = timed(show)
+    label.close()
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to show, sort, filter and export a solution in the "
+                                                 "table report, against the old one-label text.")
+    parser.add_argument("--active", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--warehouses", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--skip-label", action="store_true", help="skip the old label, slow on large solutions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'active':>8} {'label s':>8} {'show s':>8} {'sort s':>8} {'filter s':>8} {'export s':>9} "
+          f"{'rows in view':>12}")
+    for active in args.active:
+        solution = generate(args.warehouses, args.clients, active, args.seed)
+        label = "-" if args.skip_label else f"{label_seconds(app, solution):.3f}"
+        panel = SolutionReportPanel()
+        panel.resize(600, 400)
+        panel.show()
+
+        def show():
+            panel.set_solution(solution)
+            app.processEvents()
+
+        def sort():
+            panel.table.sortByColumn(4, Qt.DescendingOrder)
+            app.processEvents()
+
+        def filtered():
+            panel.filter_edit.setText("w1")
+            app.processEvents()
+
+        shown = timed(show)
+        sorted_ = timed(sort)
+        filtered_ = timed(filtered)
+        panel.filter_edit.setText("")
+        exported = timed(lambda: panel.model.write_csv(io.StringIO()))
+        print(f"{active:>8} {label:>8} {shown:>8.3f} {sorted_:>8.3f} {filtered_:>8.3f} {exported:>9.3f} "
+              f"{panel.model.rowCount():>12}")
+        panel.close()
+
+
+if __name__ == "__main__":
+    main()
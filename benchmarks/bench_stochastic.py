@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EnvPool import EnvPool
+from InstanceGenerator import generate_instance
+from StochasticTransport import StochasticTransport, sample_demands
+
+
+def build_per_scenario(model, env):
+    # The same model written the usual way, constraint by constraint.
+    import gurobipy as gp
+
+    inst, count = model.instance, model.num_scenarios
+    m = gp.Model("Stochastic_Loop", env=env)
+    x = m.addVars(inst.num_arcs, obj=inst.costs.tolist())
+    y = m.addVars(inst.num_clients)
+    for i in range(inst.num_warehouses):
+        m.addConstr(gp.quicksum(x[k] for k in np.flatnonzero(inst.rows == i)) <= inst.supplies[i])
+    for j in range(inst.num_clients):
+        m.addConstr(gp.quicksum(x[k] for k in np.flatnonzero(inst.cols == j)) == y[j])
+    for s in range(count):
+        for j in range(inst.num_clients):
+            u = m.addVar(obj=model.probabilities[s] * model.shortage_penalty[j])
+            m.addConstr(y[j] + u >= model.scenarios[s, j])
+    m.update()
+    return m
+
+
+def evaluate_per_scenario(model, flows, scenarios):
+    inst = model.instance
+    delivered = np.bincount(inst.cols, flows, inst.num_clients)
+    shipping = float(inst.costs @ flows)
+    return [shipping + sum(max(d - y, 0.0) * p for d, y, p in zip(row, delivered, model.shortage_penalty))
+            for row in scenarios.tolist()]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Building and scoring the sample-average model: sparse blocks and array "
+                    "arithmetic against per-scenario loops.")
+    parser.add_argument("--warehouses", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--loop-max", type=int, default=1000, help="largest count also built with loops")
+    parser.add_argument("--evaluate", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    instance = generate_instance(args.warehouses, args.clients, density=0.5, balanced=False, seed=args.seed)
+    penalty = 2.0 * instance.costs.max()
+    evaluation = sample_demands(instance.demands, args.evaluate, seed=args.seed + 1)
+    pool = EnvPool(profiles={"bench": {"OutputFlag": 0, "Threads": 1}}, default_profile="bench")
+    print(f"{instance.num_warehouses} warehouses, {instance.num_clients} clients, {instance.num_arcs} lanes; "
+          f"plans scored on {args.evaluate} scenarios")
+    print(f"{'scenarios':>9} {'variables':>10} {'build s':>8} {'loop s':>8} {'solve s':>8} "
+          f"{'expected':>10} {'score s':>8} {'loop s':>8} {'mean':>10} {'p95':>10}")
+    with pool.env() as env:
+        for count in args.scenarios:
+            model = StochasticTransport(instance, sample_demands(instance.demands, count, seed=args.seed),
+                                        penalty)
+            (built, x), build_seconds = timed(lambda: model.build(env=env))
+            built.update()
+            variables = built.NumVars
+            built.dispose()
+            loop_seconds = "-"
+            if count <= args.loop_max:
+                looped, loop_seconds = timed(lambda: build_per_scenario(model, env))
+                looped.dispose()
+                loop_seconds = f"{loop_seconds:.3f}"
+            model.env = env
+            try:
+                plan, solve_seconds = timed(model.solve)
+            except Exception as e:
+                # Large counts exceed a size-limited license.
+                print(f"{count:>9} {variables:>10} {build_seconds:>8.3f} {loop_seconds:>8} {type(e).__name__:>8}")
+                continue
+            costs, score_seconds = timed(lambda: model.evaluate(plan.flows, evaluation))
+            _, score_loop_seconds = timed(lambda: evaluate_per_scenario(model, plan.flows, evaluation))
+            print(f"{count:>9} {variables:>10} {build_seconds:>8.3f} {loop_seconds:>8} {solve_seconds:>8.3f} "
+                  f"{plan.objective:>10.1f} {score_seconds:>8.4f} {score_loop_seconds:>8.3f} "
+                  f"{costs.mean:>10.1f} {costs.quantile(0.95):>10.1f}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
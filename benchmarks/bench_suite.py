@@ -0,0 +1,311 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import ProjectIO
+from InstanceGenerator import generate_instance
+from TransportSolution import TransportSolution
+
+PHASES = ["ingest", "cost_matrix", "build", "optimize", "widget_update"]
+
+# Instance shapes: (density, balanced). Sparse instances have about ten
+# lanes per client.
+KINDS = {
+    "dense-balanced": (1.0, True),
+    "dense-unbalanced": (1.0, False),
+    "sparse-balanced": (None, True),
+    "sparse-unbalanced": (None, False),
+}
+
+PRESETS = {
+    "quick": ["10x10", "100x100", "300x300"],
+    "full": ["10x10", "100x100", "500x500", "1000x1000", "2000x2000", "5000x5000"],
+}
+
+
+def measure(fn, repeat, memory):
+    # Median of repeat timed runs, which a stray slow or fast run does not
+    # move, then one run under tracemalloc for the peak of Python and NumPy
+    # allocations; tracing slows the run down, so it is kept out of the
+    # timings.
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, _timing(times, peak)
+
+
+def run_case(name, instance, args, app, env):
+    from GraphVisualizationWidget import GraphVisualizationWidget
+    from MatrixWidget import MatrixWidget
+
+    phases = {}
+    widgets = instance.num_arcs <= args.max_widget_arcs
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, f"{name}.{args.format}")
+        ProjectIO.save_instance(instance, path)
+        matrix = MatrixWidget()
+
+        def ingest():
+            loaded = ProjectIO.load_instance(path)
+            if widgets:
+                matrix.load_instance(loaded)
+            return loaded
+
+        instance, phases["ingest"] = measure(ingest, args.repeat, args.memory)
+
+    if widgets:
+        _, phases["cost_matrix"] = measure(matrix.get_cost_matrix, args.repeat, args.memory)
+    else:
+        phases["cost_matrix"] = {"skipped": f"over {args.max_widget_arcs} arcs"}
+
+    solution = None
+    try:
+        if args.backend == "gurobi":
+            solution = _gurobi_phases(instance, args, env, phases)
+        else:
+            solution = _native_phases(instance, args, phases)
+    except Exception as e:
+        # A size-limited Gurobi license, for one, refuses the larger cases.
+        for phase in ("build", "optimize"):
+            phases.setdefault(phase, {"error": str(e)})
+
+    if widgets and solution is not None and solution.is_optimal:
+        flows = solution.as_dict()
+        view = GraphVisualizationWidget()
+        view.resize(1000, 800)
+        view.show()
+
+        def widget_update():
+            matrix.update_solution(flows)
+            view.load_instance(instance)
+            view.highlight_solution(flows)
+            app.processEvents()
+            view.viewport().grab()
+
+        _, phases["widget_update"] = measure(widget_update, args.repeat, args.memory)
+        view.close()
+        view.deleteLater()
+    else:
+        phases["widget_update"] = {"skipped": "no optimal solution" if widgets
+                                   else f"over {args.max_widget_arcs} arcs"}
+    matrix.deleteLater()
+    app.processEvents()
+    return {"warehouses": instance.num_warehouses, "clients": instance.num_clients,
+            "arcs": instance.num_arcs, "objective": None if solution is None else solution.objective,
+            "phases": phases}
+
+
+def _gurobi_phases(instance, args, env, phases):
+    from TransportModelBuilder import TransportModelBuilder
+
+    built = []
+
+    def build():
+        model = TransportModelBuilder(instance).build(env=env)[0]
+        model.update()
+        built.append(model)
+        return model
+
+    def optimize():
+        model = built.pop()
+        model.optimize()
+        return model
+
+    _, phases["build"] = measure(build, args.repeat, args.memory)
+    for model in built[1:]:
+        model.dispose()
+    del built[1:]
+    # Each optimize run gets a freshly built model, or Gurobi would return
+    # the stored optimum at once.
+    model, phases["optimize"] = _measure_fresh(optimize, build, args.repeat, args.memory)
+    status = TransportSolution.status_from_gurobi(model.status)
+    if status == TransportSolution.OPTIMAL:
+        solution = TransportSolution(instance, status, model.objVal, model.getAttr("X", model.getVars()), "gurobi")
+    else:
+        solution = TransportSolution(instance, status, backend="gurobi")
+    model.dispose()
+    return solution
+
+
+def _native_phases(instance, args, phases):
+    from TransportSimplex import TransportSimplex
+
+    engine, phases["build"] = measure(lambda: TransportSimplex(instance), args.repeat, args.memory)
+    engines = [engine]
+    (status, objective, flows), phases["optimize"] = _measure_fresh(
+        lambda: engines.pop().solve(), lambda: engines.append(TransportSimplex(instance)),
+        args.repeat, args.memory)
+    return TransportSolution(instance, status, objective, flows, "native")
+
+
+def _measure_fresh(fn, prepare, repeat, memory):
+    # Like measure, for runs that consume their input: prepare sets up the
+    # next run outside the timed region.
+    times = []
+    for k in range(repeat):
+        if k:
+            prepare()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        prepare()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, _timing(times, peak)
+
+
+def _timing(times, peak):
+    return {"seconds": statistics.median(times), "best": min(times), "worst": max(times), "peak_bytes": peak}
+
+
+def compare(results, baseline, tolerance, min_seconds, min_bytes):
+    # A phase regresses when its median is slower, or its peak higher, than
+    # the baseline's by more than tolerance; differences under min_seconds
+    # or min_bytes are noise, and so is a slower median while the fastest
+    # run still beats the baseline's slowest.
+    regressions = []
+    for case, entry in results["cases"].items():
+        base_case = baseline["cases"].get(case)
+        if base_case is None:
+            continue
+        for phase, current in entry["phases"].items():
+            base = base_case["phases"].get(phase, {})
+            if "seconds" not in current or "seconds" not in base:
+                continue
+            limit = base["seconds"] * (1 + tolerance)
+            overlap = current.get("best", current["seconds"]) <= base.get("worst", base["seconds"])
+            if current["seconds"] > limit and current["seconds"] - base["seconds"] > min_seconds and not overlap:
+                regressions.append(f"{case} {phase}: {current['seconds']:.4f}s vs {base['seconds']:.4f}s")
+            peak, base_peak = current.get("peak_bytes"), base.get("peak_bytes")
+            if peak and base_peak and peak > base_peak * (1 + tolerance) and peak - base_peak > min_bytes:
+                regressions.append(f"{case} {phase}: peak {current['peak_bytes'] / 2**20:.1f} MiB "
+                                   f"vs {base['peak_bytes'] / 2**20:.1f} MiB")
+    return regressions
+
+
+def environment(args):
+    info = {"python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpu_count": os.cpu_count(), "numpy": np.__version__,
+            "backend": args.backend, "repeat": args.repeat, "format": args.format,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    if args.backend == "gurobi":
+        import gurobipy
+
+        info["gurobi"] = ".".join(str(v) for v in gurobipy.gurobi.version())
+    return info
+
+
+def main():
+    # Each run is compared against benchmarks/baseline-<backend>.json. The
+    # committed baselines are the quick preset on the machine named in
+    # their environment block; timings only compare on like hardware, so
+    # on a new machine record one first with --write-baseline (from a
+    # clean checkout of the revision to compare against), then rerun.
+    parser = argparse.ArgumentParser(description="Per-phase timings and peak memory on generated instances.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--sizes", nargs="+", help="instance sizes as WAREHOUSESxCLIENTS (overrides --preset)")
+    parser.add_argument("--kinds", nargs="+", choices=list(KINDS), default=list(KINDS))
+    parser.add_argument("--backend", choices=["gurobi", "native"], default="gurobi")
+    parser.add_argument("--format", choices=["npz", "csv", "json"], default="npz",
+                        help="project file format read by the ingest phase")
+    parser.add_argument("--repeat", type=int, default=7, help="timed runs per phase; the median is kept")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the tracemalloc run of each phase")
+    parser.add_argument("--max-widget-arcs", type=int, default=1_000_000,
+                        help="skip the widget phases above this many arcs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=os.path.join(ROOT, "benchmarks", "results.json"))
+    parser.add_argument("--baseline", help="baseline file (default: benchmarks/baseline-<backend>.json)")
+    parser.add_argument("--write-baseline", "--update-baseline", dest="write_baseline", action="store_true",
+                        help="store these results as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    # Phases of a few milliseconds swing by several of them between runs.
+    parser.add_argument("--min-seconds", type=float, default=0.02)
+    parser.add_argument("--min-bytes", type=int, default=2**20)
+    args = parser.parse_args()
+
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    env = None
+    if args.backend == "gurobi":
+        from gurobipy import Env
+
+        env = Env(params={"OutputFlag": 0})
+
+    results = {"environment": environment(args), "cases": {}}
+    print(f"{'case':>28} " + " ".join(f"{phase:>13}" for phase in PHASES))
+    for size in args.sizes or PRESETS[args.preset]:
+        m, n = (int(v) for v in size.lower().split("x"))
+        for kind in args.kinds:
+            density, balanced = KINDS[kind]
+            density = min(1.0, 10 / m) if density is None else density
+            name = f"{kind}-{size}"
+            instance = generate_instance(m, n, density, balanced, args.seed)
+            entry = run_case(name, instance, args, app, env)
+            results["cases"][name] = entry
+            cells = []
+            for phase in PHASES:
+                timing = entry["phases"].get(phase, {})
+                cells.append(f"{timing['seconds']:>12.4f}s" if "seconds" in timing else f"{'-':>13}")
+            print(f"{name:>28} " + " ".join(cells))
+    if env is not None:
+        env.dispose()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    baseline_path = args.baseline or os.path.join(ROOT, "benchmarks", f"baseline-{args.backend}.json")
+    if args.write_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written: {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        print("No baseline to compare against; store one with --write-baseline.")
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline["environment"]["backend"] != args.backend:
+        print(f"Baseline was measured with {baseline['environment']['backend']}; not comparing.")
+        return 0
+    if any(baseline["environment"].get(key) != results["environment"][key] for key in ("machine", "cpu_count")):
+        print(f"Baseline was measured on another machine ({baseline['environment'].get('cpu_count')} CPUs, "
+              f"created {baseline['environment'].get('created')}); not comparing. "
+              "Record one here with --write-baseline.")
+        return 0
+    regressions = compare(results, baseline, args.tolerance, args.min_seconds, args.min_bytes)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%}).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
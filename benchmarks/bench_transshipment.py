@@ -0,0 +1,93 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
+
+from EnvPool import EnvPool
+from NetworkInstance import NetworkInstance
+from SolverBackend import get_backend
+from TransportInstance import TransportInstance
+
+
+def generate(num_warehouses, num_hubs, num_clients, hubs_per_warehouse, hubs_per_client, seed):
+    # Warehouses feed a few hubs each, and every client is served by a few
+    # hubs, as in a two-echelon distribution network. No capacities, so the
+    # flattened bipartite instance below has the same optimum.
+    rng = np.random.default_rng(seed)
+    m, h, n = num_warehouses, num_hubs, num_clients
+    first = np.repeat(np.arange(m), hubs_per_warehouse)
+    first_heads = m + rng.integers(0, h, len(first))
+    second_tails = m + rng.integers(0, h, n * hubs_per_client)
+    second_heads = m + h + np.repeat(np.arange(n), hubs_per_client)
+    cells = np.unique(np.concatenate([first * (m + h + n) + first_heads,
+                                      second_tails * (m + h + n) + second_heads]))
+    tails, heads = np.divmod(cells, m + h + n)
+    demands = rng.integers(10, 100, n)
+    supplies = np.full(m, int(demands.sum() * 1.2 / m) + 1)
+    return NetworkInstance([f"W{i}" for i in range(m)], supplies, [f"H{k}" for k in range(h)],
+                           np.full(h, np.inf), [f"C{j}" for j in range(n)], demands,
+                           tails, heads, rng.integers(1, 50, len(tails)))
+
+
+def flatten(network):
+    # Today's workaround: one direct lane per warehouse/client pair, priced
+    # at the cheapest route through the hubs.
+    graph = sp.csr_matrix((network.costs, (network.tails, network.heads)),
+                          shape=(network.num_nodes, network.num_nodes))
+    m, h = network.num_warehouses, network.num_hubs
+    routes = dijkstra(graph, indices=np.arange(m))[:, m + h:]
+    return TransportInstance.from_dense(network.warehouse_names, network.supplies,
+                                        network.client_names, network.demands, routes)
+
+
+def timed(backend, instance, network, pool):
+    kwargs = {"pool": pool} if backend == "gurobi" else {}
+    start = time.perf_counter()
+    try:
+        solution = get_backend(backend, network=network, **kwargs).solve(instance)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, solution.objective
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Min-cost flow on a hub network against its flattened bipartite form.")
+    parser.add_argument("--sizes", nargs="+", default=["10x5x200", "30x10x1000", "50x20x3000"],
+                        help="networks as WAREHOUSESxHUBSxCLIENTS")
+    parser.add_argument("--hubs-per-warehouse", type=int, default=3)
+    parser.add_argument("--hubs-per-client", type=int, default=2)
+    parser.add_argument("--backends", nargs="+", default=["native", "gurobi"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pool = EnvPool(profiles={"bench": {"OutputFlag": 0, "Threads": 1}},
+                   default_profile="bench") if "gurobi" in args.backends else None
+    print(f"{'network':>12} {'backend':>8} {'arcs':>9} {'network s':>10} {'lanes':>9} {'flattened s':>12} {'objectives':>20}")
+    for size in args.sizes:
+        m, h, n = (int(v) for v in size.lower().split("x"))
+        network = generate(m, h, n, args.hubs_per_warehouse, args.hubs_per_client, args.seed)
+        start = time.perf_counter()
+        flat = flatten(network)
+        flatten_time = time.perf_counter() - start
+        for backend in args.backends:
+            network_time, network_obj = timed(backend, network, True, pool)
+            flat_time, flat_obj = timed(backend, flat, False, pool)
+
+            def seconds(value):
+                return f"{value:.3f}" if value is not None else "-"
+
+            flat_total = None if flat_time is None else flat_time + flatten_time
+            print(f"{size:>12} {backend:>8} {network.num_arcs:>9} {seconds(network_time):>10} "
+                  f"{flat.num_arcs:>9} {seconds(flat_total):>12} {network_obj!s:>9} / {flat_obj!s}")
+    if pool is not None:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
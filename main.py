@@ -1,10 +1,158 @@
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication
 
-from MainWindow import MainWindow
+from SolverBackend import BACKENDS, NETWORK_BACKENDS
+from StochasticTransport import DISTRIBUTIONS
+
+
+def run_gui():
+    # Qt is only imported when a window is actually opened.
+    from PyQt5.QtWidgets import QApplication
+    from MainWindow import MainWindow
 
-if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    return app.exec_()
+
+
+def run_solve(args):
+    from HeadlessSolve import solve_files
+    from Instrumentation import instrumentation
+
+    instrumentation.enabled = args.trace is not None
+    try:
+        return solve_files(args.inputs, args.backend, args.output, args.format, args.cache)
+    finally:
+        if args.trace is not None:
+            instrumentation.save_chrome_trace(args.trace)
+
+
+def run_sweep(args):
+    import numpy as np
+
+    import ProjectIO
+    from DenseTransportInstance import DenseTransportInstance
+    from ScenarioSweep import ScenarioSweep
+
+    instance = ProjectIO.load_instance(args.base)
+    if isinstance(instance, DenseTransportInstance):
+        instance = instance.to_transport()
+    with np.load(args.scenarios, allow_pickle=False) as data:
+        perturbations = {key: data[key] for key in ("demands", "cost_scale", "outages") if key in data}
+    sweep = ScenarioSweep(instance, args.backend, args.workers, args.threads)
+    result = sweep.run(**perturbations)
+    result.save(args.output)
+    print(f"{result.num_scenarios} scenarios, {int(result.optimal.sum())} optimal, "
+          f"{result.runtime:.2f}s with {sweep.workers} workers", file=sys.stderr)
+    return 0 if result.optimal.all() else 1
+
+
+def run_plan(args):
+    from HeadlessSolve import plan_file
+    from Instrumentation import instrumentation
+
+    instrumentation.enabled = args.trace is not None
+    try:
+        return plan_file(args.input, args.backend, args.mode, args.window, args.output, not args.cold)
+    finally:
+        if args.trace is not None:
+            instrumentation.save_chrome_trace(args.trace)
+
+
+def run_stochastic(args):
+    import numpy as np
+
+    from HeadlessSolve import stochastic_file
+
+    scenarios = None
+    if args.scenarios is not None:
+        with np.load(args.scenarios, allow_pickle=False) as data:
+            scenarios = data["demands"]
+    return stochastic_file(args.base, scenarios, args.samples, args.distribution, args.spread, args.evaluate,
+                           args.seed, args.penalty, args.surplus_cost, args.output)
+
+
+def run_serve(args):
+    import asyncio
+
+    from SolveServer import SolveServer
+
+    server = SolveServer(args.backend, args.queue, args.workers, args.batch_size, args.batch_max_arcs)
+    print(f"Solving on {args.address} with {args.backend}, {args.workers} worker(s)", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever(args.address))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transportation Problem Solver")
+    commands = parser.add_subparsers(dest="command")
+    solve = commands.add_parser("solve", help="solve project files without opening the window")
+    solve.add_argument("inputs", nargs="+",
+                       help="project files (.csv, .json or .npz); an .npz with a dense cost_matrix "
+                            "is solved by pricing its lanes into a restricted model")
+    solve.add_argument("-b", "--backend", choices=list(BACKENDS), default="gurobi")
+    solve.add_argument("-o", "--output",
+                       help="result file (.json or .csv), or a directory when solving several inputs; "
+                            "defaults to stdout")
+    solve.add_argument("-f", "--format", choices=["json", "csv"],
+                       help="result format for stdout or an output directory (default: json)")
+    solve.add_argument("--cache", help="SQLite file to reuse solutions across runs")
+    solve.add_argument("--trace", help="write timing spans of the run as a Chrome trace (.json)")
+    sweep = commands.add_parser("sweep", help="solve stacked demand/cost/outage scenarios in parallel")
+    sweep.add_argument("base", help="base project file")
+    sweep.add_argument("scenarios",
+                       help=".npz with any of demands (S x clients), cost_scale (S or S x arcs) "
+                            "and outages (S x warehouses)")
+    sweep.add_argument("-o", "--output", required=True, help=".npz receiving objectives, flows and statuses")
+    sweep.add_argument("-b", "--backend", choices=list(BACKENDS), default="gurobi")
+    sweep.add_argument("-w", "--workers", type=int,
+                       help="worker processes (default: cores / threads); with gurobi at most "
+                            "GUROBI_SESSION_LIMIT, one license session each")
+    sweep.add_argument("-t", "--threads", type=int, default=1, help="Gurobi threads per worker")
+    plan = commands.add_parser("plan", help="plan a multi-period project period by period")
+    plan.add_argument("input", help="multi-period project file (.npz with per-period supplies, demands, "
+                                    "costs and holding costs)")
+    plan.add_argument("-b", "--backend", choices=list(NETWORK_BACKENDS), default="gurobi")
+    plan.add_argument("-m", "--mode", choices=["rolling", "monolithic"], default="rolling",
+                      help="re-solve a window moving one period at a time, or solve every period at once")
+    plan.add_argument("-w", "--window", type=int, default=4, help="periods looked ahead by the rolling horizon")
+    plan.add_argument("--cold", action="store_true",
+                      help="rebuild every window from scratch instead of updating one model")
+    plan.add_argument("-o", "--output", help="plan file (.json); defaults to stdout")
+    plan.add_argument("--trace", help="write timing spans of the run as a Chrome trace (.json)")
+    stochastic = commands.add_parser("stochastic", help="plan shipments for uncertain demand")
+    stochastic.add_argument("base", help="project file; its demands are the mean of sampled scenarios")
+    stochastic.add_argument("-s", "--scenarios", help=".npz with demands (S x clients) to plan against "
+                                                      "instead of sampled ones")
+    stochastic.add_argument("-d", "--distribution", choices=list(DISTRIBUTIONS), default="normal")
+    stochastic.add_argument("--spread", type=float, default=0.2,
+                            help="coefficient of variation of sampled demand (default: 0.2)")
+    stochastic.add_argument("-n", "--samples", type=int, default=200, help="scenarios in the model")
+    stochastic.add_argument("-e", "--evaluate", type=int, default=10_000,
+                            help="fresh scenarios the plan is scored on")
+    stochastic.add_argument("-p", "--penalty", type=float,
+                            help="cost per unit of unmet demand (default: twice the dearest lane)")
+    stochastic.add_argument("--surplus-cost", type=float, default=0.0, help="cost per unit delivered beyond demand")
+    stochastic.add_argument("--seed", type=int, default=0)
+    stochastic.add_argument("-o", "--output", help="report file (.json); defaults to stdout")
+    serve = commands.add_parser("serve", help="run a local solve server that windows can submit to")
+    serve.add_argument("-a", "--address", default="127.0.0.1:8765",
+                       help="host:port, or unix:/path for a Unix socket (default: 127.0.0.1:8765)")
+    serve.add_argument("-b", "--backend", choices=list(BACKENDS), default="gurobi",
+                       help="backend for requests that do not name one")
+    serve.add_argument("-w", "--workers", type=int, default=1, help="solves running at once")
+    serve.add_argument("-q", "--queue", type=int, default=64, help="most jobs waiting before new ones are refused")
+    serve.add_argument("--batch-size", type=int, default=8, help="most small jobs solved in one batch")
+    serve.add_argument("--batch-max-arcs", type=int, default=5_000, help="largest job that counts as small")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    commands = {"solve": run_solve, "sweep": run_sweep, "plan": run_plan, "stochastic": run_stochastic,
+                "serve": run_serve}
+    sys.exit(commands[args.command](args) if args.command in commands else run_gui())
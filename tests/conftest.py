@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Before any PyQt5 import, so the Qt tests run on a machine without a display.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,67 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+
+def transport_optimum(instance):
+    # The instance as a plain LP solved by HiGHS: the optimal cost, or
+    # None when no plan meets every demand.
+    a = instance.num_arcs
+    supply = sp.csr_matrix((np.ones(a), (instance.rows, np.arange(a))), shape=(instance.num_warehouses, a))
+    delivery = sp.csr_matrix((np.ones(a), (instance.cols, np.arange(a))), shape=(instance.num_clients, a))
+    result = linprog(instance.costs, A_ub=supply, b_ub=instance.supplies, A_eq=delivery,
+                     b_eq=instance.demands, bounds=(0, None), method="highs")
+    return result.fun if result.status == 0 else None
+
+
+def random_transport(rng, num_warehouses, num_clients, density=0.6, slack=1.2):
+    # A random instance with supply to spare; some lanes missing and, now
+    # and then, a lane listed twice at different costs.
+    from TransportInstance import TransportInstance
+
+    rows, cols = np.nonzero(rng.random((num_warehouses, num_clients)) < density)
+    repeated = rng.random(len(rows)) < 0.1
+    rows, cols = np.concatenate([rows, rows[repeated]]), np.concatenate([cols, cols[repeated]])
+    demands = rng.integers(1, 30, num_clients).astype(np.float64)
+    supplies = rng.dirichlet(np.ones(num_warehouses)) * demands.sum() * slack
+    return TransportInstance([f"W{i}" for i in range(num_warehouses)], np.ceil(supplies),
+                             [f"C{j}" for j in range(num_clients)], demands,
+                             rows, cols, rng.integers(1, 50, len(rows)).astype(np.float64))
+
+
+def network_optimum(network):
+    # The transshipment LP as the network builders state it: warehouses
+    # ship at most their supply, hubs pass on all they receive up to their
+    # throughput, clients receive their demand, arcs carry at most their
+    # capacity.
+    a = network.num_arcs
+    m, h = network.num_warehouses, network.num_hubs
+    arcs = np.arange(a)
+    outflow = sp.csr_matrix((np.ones(a), (network.tails, arcs)), shape=(network.num_nodes, a))
+    inflow = sp.csr_matrix((np.ones(a), (network.heads, arcs)), shape=(network.num_nodes, a))
+    limited = np.flatnonzero(np.isfinite(network.throughputs))
+    a_ub = sp.vstack([outflow[:m], inflow[m:m + h][limited]])
+    b_ub = np.concatenate([network.supplies, network.throughputs[limited]])
+    a_eq = sp.vstack([inflow[m:m + h] - outflow[m:m + h], inflow[m + h:]])
+    b_eq = np.concatenate([np.zeros(h), network.demands])
+    bounds = [(0, None if np.isinf(c) else c) for c in network.capacities.tolist()]
+    result = linprog(network.costs, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=b_eq, bounds=bounds, method="highs")
+    return result.fun if result.status == 0 else None
+
+
+def random_network(rng, num_warehouses, num_hubs, num_clients, density=0.5):
+    # Arcs from warehouses and hubs to hubs and clients, some of them and
+    # some hubs with a limit; tight enough that a few instances have no plan.
+    from NetworkInstance import NetworkInstance
+
+    m, h, n = num_warehouses, num_hubs, num_clients
+    tails, heads = np.nonzero(rng.random((m + h, h + n)) < density)
+    heads = heads + m
+    keep = tails != heads
+    tails, heads = tails[keep], heads[keep]
+    k = len(tails)
+    capacities = np.where(rng.random(k) < 0.3, rng.integers(5, 40, k), np.inf)
+    throughputs = np.where(rng.random(h) < 0.5, rng.integers(20, 80, h), np.inf)
+    return NetworkInstance([f"W{i}" for i in range(m)], rng.integers(20, 60, m), [f"H{i}" for i in range(h)],
+                           throughputs, [f"C{j}" for j in range(n)], rng.integers(5, 25, n),
+                           tails, heads, rng.integers(0, 30, k).astype(np.float64), capacities)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from ColumnGeneration import ColumnGeneration
+from DenseTransportInstance import DenseTransportInstance
+from lp_reference import transport_optimum
+from TransportSolution import TransportSolution
+
+BACKENDS = ["native", "gurobi"]
+
+
+def dense_instance(seed):
+    # Up to 70% of the lanes missing; every third instance has supply to
+    # spare, the rest may have none.
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(1, 12), rng.integers(1, 15)
+    costs = rng.integers(0, 50, (m, n)).astype(np.float64)
+    costs[rng.random((m, n)) < rng.choice([0, 0.3, 0.7])] = np.inf
+    demands = rng.integers(0, 30, n)
+    supplies = rng.integers(0, 60, m)
+    if seed % 3 == 0:
+        supplies = supplies + demands.sum() // m + 1
+    return DenseTransportInstance([f"W{i}" for i in range(m)], supplies, [f"C{j}" for j in range(n)], demands, costs)
+
+
+def solver(instance, name, **options):
+    if name == "gurobi":
+        pytest.importorskip("gurobipy")
+    return ColumnGeneration(instance, name, **options)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("seed", range(15))
+def test_matches_the_full_problem(name, seed):
+    instance = dense_instance(seed)
+    reference = transport_optimum(instance.to_transport())
+    # Small blocks and few starting lanes, so pricing does the work.
+    solution = solver(instance, name, lanes_per_client=1, block_cells=7).solve()
+    if reference is None:
+        assert solution.status == TransportSolution.INFEASIBLE
+        return
+    assert solution.is_optimal
+    assert solution.objective == pytest.approx(reference)
+    restricted, flows = solution.instance, solution.flows
+    assert (np.bincount(restricted.rows, flows, instance.num_warehouses) <= instance.supplies + 1e-6).all()
+    assert (np.bincount(restricted.cols, flows, instance.num_clients) >= instance.demands - 1e-6).all()
+    assert np.isfinite(restricted.costs[flows > 0]).all()
+
+
+def test_restricted_problem_is_smaller_than_the_full_one():
+    rng = np.random.default_rng(0)
+    m, n = 40, 60
+    instance = DenseTransportInstance([f"W{i}" for i in range(m)], np.full(m, 100.0), [f"C{j}" for j in range(n)],
+                                      rng.integers(1, 50, n), rng.integers(1, 100, (m, n)).astype(np.float64))
+    cg = solver(instance, "native")
+    solution = cg.solve()
+    assert solution.objective == pytest.approx(transport_optimum(instance.to_transport()))
+    assert solution.instance.num_arcs < m * n // 2
+    assert cg.rounds >= 1
+
+
+def test_round_limit():
+    instance = dense_instance(3)
+    solution = solver(instance, "native", lanes_per_client=1, block_cells=7, max_rounds=0).solve()
+    assert solution.status == TransportSolution.ITERATION_LIMIT
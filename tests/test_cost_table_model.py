@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from CostTableModel import CostTableModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def model(app):
+    model = CostTableModel()
+    model.load(["W1", "W2"], ["C1", "C2", "C3"], [0, 0, 1], [0, 2, 1], [4, 2.5, 7])
+    return model
+
+
+def text(model, i, j, role=Qt.DisplayRole):
+    return model.data(model.index(i, j), role)
+
+
+def changed_cells(model, action):
+    cells = []
+    model.dataChanged.connect(lambda first, last, *_: cells.append((first.row(), first.column(),
+                                                                    last.row(), last.column())))
+    action()
+    return cells
+
+
+def test_load_and_extract(model):
+    assert (model.rowCount(), model.columnCount()) == (2, 3)
+    rows, cols, costs = model.cost_arrays()
+    assert list(zip(rows.tolist(), cols.tolist(), costs.tolist())) == [(0, 0, 4), (0, 2, 2.5), (1, 1, 7)]
+    assert [text(model, 0, j) for j in range(3)] == ["4", "∞", "2.5"]
+    assert text(model, 0, 1, Qt.ToolTipRole) == "No lane"
+
+
+def test_added_lines_keep_the_costs(model):
+    for k in range(5):
+        model.add_warehouse(f"X{k}")
+        model.add_client(f"Y{k}")
+    model.add_warehouse("W1")
+    assert (model.rowCount(), model.columnCount()) == (7, 8)
+    assert model.costs.shape == (7, 8)
+    assert model.costs[0, 0] == 4 and model.costs[1, 1] == 7
+    assert np.isnan(model.costs[2:]).all() and np.isnan(model.costs[:, 3:]).all()
+    model.set_cost("X4", "Y4", 9)
+    assert text(model, 6, 7) == "9"
+
+
+def test_set_cost_signals_one_cell(model):
+    assert changed_cells(model, lambda: model.set_cost("W2", "C3", 1)) == [(1, 2, 1, 2)]
+    assert changed_cells(model, lambda: model.set_cost("W9", "C3", 1)) == []
+    assert model.costs[1, 2] == 1
+
+
+def test_set_flows_signals_changed_cells_only(model):
+    model.set_flows({(0, 0): 5, (1, 1): 3})
+    assert text(model, 0, 0) == "5" and text(model, 0, 0, Qt.BackgroundRole) == CostTableModel.SOLUTION_COLOR
+    cells = changed_cells(model, lambda: model.set_flows({(0, 0): 5, (0, 2): 1.5}))
+    assert sorted(cells) == [(0, 2, 0, 2), (1, 1, 1, 1)]
+    assert text(model, 0, 2) == "1.50" and text(model, 1, 1) == "7"
+
+
+def test_overlay_shows_reduced_costs_and_prices(model):
+    reduced = np.full((2, 3), np.nan)
+    reduced[0, 2] = 1.5
+    model.set_overlay({"reduced": reduced, "cost_low": np.full((2, 3), np.nan), "cost_up": np.full((2, 3), np.nan),
+                       "row_prices": np.array([-2.0, np.nan]), "col_prices": np.array([4.0, 5.0, 6.0])})
+    assert text(model, 0, 2) == "1.5" and text(model, 0, 0) == "4"
+    assert model.headerData(0, Qt.Vertical) == "W1 (π -2)"
+    assert model.headerData(1, Qt.Vertical) == "W2"
+    # A new line invalidates the overlay.
+    model.add_client("C4")
+    assert model.overlay is None and model.headerData(0, Qt.Horizontal) == "C1"
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from GraphLayout import column_layout, layered_layout, layout_key
+from LayoutController import LayoutController
+from NetworkInstance import NetworkInstance
+from TransportInstance import TransportInstance
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def bipartite(rows, cols, num_warehouses, num_clients, costs=None):
+    costs = np.ones(len(rows)) if costs is None else costs
+    return NetworkInstance.from_transport(TransportInstance(
+        [f"W{i}" for i in range(num_warehouses)], np.ones(num_warehouses),
+        [f"C{j}" for j in range(num_clients)], np.ones(num_clients), rows, cols, costs))
+
+
+def crossings(network, positions):
+    # Pairs of arcs whose ends are in opposite order along the layers.
+    y = positions[:, 1]
+    tails, heads = y[network.tails], y[network.heads]
+    above = (tails[:, None] - tails[None, :]) * (heads[:, None] - heads[None, :]) < 0
+    return int(above.sum()) // 2
+
+
+def test_barycenter_order_adds_no_crossings():
+    # Warehouse i serves client 5 - i, and a few neighbours: drawn as
+    # entered almost every pair of arcs crosses.
+    rows = [0, 1, 2, 3, 4, 5, 0, 2, 4]
+    cols = [5, 4, 3, 2, 1, 0, 4, 2, 0]
+    network = bipartite(rows, cols, 6, 6)
+    assert crossings(network, layered_layout(network)) == 0 < crossings(network, column_layout(network))
+    rng = np.random.default_rng(22)
+    for _ in range(20):
+        m, n = rng.integers(2, 8, 2)
+        rows, cols = np.nonzero(rng.random((m, n)) < 0.35)
+        network = bipartite(rows, cols, m, n)
+        assert crossings(network, layered_layout(network)) <= crossings(network, column_layout(network))
+
+
+def test_layout_key_follows_flows_not_costs():
+    network = bipartite([0, 0, 1], [0, 1, 1], 2, 2)
+    dearer = bipartite([0, 0, 1], [0, 1, 1], 2, 2, costs=np.array([5.0, 7.0, 9.0]))
+    assert layout_key(network, "layered") == layout_key(dearer, "layered")
+    assert layout_key(network, "layered", [1, 0, 2]) == layout_key(dearer, "layered", [1, 0, 2])
+    assert layout_key(network, "layered", [1, 0, 2]) != layout_key(network, "layered", [1, 1, 2])
+    assert layout_key(network, "layered", [1, 0, 2]) != layout_key(network, "layered")
+    assert layout_key(network, "layered") != layout_key(network, "force")
+    assert layout_key(network, "layered") != layout_key(bipartite([0, 1, 1], [0, 0, 1], 2, 2), "layered")
+
+
+def test_controller_shows_only_the_latest_request(app):
+    controller = LayoutController()
+    shown = []
+    controller.ready.connect(shown.append)
+    first = bipartite([0, 1], [1, 0], 2, 2)
+    second = bipartite([0, 1, 1], [0, 0, 1], 2, 2)
+    try:
+        controller.request(first, "layered")
+        controller.request(second, "layered")
+        # The worker is done once a later task runs; its results arrive as
+        # queued signals.
+        controller.executor.submit(lambda: None).result(5)
+        app.processEvents()
+        assert [layout.key for layout in shown] == [layout_key(second, "layered")]
+        # The stale layout was still kept, and comes back without a new run.
+        assert layout_key(first, "layered") in controller.cache
+        controller.request(first, "layered")
+        assert shown[-1].key == layout_key(first, "layered")
+    finally:
+        controller.shutdown()
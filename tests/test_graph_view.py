@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from TransportInstance import TransportInstance
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_repeated_arcs_in_one_batch(app):
+    # Enough arcs for the batched renderer, with every tenth listed twice.
+    from GraphVisualizationWidget import GraphVisualizationWidget
+
+    rows, cols = np.divmod(np.arange(600), 30)
+    rows, cols = np.concatenate([rows, rows[::10]]), np.concatenate([cols, cols[::10]])
+    costs = np.arange(len(rows), dtype=np.float64)
+    instance = TransportInstance([f"W{i}" for i in range(20)], np.full(20, 100.0),
+                                 [f"C{j}" for j in range(30)], np.ones(30), rows, cols, costs)
+    view = GraphVisualizationWidget()
+    view.load_instance(instance)
+    assert view.scalable
+    batch = view.edge_batch
+    assert len(batch.keys) == len(batch.labels) == 600
+    assert batch.labels[batch.index[("W0", "C0")]] == "600"
+
+
+def test_repeated_arcs_leave_no_items_behind(app):
+    # A repeated lane is one edge: switching to per-arc items and back
+    # removes every item that was drawn.
+    from PyQt5.QtWidgets import QGraphicsLineItem
+
+    from GraphVisualizationWidget import GraphVisualizationWidget
+
+    rows, cols = np.divmod(np.arange(600), 30)
+    rows, cols = np.concatenate([rows, rows[::10]]), np.concatenate([cols, cols[::10]])
+    instance = TransportInstance([f"W{i}" for i in range(20)], np.full(20, 100.0),
+                                 [f"C{j}" for j in range(30)], np.ones(30), rows, cols,
+                                 np.arange(len(rows), dtype=np.float64))
+    view = GraphVisualizationWidget()
+    view.load_instance(instance)
+    assert len(view.edges) == len(set(view.edges)) == 600
+    view.set_scalable(False)
+    assert len(view.edgeItems) == 600
+    view.set_scalable(True)
+    assert not [item for item in view.scene.items() if isinstance(item, QGraphicsLineItem)]
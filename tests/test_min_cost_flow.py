@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from lp_reference import network_optimum, random_network, random_transport, transport_optimum
+from MinCostFlow import MinCostFlow
+from NetworkInstance import NetworkInstance
+from SolverBackend import get_backend
+from TransportSolution import TransportSolution
+
+BACKENDS = ["native", "gurobi"]
+
+
+def backend(name):
+    if name == "gurobi":
+        pytest.importorskip("gurobipy")
+    return get_backend(name, network=True)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("seed", range(12))
+def test_matches_the_reference_optimum(name, seed):
+    rng = np.random.default_rng(seed)
+    network = random_network(rng, *rng.integers(1, 6, 3))
+    reference = network_optimum(network)
+    solution = backend(name).solve(network)
+    if reference is None:
+        assert solution.status == TransportSolution.INFEASIBLE
+        return
+    assert solution.is_optimal
+    assert solution.objective == pytest.approx(reference)
+    assert solution.objective == pytest.approx(float(network.costs @ solution.flows))
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_flows_respect_every_limit(seed):
+    rng = np.random.default_rng(seed)
+    network = random_network(rng, *rng.integers(1, 6, 3))
+    solution = backend("native").solve(network)
+    if not solution.is_optimal:
+        return
+    flows, tol = solution.flows, 1e-9
+    m, h = network.num_warehouses, network.num_hubs
+    inflow = np.bincount(network.heads, flows, network.num_nodes)
+    outflow = np.bincount(network.tails, flows, network.num_nodes)
+    assert (flows >= -tol).all() and (flows <= network.capacities + tol).all()
+    assert (outflow[:m] <= network.supplies + tol).all()
+    np.testing.assert_allclose(inflow[m:m + h], outflow[m:m + h], atol=1e-6)
+    assert (inflow[m:m + h] <= network.throughputs + tol).all()
+    np.testing.assert_allclose(inflow[m + h:], network.demands, atol=1e-6)
+
+
+def test_a_transport_instance_solves_as_a_network():
+    instance = random_transport(np.random.default_rng(4), 5, 8)
+    solution = backend("native").solve(NetworkInstance.from_transport(instance))
+    assert solution.objective == pytest.approx(transport_optimum(instance))
+
+
+def test_hub_throughput_forces_the_dearer_route():
+    # Through the hub costs 2 a unit but it passes only 4 of 10; the
+    # direct lane costs 5.
+    network = NetworkInstance(["W"], [10], ["H"], [4], ["C"], [10], [0, 0, 1], [1, 2, 2], [1, 5, 1])
+    solution = backend("native").solve(network)
+    assert solution.flows.tolist() == [4, 6, 4]
+    assert solution.objective == 38
+
+
+def test_rejects_negative_costs():
+    network = NetworkInstance(["W"], [10], [], [], ["C"], [5], [0], [1], [-1])
+    with pytest.raises(ValueError):
+        MinCostFlow(network).solve()
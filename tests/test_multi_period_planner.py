@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from InstanceGenerator import generate_multi_period
+from lp_reference import network_optimum
+from MultiPeriodPlanner import MultiPeriodPlanner
+
+BACKENDS = ["native", "gurobi"]
+
+
+@pytest.fixture
+def instance():
+    return generate_multi_period(3, 5, periods=6, seed=1)
+
+
+def plan(instance, backend, mode="rolling", window=3, **kwargs):
+    if backend == "gurobi":
+        pytest.importorskip("gurobipy")
+    solution = MultiPeriodPlanner(instance, backend, mode, window, **kwargs).solve()
+    assert solution.is_optimal
+    return solution
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_a_window_over_the_horizon_is_the_monolithic_plan(instance, backend):
+    monolithic = plan(instance, backend, "monolithic")
+    assert monolithic.objective == pytest.approx(network_optimum(instance.to_network()))
+    rolling = plan(instance, backend, window=instance.num_periods)
+    assert rolling.objective == pytest.approx(monolithic.objective)
+    assert rolling.period_costs.sum() == pytest.approx(rolling.objective)
+
+
+def test_warm_and_cold_windows_agree(instance):
+    warm = plan(instance, "gurobi", warm=True)
+    cold = plan(instance, "gurobi", warm=False)
+    assert warm.objective == pytest.approx(cold.objective)
+    assert warm.solves == cold.solves == instance.num_periods
+
+
+@pytest.mark.parametrize("window", [1, 3])
+def test_backends_agree(instance, window):
+    native, gurobi = (plan(instance, backend, window=window) for backend in BACKENDS)
+    assert native.objective == pytest.approx(gurobi.objective)
+    np.testing.assert_allclose(native.period_costs, gurobi.period_costs)
+
+
+@pytest.mark.parametrize("mode", ["rolling", "monolithic"])
+def test_a_given_env_stays_out_of_the_pool(instance, mode):
+    pytest.importorskip("gurobipy")
+    from gurobipy import Env
+
+    from EnvPool import EnvPool
+
+    pool = EnvPool()
+    env = Env(params={"OutputFlag": 0})
+    try:
+        plan = MultiPeriodPlanner(instance, "gurobi", mode, window=3, pool=pool, env=env).solve()
+        assert plan.is_optimal
+        # The pool neither lent its env nor received the caller's.
+        assert pool.stats()["acquired"] == 0
+        assert pool.in_use == 0 and pool._idle.qsize() == pool.size
+    finally:
+        pool.close()
+        env.dispose()
+
+
+def test_an_env_taken_from_the_pool_goes_back(instance):
+    pytest.importorskip("gurobipy")
+    from EnvPool import EnvPool
+
+    pool = EnvPool()
+    try:
+        assert MultiPeriodPlanner(instance, "gurobi", "rolling", window=3, pool=pool).solve().is_optimal
+        assert pool.stats()["acquired"] == 1 and pool._idle.qsize() == pool.size
+    finally:
+        pool.close()
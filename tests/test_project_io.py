@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import ProjectIO
+from NetworkInstance import NetworkInstance
+from TransportInstance import TransportInstance
+
+
+@pytest.fixture
+def instance():
+    return TransportInstance(["W1", "W2"], [30, 25], ["C1", "C2", "C3"], [10, 20, 15],
+                             [0, 0, 1, 1], [0, 1, 1, 2], [4, 6, 5, 3.5])
+
+
+@pytest.mark.parametrize("ext", ["csv", "json", "npz"])
+def test_round_trip(tmp_path, instance, ext):
+    path = str(tmp_path / f"project.{ext}")
+    ProjectIO.save_instance(instance, path)
+    loaded = ProjectIO.load_instance(path)
+    assert loaded.warehouse_names == instance.warehouse_names
+    assert loaded.client_names == instance.client_names
+    for name in ("supplies", "demands", "rows", "cols", "costs"):
+        assert np.array_equal(getattr(loaded, name), getattr(instance, name))
+
+
+def test_network_round_trip(tmp_path):
+    network = NetworkInstance(["W"], [10], ["H"], [np.inf], ["A"], [4], [0, 1, 0], [1, 2, 2], [1, 1, 5],
+                              [8, np.inf, np.inf])
+    path = str(tmp_path / "network.json")
+    ProjectIO.save_instance(network, path)
+    loaded = ProjectIO.load_instance(path)
+    assert isinstance(loaded, NetworkInstance)
+    assert np.array_equal(loaded.capacities, network.capacities)
+    assert np.array_equal(loaded.costs, network.costs)
+
+
+def test_csv_repeated_lane_keeps_the_last_cost(tmp_path):
+    path = tmp_path / "repeated.csv"
+    path.write_text("type,name,target,value\n"
+                    "warehouse,W,,10\nclient,C1,,5\nclient,C2,,5\n"
+                    "cost,W,C1,3\ncost,W,C2,4\ncost,W,C1,7\n", encoding="utf-8")
+    # A chunk size of 1 spreads the repeats across chunks.
+    loaded = ProjectIO._load_csv(str(path), chunk_size=1)
+    assert loaded.num_arcs == 2
+    assert sorted(zip(loaded.cols.tolist(), loaded.costs.tolist())) == [(0, 7.0), (1, 4.0)]
+
+
+def test_solution_csv_lists_active_lanes(tmp_path, instance):
+    from TransportSolution import TransportSolution
+
+    solution = TransportSolution(instance, TransportSolution.OPTIMAL, 10.0, [10, 0, 20, 0], "test")
+    path = tmp_path / "solution.csv"
+    ProjectIO.save_solution(solution, str(path))
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "warehouse,client,quantity,unit_cost", "W1,C1,10,4", "W2,C2,20,5"]
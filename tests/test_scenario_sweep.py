@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from ScenarioSweep import ScenarioSweep
+from SolverBackend import get_backend
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+BACKENDS = ["native", "gurobi"]
+
+
+@pytest.fixture(scope="module")
+def scenarios():
+    rng = np.random.default_rng(2)
+    m, n, count = 4, 7, 9
+    rows, cols = np.divmod(np.arange(m * n), n)
+    instance = TransportInstance([f"W{i}" for i in range(m)], rng.integers(30, 60, m).astype(np.float64),
+                                 [f"C{j}" for j in range(n)], rng.integers(5, 20, n).astype(np.float64),
+                                 rows, cols, rng.integers(1, 50, m * n).astype(np.float64))
+    demands = instance.demands * rng.uniform(0.8, 1.2, (count, n))
+    cost_scale = rng.uniform(0.9, 1.4, count)
+    outages = rng.random((count, m)) < 0.2
+    # One scenario with every warehouse out, which cannot be served.
+    outages[4] = True
+    return instance, demands, cost_scale, outages
+
+
+def variant(instance, demands, cost_scale, outages, s):
+    return TransportInstance(instance.warehouse_names, np.where(outages[s], 0, instance.supplies),
+                             instance.client_names, demands[s], instance.rows, instance.cols,
+                             instance.costs * cost_scale[s])
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_matches_independent_solves(name, scenarios):
+    if name == "gurobi":
+        pytest.importorskip("gurobipy")
+    instance, demands, cost_scale, outages = scenarios
+    result = ScenarioSweep(instance, name, workers=2, chunk_size=2).run(demands, cost_scale, outages)
+    assert result.num_scenarios == len(demands)
+    assert result.flows.shape == (len(demands), instance.num_arcs)
+    for s in range(len(demands)):
+        alone = variant(instance, demands, cost_scale, outages, s)
+        expected = get_backend("native").solve(alone)
+        assert result.statuses[s] == expected.status
+        if expected.is_optimal:
+            assert result.objectives[s] == pytest.approx(expected.objective)
+            # Ties may ship differently; the stacked flows must be a plan
+            # for this scenario at that cost.
+            flows = result.flows[s]
+            assert float(alone.costs @ flows) == pytest.approx(expected.objective)
+            np.testing.assert_allclose(np.bincount(alone.cols, flows, alone.num_clients), alone.demands, atol=1e-6)
+            assert (np.bincount(alone.rows, flows, alone.num_warehouses) <= alone.supplies + 1e-6).all()
+        else:
+            assert np.isnan(result.objectives[s]) and not result.flows[s].any()
+    assert result.statuses[4] == TransportSolution.INFEASIBLE
+
+
+def test_gurobi_workers_stay_within_the_session_limit(scenarios, monkeypatch):
+    from EnvPool import EnvPool
+
+    instance = scenarios[0]
+    monkeypatch.setattr(EnvPool, "SESSION_LIMIT", 2)
+    assert ScenarioSweep(instance, "gurobi", workers=8).workers == 2
+    assert ScenarioSweep(instance, "gurobi", workers=8, sessions=3).workers == 3
+    assert ScenarioSweep(instance, "native", workers=8).workers == 8
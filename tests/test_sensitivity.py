@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from lp_reference import random_transport, transport_optimum
+from SolverBackend import get_backend
+from TransportInstance import TransportInstance
+
+
+def solve(name, instance):
+    if name == "gurobi":
+        pytest.importorskip("gurobipy")
+        solution = get_backend("gurobi", sensitivity=True).solve(instance)
+    else:
+        solution = get_backend("native").solve(instance)
+    assert solution.is_optimal
+    return solution
+
+
+def edited(instance, costs=None, supplies=None, demands=None):
+    return TransportInstance(instance.warehouse_names,
+                             instance.supplies if supplies is None else supplies,
+                             instance.client_names,
+                             instance.demands if demands is None else demands,
+                             instance.rows, instance.cols, instance.costs if costs is None else costs)
+
+
+def inside(value, low, up):
+    # Steps from value to halfway to each end of its range, or by 5 past an
+    # open end.
+    steps = []
+    for end, sign in ((up, 1), (low, -1)):
+        if np.isfinite(end):
+            steps.append((end - value) / 2)
+        elif not np.isnan(end):
+            steps.append(5.0 * sign)
+    return [step for step in steps if step]
+
+
+@pytest.fixture
+def instance():
+    # With a few lanes listed twice at different costs.
+    instance = random_transport(np.random.default_rng(14), 5, 8)
+    assert len(set(zip(instance.rows.tolist(), instance.cols.tolist()))) < instance.num_arcs
+    return instance
+
+
+@pytest.mark.parametrize("name", ["native", "gurobi"])
+def test_cost_change_matches_a_resolve(name, instance):
+    sensitivity = solve(name, instance).sensitivity
+    checked = 0
+    for i, j in set(zip(instance.rows.tolist(), instance.cols.tolist())):
+        w, c = instance.warehouse_names[i], instance.client_names[j]
+        lane = np.flatnonzero((instance.rows == i) & (instance.cols == j))
+        k = lane[np.argmin(instance.costs[lane])]
+        assert sensitivity.reduced_cost(w, c) == sensitivity.reduced_costs[k]
+        for delta in inside(instance.costs[k], sensitivity.cost_low[k], sensitivity.cost_up[k]):
+            costs = instance.costs.copy()
+            costs[k] += delta
+            assert sensitivity.cost_change(w, c, delta) == pytest.approx(transport_optimum(edited(instance, costs)))
+            checked += 1
+    assert checked > instance.num_arcs / 2
+
+
+@pytest.mark.parametrize("side", ["supplies", "demands"])
+def test_rhs_change_matches_a_resolve(side, instance):
+    sensitivity = solve("gurobi", instance).sensitivity
+    if side == "supplies":
+        names, low, up, change = (instance.warehouse_names, sensitivity.supply_low, sensitivity.supply_up,
+                                  sensitivity.supply_change)
+    else:
+        names, low, up, change = (instance.client_names, sensitivity.demand_low, sensitivity.demand_up,
+                                  sensitivity.demand_change)
+    values = getattr(instance, side)
+    checked = 0
+    for i, name in enumerate(names):
+        for delta in inside(values[i], low[i], up[i]):
+            changed = values.copy()
+            changed[i] += delta
+            assert change(name, delta) == pytest.approx(transport_optimum(edited(instance, **{side: changed})))
+            checked += 1
+        # Past the range only a re-solve can tell.
+        if np.isfinite(up[i]):
+            assert change(name, up[i] - values[i] + 1) is None
+    assert checked >= len(names)
+
+
+def test_native_has_no_rhs_ranges(instance):
+    sensitivity = solve("native", instance).sensitivity
+    assert sensitivity.supply_change("W0", 1) is None and sensitivity.demand_change("C0", -1) is None
@@ -0,0 +1,107 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from lp_reference import transport_optimum
+from SolutionCache import SolutionCache
+from SolverBackend import get_backend
+from TransportInstance import TransportInstance
+
+
+def instance(costs=(4, 6, 5, 3), supplies=(30, 25), demands=(10, 20, 15), order=(0, 1, 2, 3)):
+    rows, cols = np.array([0, 0, 1, 1]), np.array([0, 1, 1, 2])
+    order = list(order)
+    return TransportInstance(["W1", "W2"], supplies, ["C1", "C2", "C3"], demands,
+                             rows[order], cols[order], np.asarray(costs, dtype=np.float64)[order])
+
+
+def solve(inst):
+    return get_backend("native").solve(inst)
+
+
+def test_hit_ignores_arc_order():
+    cache = SolutionCache()
+    cache.put(solve(instance()))
+    shuffled = instance(order=(2, 0, 3, 1))
+    cached = cache.get(shuffled)
+    assert cached.objective == solve(shuffled).objective
+    np.testing.assert_allclose(cached.flows, solve(shuffled).flows)
+    assert cache.get(instance(costs=(4, 6, 5, 4))) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_disk_tier_outlives_the_process(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    cache = SolutionCache(path=path)
+    cache.put(solve(instance()))
+    cache.close()
+    reopened = SolutionCache(path=path)
+    assert reopened.get(instance()).objective == solve(instance()).objective
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+def test_disk_tier_evicts_the_least_recently_used(tmp_path):
+    # Every solution has four flows of eight bytes; three fit.
+    cache = SolutionCache(capacity=1, path=str(tmp_path / "solutions.sqlite"), disk_bytes=3 * 32)
+    first, second, third, fourth = (instance(costs=(4, 6, 5, c)) for c in (1, 2, 3, 4))
+    for inst in (first, second, third):
+        cache.put(solve(inst))
+    assert cache.get(first) is not None
+    cache.put(solve(fourth))
+    assert cache.stats()["evicted"] == 1
+    assert cache.get(second) is None
+    for inst in (first, third, fourth):
+        assert cache.get(inst) is not None
+    cache.close()
+
+
+def test_opens_a_file_written_before_eviction(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE solutions (fingerprint TEXT PRIMARY KEY, topology TEXT, objective REAL, "
+               "flows BLOB, backend TEXT, created REAL)")
+    db.commit()
+    db.close()
+    cache = SolutionCache(path=path)
+    cache.put(solve(instance()))
+    assert cache.get(instance()) is not None
+    cache.close()
+
+
+def test_warm_start_on_the_same_lanes():
+    cache = SolutionCache()
+    solution = solve(instance())
+    cache.put(solution)
+    np.testing.assert_allclose(cache.warm_start(instance(costs=(5, 6, 5, 3), order=(3, 2, 1, 0))),
+                               solution.flows[[3, 2, 1, 0]])
+
+
+@pytest.mark.parametrize("disk", [False, True])
+def test_warm_start_carries_flows_over_by_lane_name(tmp_path, disk):
+    cache = SolutionCache(path=str(tmp_path / "solutions.sqlite") if disk else None)
+    solution = solve(instance())
+    cache.put(solution)
+    if disk:
+        cache.close()
+        cache = SolutionCache(path=str(tmp_path / "solutions.sqlite"))
+    # Sites listed in another order, a new client and a new lane to it.
+    edited = TransportInstance(["W2", "W1"], [25, 40], ["C3", "C4", "C1", "C2"], [15, 10, 10, 20],
+                               [1, 1, 0, 0, 1], [3, 1, 3, 0, 2], [6, 2, 5, 3, 4])
+    start = cache.warm_start(edited)
+    shipped = dict(zip(map(instance().arc_key, range(4)), solution.flows))
+    assert start[:3].tolist() == [shipped[("W1", "C2")], 0, shipped[("W2", "C2")]]
+    assert start[3:].tolist() == [shipped[("W2", "C3")], shipped[("W1", "C1")]]
+    backend = get_backend("native")
+    backend.warm_start = start
+    assert backend.solve(edited).objective == pytest.approx(transport_optimum(edited))
+    cache.close()
+
+
+def test_no_warm_start_without_shared_lanes():
+    cache = SolutionCache()
+    assert cache.warm_start(instance()) is None
+    cache.put(solve(instance()))
+    other = TransportInstance(["X"], [10], ["Y"], [5], [0], [0], [1])
+    assert cache.warm_start(other) is None
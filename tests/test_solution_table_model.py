@@ -0,0 +1,92 @@
+import csv
+import io
+
+import numpy as np
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from NetworkInstance import NetworkInstance
+from SolutionTableModel import SolutionTableModel
+from TransportSolution import TransportSolution
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def model(app):
+    # Two warehouses, a hub and three clients; three lanes have no
+    # capacity and the last one carries nothing.
+    network = NetworkInstance(["North", "South"], [50, 40], ["Hub"], [np.inf], ["Alpha", "beta", "Gamma"],
+                              [20, 30, 25], [0, 2, 2, 1, 1, 0, 1], [2, 3, 4, 4, 5, 3, 3],
+                              [2, 1, 1, 4, 3, 5, 9], [40, np.inf, 20, np.inf, 50, np.inf, np.inf])
+    flows = [30, 10, 20, 10, 25, 10, 0]
+    model = SolutionTableModel()
+    model.set_solution(TransportSolution(network, TransportSolution.OPTIMAL, 255.0, flows, "native"))
+    return model
+
+
+def column(model, header):
+    headers = [model.headerData(j, Qt.Horizontal) for j in range(model.columnCount())]
+    j = headers.index(header)
+    return [model.data(model.index(i, j)) for i in range(model.rowCount())]
+
+
+def test_lanes_skip_idle_arcs(model):
+    assert (model.rowCount(), model.columnCount()) == (6, 6)
+    assert column(model, "From") == ["North", "Hub", "Hub", "South", "South", "North"]
+    assert column(model, "Utilization %") == ["75", "", "100", "", "50", ""]
+
+
+def test_no_capacity_sorts_last_either_way(model):
+    model.sort(5, Qt.AscendingOrder)
+    assert column(model, "Utilization %") == ["50", "75", "100", "", "", ""]
+    model.sort(5, Qt.DescendingOrder)
+    assert column(model, "Utilization %") == ["100", "75", "50", "", "", ""]
+    # Ties keep their order; names sort by name, not by node number.
+    assert column(model, "To") == ["beta", "Hub", "Gamma", "Alpha", "beta", "Alpha"]
+    model.sort(0)
+    assert column(model, "From") == ["Hub", "Hub", "North", "North", "South", "South"]
+
+
+def test_filter_matches_part_of_either_name(model):
+    model.set_filter(" ALP")
+    assert column(model, "To") == ["Alpha", "Alpha"]
+    assert model.totals() == {"rows": 2, "quantity": 20.0, "cost": 60.0}
+    model.set_filter("ou")
+    assert column(model, "From") == ["South", "South"]
+    model.set_filter("nowhere")
+    assert model.rowCount() == 0 and model.totals()["rows"] == 0
+    model.set_filter("")
+    assert model.rowCount() == 6
+
+
+def test_totals_per_view(model):
+    assert model.totals() == {"rows": 6, "quantity": 105.0, "cost": 255.0}
+    # Warehouses count what leaves them, clients what reaches them.
+    model.set_view("warehouses")
+    assert model.totals() == {"rows": 2, "quantity": 75.0, "cost": 225.0}
+    assert column(model, "Utilization %") == ["80", "87.50"]
+    model.set_view("clients")
+    assert model.totals() == {"rows": 3, "quantity": 75.0, "cost": 195.0}
+    assert column(model, "Fill %") == ["100", "100", "100"]
+    with pytest.raises(ValueError):
+        model.set_view("hubs")
+
+
+def test_csv_round_trip_keeps_the_table_order(model):
+    model.set_filter("h")
+    model.sort(2, Qt.DescendingOrder)
+    f = io.StringIO()
+    assert model.write_csv(f) == model.num_rows == 6
+    header, *rows = list(csv.reader(io.StringIO(f.getvalue())))
+    assert header == [model.headerData(j, Qt.Horizontal) for j in range(model.columnCount())]
+    for i, row in enumerate(rows):
+        assert row[:2] == [model.data(model.index(i, 0)), model.data(model.index(i, 1))]
+        values = np.array([float(cell) if cell else np.nan for cell in row[2:]])
+        expected = np.array([model.columns[j][1][model.order[i]] for j in range(2, 6)], dtype=np.float64)
+        np.testing.assert_array_equal(values, expected)
+    assert [float(row[2]) for row in rows] == [30, 25, 20, 10, 10, 10]
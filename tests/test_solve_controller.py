@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from SolveController import SolveController
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class BlockingSolver:
+    # Reports one incumbent, then waits until released or cancelled.
+    def __init__(self, name):
+        self.name = name
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.cancelled = False
+        self.closed = False
+
+    def solve(self, progress=None, incumbent=None):
+        self.started.set()
+        incumbent(f"{self.name} incumbent")
+        self.release.wait(5)
+        return f"{self.name} cancelled" if self.cancelled else f"{self.name} done"
+
+    def cancel(self):
+        self.cancelled = True
+        self.release.set()
+
+
+def wait_idle(app, controller, timeout=5):
+    end = time.monotonic() + timeout
+    while controller.busy and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+    app.processEvents()
+    assert not controller.busy
+
+
+@pytest.fixture
+def controller(app):
+    controller = SolveController()
+    controller.events = []
+    controller.incumbent.connect(lambda r: controller.events.append(("incumbent", r)))
+    controller.solved.connect(lambda r: controller.events.append(("solved", r)))
+    yield controller
+    controller.shutdown()
+
+
+def test_retire_waits_for_the_running_solve(app, controller):
+    solver = BlockingSolver("a")
+    controller.submit(solver)
+    controller.submit(solver)
+    assert solver.started.wait(5)
+    assert controller.retire(solver, lambda s: setattr(s, "closed", True)) is True
+    assert controller.pending is None
+    assert not solver.closed
+    solver.release.set()
+    wait_idle(app, controller)
+    assert solver.closed
+    assert controller.events[-1] == ("solved", "a done")
+
+
+def test_retire_of_an_idle_solver_closes_at_once(app, controller):
+    solver = BlockingSolver("a")
+    assert controller.retire(solver, lambda s: setattr(s, "closed", True)) is False
+    assert solver.closed
+
+
+def test_discard_drops_what_the_old_solve_reports(app, controller):
+    old, new = BlockingSolver("old"), BlockingSolver("new")
+    controller.submit(old)
+    assert old.started.wait(5)
+    controller.discard()
+    controller.submit(new)
+    new.release.set()
+    wait_idle(app, controller)
+    assert old.cancelled
+    assert controller.events == [("incumbent", "new incumbent"), ("solved", "new done")]
+
+
+def test_shutdown_closes_a_retired_running_solver(app):
+    controller = SolveController()
+    solver = BlockingSolver("a")
+    controller.submit(solver)
+    assert solver.started.wait(5)
+    controller.retire(solver, lambda s: setattr(s, "closed", True))
+    controller.shutdown()
+    assert solver.closed
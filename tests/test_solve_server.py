@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ProjectIO
+from SolveClient import RemoteBackend, SolveClient
+from SolveServer import SolveServer
+from TransportInstance import TransportInstance
+from TransportSolution import TransportSolution
+
+
+def instance(num_arcs, cost=1.0):
+    # One warehouse and num_arcs clients; cost tells instances apart.
+    return TransportInstance(["W"], [100], [f"C{j}" for j in range(num_arcs)], [1] * num_arcs,
+                             [0] * num_arcs, list(range(num_arcs)), [cost] * num_arcs)
+
+
+def request(inst, priority="normal"):
+    return {"instance": ProjectIO.instance_record(inst), "priority": priority, "backend": "native"}
+
+
+def next_batches(server, count):
+    async def take():
+        server._ready = asyncio.Condition()
+        return [[job.id for job in await asyncio.wait_for(server._next_batch(), 5)] for _ in range(count)]
+    return asyncio.run(take())
+
+
+def submit(server, inst, priority="normal"):
+    return server._submit(request(inst, priority), asyncio.Queue())
+
+
+def test_batches_never_run_a_job_ahead_of_its_turn():
+    server = SolveServer("native", batch_max_arcs=2)
+    a = submit(server, instance(1, 1.0))
+    b = submit(server, instance(3, 2.0))
+    c = submit(server, instance(1, 3.0), "low")
+    assert next_batches(server, 3) == [[a.id], [b.id], [c.id]]
+
+
+def test_small_jobs_of_one_priority_share_a_batch():
+    server = SolveServer("native", batch_size=3, batch_max_arcs=2)
+    jobs = [submit(server, instance(1, float(k))) for k in range(4)]
+    high = submit(server, instance(1, 9.0), "high")
+    assert next_batches(server, 3) == [[high.id], [j.id for j in jobs[:3]], [jobs[3].id]]
+
+
+def test_identical_submissions_share_a_job():
+    server = SolveServer("native")
+    first = submit(server, instance(2))
+    assert submit(server, instance(2)) is first
+    assert server.stats["deduplicated"] == 1
+
+
+def test_a_cancelled_job_is_not_joined():
+    server = SolveServer("native")
+    first = submit(server, instance(2))
+    first.cancelled = True
+    second = submit(server, instance(2))
+    assert second is not first
+    assert server._jobs[first.key] is second
+    assert server.stats["deduplicated"] == 0
+
+
+def test_a_dropped_batched_job_is_counted_once():
+    server = SolveServer("native", batch_max_arcs=2)
+    events = asyncio.Queue()
+    submit(server, instance(1, 1.0))
+    job = server._submit(request(instance(1, 2.0)), events)
+    next_batches(server, 1)
+    server._unsubscribe(job, events)
+    assert job.cancelled and server.stats["cancelled"] == 0
+    server._drop(job)
+    assert server.stats["cancelled"] == 1
+
+
+class GatedSolver:
+    # Solves only once released; a cancel is noted but, like a model
+    # deep in optimize(), takes effect only when the solve returns.
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.cancelled = False
+
+    def solve(self, inst, progress=None, incumbent=None):
+        self.started.set()
+        self.release.wait(10)
+        status = TransportSolution.CANCELLED if self.cancelled else TransportSolution.OPTIMAL
+        return TransportSolution(inst, status, 1.0 if status == TransportSolution.OPTIMAL else None,
+                                 backend="gated")
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def served(tmp_path):
+    solvers = []
+
+    def factory(inst, backend, profile):
+        solvers.append(GatedSolver())
+        return solvers[-1]
+
+    server = SolveServer("native", solver_factory=factory)
+    address = f"unix:{tmp_path}/solve.sock"
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start(address))
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    with ThreadPoolExecutor(max_workers=4) as clients:
+        yield server, address, solvers, clients
+        for solver in solvers:
+            solver.release.set()
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def test_clients_waiting_on_one_job_get_its_result(served):
+    server, address, solvers, clients = served
+    inst = instance(2)
+    first = clients.submit(SolveClient(address).solve, inst)
+    wait_for(lambda: solvers and solvers[0].started.is_set())
+    second = clients.submit(SolveClient(address).solve, inst)
+    wait_for(lambda: server.stats["deduplicated"] == 1)
+    solvers[0].release.set()
+    assert first.result(5).is_optimal and second.result(5).is_optimal
+    assert len(solvers) == 1
+
+
+def test_solve_again_after_cancel_gets_a_fresh_job(served):
+    server, address, solvers, clients = served
+    inst = instance(2)
+    backend = RemoteBackend(address, "native")
+    first = clients.submit(backend.solve, inst)
+    wait_for(lambda: solvers and solvers[0].started.is_set())
+    backend.cancel()
+    assert first.result(5).status == TransportSolution.CANCELLED
+    wait_for(lambda: solvers[0].cancelled)
+
+    again = clients.submit(RemoteBackend(address, "native").solve, inst)
+    wait_for(lambda: server.stats["submitted"] == 2)
+    solvers[0].release.set()
+    wait_for(lambda: len(solvers) == 2)
+    solvers[1].release.set()
+    assert again.result(5).is_optimal
+    assert server.stats["cancelled"] == 1 and server.stats["completed"] == 1
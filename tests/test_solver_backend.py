@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from lp_reference import random_transport, transport_optimum
+from NetworkInstance import NetworkInstance
+from SolverBackend import get_backend
+from TransportSolution import TransportSolution
+
+BACKENDS = ["native", "gurobi"]
+
+
+def backend(name, network=False):
+    if name == "gurobi":
+        pytest.importorskip("gurobipy")
+    return get_backend(name, network=network)
+
+
+@pytest.fixture
+def instance():
+    return random_transport(np.random.default_rng(3), 5, 8)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_solves_to_the_reference_optimum(name, instance):
+    solution = backend(name).solve(instance)
+    assert solution.is_optimal
+    assert solution.objective == pytest.approx(transport_optimum(instance))
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("network", [False, True])
+def test_cancel_before_solve_is_kept(name, network, instance):
+    if network:
+        instance = NetworkInstance.from_transport(instance)
+    solver = backend(name, network)
+    solver.cancel()
+    assert solver.solve(instance).status == TransportSolution.CANCELLED
+    # The cancel stopped that solve only.
+    assert solver.solve(instance).is_optimal
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_cancel_during_heuristic_stops_the_solve(name, instance):
+    solver = backend(name)
+    seen = []
+
+    def incumbent(result):
+        seen.append(result.status)
+        solver.cancel()
+
+    assert solver.solve(instance, incumbent=incumbent).status == TransportSolution.CANCELLED
+    assert seen == [TransportSolution.FEASIBLE]
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from lp_reference import transport_optimum
+from SolverSession import SolverSession
+from TransportInstance import TransportInstance
+
+
+def random_dicts(rng, num_warehouses, num_clients):
+    demands = rng.integers(1, 30, num_clients)
+    warehouses = {f"W{i}": float(v) for i, v in
+                  enumerate(np.ceil(rng.dirichlet(np.ones(num_warehouses)) * demands.sum() * 1.2))}
+    clients = {f"C{j}": float(v) for j, v in enumerate(demands)}
+    cost = {(w, c): float(rng.integers(1, 50)) for w in warehouses for c in clients if rng.random() < 0.7}
+    return warehouses, clients, cost
+
+
+@pytest.fixture
+def session():
+    session = SolverSession()
+    yield session
+    session.close()
+
+
+def test_edits_between_solves_match_a_fresh_instance(session):
+    rng = np.random.default_rng(5)
+    warehouses, clients, cost = random_dicts(rng, 4, 7)
+    for w, capacity in warehouses.items():
+        session.set_warehouse(w, capacity)
+    for c, demand in clients.items():
+        session.set_client(c, demand)
+    for round_ in range(4):
+        for (w, c), value in cost.items():
+            session.set_cost(w, c, value)
+        solution = session.solve()
+        instance = TransportInstance.from_dicts(warehouses, clients, cost)
+        assert solution.objective == pytest.approx(transport_optimum(instance))
+        # A new warehouse, a raised demand and some new or dearer lanes.
+        name = f"X{round_}"
+        warehouses[name] = 20.0
+        session.set_warehouse(name, 20.0)
+        clients["C0"] += 5
+        session.set_client("C0", clients["C0"])
+        for c in clients:
+            cost[(name, c)] = float(rng.integers(1, 50))
+        for key in list(cost)[::3]:
+            cost[key] += 7
+
+
+def test_edits_after_a_batch_load_match_a_fresh_instance():
+    rng = np.random.default_rng(8)
+    warehouses, clients, cost = random_dicts(rng, 5, 9)
+    session = SolverSession.from_dicts(warehouses, clients, cost)
+    try:
+        for round_ in range(3):
+            solution = session.solve()
+            instance = TransportInstance.from_dicts(warehouses, clients, cost)
+            assert solution.objective == pytest.approx(transport_optimum(instance))
+            assert session.instance().warehouse_names == list(warehouses)
+            for name in (f"X{round_}", "W0"):
+                warehouses[name] = warehouses.get(name, 0) + 15.0
+                session.set_warehouse(name, warehouses[name])
+            for c in list(clients)[round_::2]:
+                clients[c] += 3
+                session.set_client(c, clients[c])
+            for c in clients:
+                cost[(f"X{round_}", c)] = float(rng.integers(1, 50))
+                session.set_cost(f"X{round_}", c, cost[(f"X{round_}", c)])
+            for key in list(cost)[::4]:
+                cost[key] += 5
+                session.set_cost(*key, cost[key])
+    finally:
+        session.close()
+
+
+def test_instance_snapshot_survives_later_edits(session):
+    session.set_warehouse("W", 10)
+    session.set_client("C", 5)
+    session.set_cost("W", "C", 3)
+    first = session.solve()
+    assert session.instance() is first.instance
+    session.set_cost("W", "C", 9)
+    session.set_client("C", 7)
+    second = session.solve()
+    assert first.instance.costs.tolist() == [3] and first.instance.demands.tolist() == [5]
+    assert second.objective == 63
+
+
+def test_sensitivity_only_when_asked(session):
+    session.set_warehouse("W1", 30)
+    session.set_warehouse("W2", 25)
+    for c, demand in (("C1", 10), ("C2", 20)):
+        session.set_client(c, demand)
+    for (w, c), value in {("W1", "C1"): 4, ("W1", "C2"): 6, ("W2", "C2"): 5}.items():
+        session.set_cost(w, c, value)
+    assert session.solve().sensitivity is None
+    session.sensitivity = "duals"
+    duals = session.solve().sensitivity
+    assert duals.reduced_costs.shape == (3,)
+    assert np.isnan(duals.cost_low).all()
+    session.sensitivity = "full"
+    full = session.solve().sensitivity
+    np.testing.assert_allclose(full.reduced_costs, duals.reduced_costs)
+    assert not np.isnan(full.cost_low).all()
+
+
+def test_pool_environment_is_taken_by_the_solve_and_returned_on_close():
+    from EnvPool import EnvPool
+
+    pool = EnvPool()
+    try:
+        session = SolverSession.from_dicts({"W": 10}, {"C": 5}, {("W", "C"): 3}, pool=pool)
+        assert pool.in_use == 0
+        assert session.solve().objective == 15
+        assert pool.in_use == 1
+        # The pool's only environment is taken: a second session gives up.
+        other = SolverSession.from_dicts({"W": 10}, {"C": 5}, {("W", "C"): 3}, pool=pool)
+        other.acquire_timeout = 0.05
+        with pytest.raises(TimeoutError):
+            other.solve()
+        other.close()
+        session.close()
+        assert pool.in_use == 0
+        assert other.solve().objective == 15
+        other.close()
+    finally:
+        pool.close()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from lp_reference import random_transport
+from SolverBackend import get_backend
+from StochasticTransport import DISTRIBUTIONS, CostDistribution, StochasticTransport, sample_demands
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_sample_demands_shape_and_seed(distribution):
+    mean = np.array([10.0, 40.0, 5.0])
+    draws = sample_demands(mean, 4000, distribution, spread=0.2, seed=3)
+    assert draws.shape == (4000, 3)
+    assert (draws >= 0).all()
+    np.testing.assert_array_equal(draws, sample_demands(mean, 4000, distribution, spread=0.2, seed=3))
+    assert not np.array_equal(draws, sample_demands(mean, 4000, distribution, spread=0.2, seed=4))
+    np.testing.assert_allclose(draws.mean(axis=0), mean, rtol=0.05)
+    if distribution == "poisson":
+        assert (draws == np.round(draws)).all()
+    else:
+        np.testing.assert_allclose(draws.std(axis=0), 0.2 * mean, rtol=0.1)
+
+
+def test_unknown_distribution():
+    with pytest.raises(ValueError, match="Unknown demand distribution"):
+        sample_demands([1.0], 2, "gamma")
+
+
+def test_cvar_and_summary_of_known_costs():
+    costs = np.arange(1.0, 11.0)
+    shortage = np.array([0, 2, 0, 5, 0, 0, 0, 0, 0, 1.0])
+    distribution = CostDistribution(costs, 1.0, shortage, np.zeros(10), np.full(10, 10.0))
+    # The worst fifth is 9 and 10; the worst twentieth rounds down to the
+    # single worst scenario.
+    assert distribution.cvar(0.8) == 9.5
+    assert distribution.cvar(0.95) == 10.0
+    assert distribution.cvar(0.0) == 5.5
+    summary = distribution.summary()
+    assert summary["scenarios"] == 10 and summary["mean"] == 5.5
+    assert (summary["min"], summary["median"], summary["max"]) == (1.0, 5.5, 10.0)
+    assert summary["cvar95"] == 10.0
+    assert summary["mean_shortage"] == pytest.approx(0.8)
+    assert summary["stockout_probability"] == 0.3
+    assert summary["mean_fill_rate"] == pytest.approx(1 - 0.08)
+
+
+@pytest.mark.parametrize("surplus_cost", [0.0, 2.0])
+def test_saa_objective_is_the_in_sample_mean(surplus_cost):
+    pytest.importorskip("gurobipy")
+    instance = random_transport(np.random.default_rng(21), 4, 6, slack=1.5)
+    scenarios = sample_demands(instance.demands, 25, "lognormal", spread=0.3, seed=2)
+    problem = StochasticTransport(instance, scenarios, shortage_penalty=60.0, surplus_cost=surplus_cost)
+    solution = problem.solve()
+    assert solution.is_optimal
+    assert solution.objective == pytest.approx(problem.evaluate(solution.flows).mean)
+    # No other plan does better in sample, the deterministic one included.
+    deterministic = get_backend("native").solve(instance)
+    assert solution.objective <= problem.evaluate(deterministic.flows).mean + 1e-6
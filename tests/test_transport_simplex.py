@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from lp_reference import random_transport, transport_optimum
+from TransportInstance import TransportInstance
+from TransportSimplex import TransportSimplex
+from TransportSolution import TransportSolution
+
+
+def check_plan(instance, flows, tol=1e-6):
+    assert (flows >= -tol).all()
+    assert (np.bincount(instance.cols, flows, instance.num_clients) >= instance.demands - tol).all()
+    assert (np.bincount(instance.rows, flows, instance.num_warehouses) <= instance.supplies + tol).all()
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("initial", ["vogel", "least_cost"])
+def test_matches_highs_on_random_instances(seed, initial):
+    rng = np.random.default_rng(seed)
+    instance = random_transport(rng, int(rng.integers(1, 8)), int(rng.integers(1, 10)))
+    expected = transport_optimum(instance)
+    status, objective, flows = TransportSimplex(instance, initial=initial).solve()
+    if expected is None:
+        assert status == TransportSolution.INFEASIBLE
+        return
+    assert status == TransportSolution.OPTIMAL
+    assert objective == pytest.approx(expected, rel=1e-9, abs=1e-6)
+    assert float(instance.costs @ flows) == pytest.approx(objective)
+    check_plan(instance, flows)
+
+
+def test_repeated_lane_ships_on_the_cheapest_arc():
+    instance = TransportInstance(["W"], [10], ["C"], [5], [0, 0], [0, 0], [3, 7])
+    status, objective, flows = TransportSimplex(instance).solve()
+    assert status == TransportSolution.OPTIMAL
+    assert objective == 15
+    assert flows.tolist() == [5, 0]
+
+
+def test_start_on_repeated_lanes_is_merged():
+    instance = TransportInstance(["W"], [10], ["C"], [5], [0, 0], [0, 0], [7, 3])
+    status, objective, flows = TransportSimplex(instance, start=[2, 3]).solve()
+    assert status == TransportSolution.OPTIMAL
+    assert objective == 15
+    assert flows.tolist() == [0, 5]
+
+
+def test_missing_lane_is_infeasible():
+    instance = TransportInstance(["W1", "W2"], [10, 10], ["C1", "C2"], [5, 5], [0, 1], [0, 0], [1, 1])
+    status, _, _ = TransportSimplex(instance).solve()
+    assert status == TransportSolution.INFEASIBLE
+
+
+def test_short_supply_is_infeasible():
+    instance = TransportInstance(["W"], [4], ["C"], [5], [0], [0], [1])
+    assert TransportSimplex(instance).solve()[0] == TransportSolution.INFEASIBLE
+
+
+def test_warm_start_matches_cold_solve():
+    rng = np.random.default_rng(7)
+    instance = random_transport(rng, 6, 9, density=1.0)
+    _, cold, flows = TransportSimplex(instance).solve()
+    instance.costs[::3] += 5
+    _, warm, _ = TransportSimplex(instance, start=flows).solve()
+    assert warm == pytest.approx(transport_optimum(instance))